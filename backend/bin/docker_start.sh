@@ -26,6 +26,12 @@ done
 >&2 echo "Apply database migrations"
 python src/manage.py migrate
 
+# Fill the caches before accepting traffic, unless disabled
+if [ "${WARM_CACHES:-true}" = "true" ]; then
+  >&2 echo "Warming caches"
+  python src/manage.py warm_caches || >&2 echo "Warming caches failed"
+fi
+
 # Start server
 >&2 echo "Starting server"
 exec uwsgi \
@@ -0,0 +1,48 @@
+"""Scaffolding for tests of the views against a ZTC service mocked with requests_mock
+
+Test views mix in `Unauthenticated`; test cases subclass `ZTCTestCase` and are
+decorated with ``requests_mock.Mocker()``.
+"""
+
+from django.core.cache import cache
+from django.test import RequestFactory, TestCase
+
+from msgspec import Struct
+from zgw_consumers.constants import APITypes
+from zgw_consumers.test.factories import ServiceFactory
+
+from openbeheer.clients import ztc_client
+
+BASE_URL = "https://example.com/catalogi/api/v1/"
+UUID = "46c40f8e-bf9f-48bd-9784-77af5a7ce38f"
+
+
+class Thing(Struct):
+    url: str
+    omschrijving: str
+    catalogus: str
+
+
+class Unauthenticated:
+    "For test views, that are called without a user"
+
+    authentication_classes = ()
+    permission_classes = ()
+    throttle_classes = ()
+
+
+def paged(*results) -> dict:
+    "A ZGW paginated response with all `results`"
+    return {"count": len(results), "next": None, "previous": None, "results": results}
+
+
+class ZTCTestCase(TestCase):
+    "With the ZTC service with slug ztc at `BASE_URL`, and nothing cached"
+
+    def setUp(self):
+        super().setUp()
+        cache.clear()
+        ztc_client.cache_clear()
+        self.addCleanup(ztc_client.cache_clear)
+        ServiceFactory.create(api_type=APITypes.ztc, slug="ztc", api_root=BASE_URL)
+        self.factory = RequestFactory()
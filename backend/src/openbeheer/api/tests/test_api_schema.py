@@ -93,18 +93,19 @@ class SchemaEndpointTests(APITestCase):
                 return Response()
 
         schema = _get_drf_spectacular_schema(DummyView.as_view())
-        query_parameters = schema["paths"]["/dummy"]["get"]["parameters"]
+        query_parameters = {
+            param["name"]: param
+            for param in schema["paths"]["/dummy"]["get"]["parameters"]
+        }
 
-        str_query_param = query_parameters[0]
+        str_query_param = query_parameters["some_field"]
 
-        self.assertEqual(str_query_param["name"], "some_field")
         self.assertEqual(
             str_query_param["schema"], {"type": "string", "default": "bla"}
         )
 
-        int_query_param = query_parameters[1]
+        int_query_param = query_parameters["some_number"]
 
-        self.assertEqual(int_query_param["name"], "some_number")
         self.assertEqual(
             int_query_param["schema"],
             {"anyOf": [{"type": "integer"}, {"type": "null"}], "default": None},
@@ -129,9 +130,12 @@ class SchemaEndpointTests(APITestCase):
                 return Response()
 
         schema = _get_drf_spectacular_schema(DummyView.as_view())
-        query_parameters = schema["paths"]["/dummy"]["get"]["parameters"]
+        query_parameters = {
+            param["name"]: param
+            for param in schema["paths"]["/dummy"]["get"]["parameters"]
+        }
 
-        enum_schema = query_parameters[0]["schema"]
+        enum_schema = query_parameters["some_enum"]["schema"]
         self.assertFalse(
             "$ref" in enum_schema and "default" in enum_schema,
             f'"default" is ignored if schema is a "$ref", both are found in {enum_schema!r}',
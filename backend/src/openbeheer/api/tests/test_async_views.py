@@ -0,0 +1,177 @@
+import json
+from unittest.mock import Mock
+from uuid import UUID
+
+import requests_mock
+from asgiref.sync import async_to_sync
+from drf_spectacular.utils import extend_schema, extend_schema_view
+from msgspec import UNSET, Struct, UnsetType, field
+from requests.exceptions import ConnectionError
+
+from openbeheer.api.views import AsyncDetailView, AsyncListView, make_expansion
+from openbeheer.invalidation import resources_changed
+from openbeheer.types import OBPagedQueryParams
+from openbeheer.types._open_beheer import DetailResponseWithoutVersions
+
+from . import BASE_URL, Unauthenticated, ZTCTestCase, paged
+
+UUID_1 = UUID("ec9ebcdb-b652-466d-a651-fdb8ea787487")
+
+
+class StatusType(Struct):
+    omschrijving: str
+
+
+class ThingExtension(Struct, frozen=True):
+    statustypen: UnsetType | list[StatusType] = UNSET
+
+
+class Thing(Struct):
+    url: str
+    omschrijving: str
+    _expand: ThingExtension = ThingExtension()
+
+
+class ThingQueryParams(OBPagedQueryParams):
+    expand: list[str] = field(default_factory=lambda: ["statustypen"])
+
+
+@extend_schema_view(get=extend_schema(), post=extend_schema())
+class ThingListView(Unauthenticated, AsyncListView[ThingQueryParams, Thing, Thing]):
+    data_type = Thing
+    return_data_type = Thing
+    query_type = ThingQueryParams
+    endpoint_path = "zaaktypen"
+    expansions = {
+        "statustypen": make_expansion(
+            f"{BASE_URL}statustypen",
+            lambda t: {"zaaktype": t.url},  # pyright: ignore[reportAttributeAccessIssue]
+            StatusType,
+        ),
+    }
+
+
+@extend_schema_view(
+    get=extend_schema(),
+    patch=extend_schema(),
+    put=extend_schema(),
+    delete=extend_schema(),
+)
+class ThingDetailView(Unauthenticated, AsyncDetailView[Thing]):
+    data_type = Thing
+    return_data_type = DetailResponseWithoutVersions[Thing]
+    has_versions = False
+    endpoint_path = "zaaktypen/{uuid}"
+
+
+@extend_schema_view(
+    get=extend_schema(),
+    patch=extend_schema(),
+    put=extend_schema(),
+    delete=extend_schema(),
+)
+class OwnExpandThingDetailView(ThingDetailView):
+    def _expand(self, client, object, expansions=None):
+        object._expand = ThingExtension(statustypen=[StatusType("from _expand")])
+        return object
+
+
+@requests_mock.Mocker()
+class AsyncViewTests(ZTCTestCase):
+    def call(self, view, request, **kwargs):
+        response = async_to_sync(view.as_view())(request, **kwargs)
+        response.render()
+        return response
+
+    def test_list(self, m):
+        thing = {"url": f"{BASE_URL}zaaktypen/1", "omschrijving": "slurm"}
+        m.get(f"{BASE_URL}zaaktypen", json=paged(thing))
+        m.get(f"{BASE_URL}statustypen", json=paged({"omschrijving": "open"}))
+
+        response = self.call(
+            ThingListView,
+            self.factory.get("/"),
+            slug="ztc",
+        )
+
+        self.assertEqual(response.status_code, 200)
+        [result] = json.loads(response.content)["results"]
+        self.assertEqual(result["omschrijving"], "slurm")
+        self.assertEqual(result["_expand"], {"statustypen": [{"omschrijving": "open"}]})
+        self.assertEqual(
+            m.request_history[1].qs, {"zaaktype": [f"{BASE_URL}zaaktypen/1".lower()]}
+        )
+
+    def test_list_service_down(self, m):
+        m.get(f"{BASE_URL}zaaktypen", exc=ConnectionError)
+
+        response = self.call(ThingListView, self.factory.get("/"), slug="ztc")
+
+        self.assertEqual(response.status_code, 502)
+        self.assertEqual(json.loads(response.content)["code"], "connection_error")
+
+    def test_detail(self, m):
+        m.get(
+            f"{BASE_URL}zaaktypen/{UUID_1}",
+            json={"url": f"{BASE_URL}zaaktypen/1", "omschrijving": "slurm"},
+        )
+
+        response = self.call(
+            ThingDetailView, self.factory.get("/"), slug="ztc", uuid=UUID_1
+        )
+
+        self.assertEqual(response.status_code, 200)
+        data = json.loads(response.content)
+        self.assertEqual(data["result"]["omschrijving"], "slurm")
+        self.assertEqual(
+            {field["name"] for field in data["fields"]},
+            {"url", "omschrijving", "_expand.statustypen.omschrijving"},
+        )
+
+    def test_detail_uses_own_expand(self, m):
+        m.get(
+            f"{BASE_URL}zaaktypen/{UUID_1}",
+            json={"url": f"{BASE_URL}zaaktypen/1", "omschrijving": "slurm"},
+        )
+
+        response = self.call(
+            OwnExpandThingDetailView, self.factory.get("/"), slug="ztc", uuid=UUID_1
+        )
+
+        self.assertEqual(
+            json.loads(response.content)["result"]["_expand"],
+            {"statustypen": [{"omschrijving": "from _expand"}]},
+        )
+        self.assertEqual(m.call_count, 1)
+
+    def test_detail_not_found(self, m):
+        m.get(f"{BASE_URL}zaaktypen/{UUID_1}", status_code=404)
+
+        response = self.call(
+            ThingDetailView, self.factory.get("/"), slug="ztc", uuid=UUID_1
+        )
+
+        self.assertEqual(response.status_code, 404)
+
+    def test_sync_methods_still_work(self, m):
+        m.delete(f"{BASE_URL}zaaktypen/{UUID_1}", status_code=204)
+
+        response = self.call(
+            ThingDetailView, self.factory.delete("/"), slug="ztc", uuid=UUID_1
+        )
+
+        self.assertEqual(response.status_code, 204)
+        self.assertTrue(m.called)
+
+    def test_changes_are_published(self, m):
+        m.delete(f"{BASE_URL}zaaktypen/{UUID_1}", status_code=204)
+        receiver = Mock()
+        resources_changed.connect(receiver)
+        self.addCleanup(resources_changed.disconnect, receiver)
+
+        self.call(ThingDetailView, self.factory.delete("/"), slug="ztc", uuid=UUID_1)
+
+        receiver.assert_called_once()
+        self.assertEqual(
+            receiver.call_args.kwargs["urls"], {f"{BASE_URL}zaaktypen/{UUID_1}"}
+        )
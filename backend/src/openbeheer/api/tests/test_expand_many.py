@@ -0,0 +1,247 @@
+import threading
+from functools import partial
+from typing import Iterable
+
+from django.test import SimpleTestCase, override_settings
+
+import requests_mock
+from ape_pie import APIClient
+from msgspec import UNSET, Struct, UnsetType
+
+from openbeheer.api.views import (
+    ExpansionNode,
+    by_catalogus,
+    expand_many,
+    make_batched_expansion,
+    select_expansions,
+)
+
+
+class Extension(Struct, frozen=True):
+    left: UnsetType | str = UNSET
+    right: UnsetType | str = UNSET
+
+
+class Thing(Struct):
+    name: str
+    _expand: Extension = Extension()
+
+
+def expansion(label: str, barrier: threading.Barrier | None = None):
+    def expand(client, objects: Iterable[Thing]) -> Iterable[str]:
+        if barrier:
+            # only passes if both expansions run at the same time
+            barrier.wait()
+        return (f"{label}:{obj.name}" for obj in objects)
+
+    return expand
+
+
+def failing_expansion(client, objects):
+    raise ValueError("upstream on fire")
+
+
+class ExpandManyTests(SimpleTestCase):
+    objects = [Thing(name="a"), Thing(name="b")]
+
+    def test_sequential_by_default(self):
+        result = expand_many(
+            None,  # pyright: ignore[reportArgumentType]
+            {"left": expansion("l"), "right": expansion("r")},
+            self.objects,
+        )
+
+        self.assertEqual(
+            [obj._expand for obj in result],
+            [Extension(left="l:a", right="r:a"), Extension(left="l:b", right="r:b")],
+        )
+
+    @override_settings(EXPANSION_MAX_WORKERS=4)
+    def test_concurrent_has_the_same_result_shape(self):
+        barrier = threading.Barrier(2, timeout=5)
+
+        result = expand_many(
+            None,  # pyright: ignore[reportArgumentType]
+            {"left": expansion("l", barrier), "right": expansion("r", barrier)},
+            self.objects,
+        )
+
+        self.assertEqual(
+            [obj._expand for obj in result],
+            [Extension(left="l:a", right="r:a"), Extension(left="l:b", right="r:b")],
+        )
+
+    def test_concurrent_propagates_errors(self):
+        with self.assertRaisesMessage(ValueError, "upstream on fire"):
+            expand_many(
+                None,  # pyright: ignore[reportArgumentType]
+                {"left": expansion("l"), "right": failing_expansion},
+                self.objects,
+                max_workers=2,
+            )
+
+
+class ExpansionGraphTests(SimpleTestCase):
+    objects = [Thing(name="a"), Thing(name="b")]
+
+    def test_dependencies_get_the_results(self):
+        calls = []
+
+        def shared(client, objects):
+            calls.append("shared")
+            return [obj.name.upper() for obj in objects]
+
+        def left(client, objects, shared):
+            return (f"{obj.name}:{s}" for obj, s in zip(objects, shared, strict=True))
+
+        def right(client, objects, shared):
+            return (f"{s}:{obj.name}" for obj, s in zip(objects, shared, strict=True))
+
+        result = expand_many(
+            None,  # pyright: ignore[reportArgumentType]
+            {
+                "left": ExpansionNode(left, depends_on=("shared",)),
+                "right": ExpansionNode(right, depends_on=("shared",)),
+                "shared": ExpansionNode(shared, internal=True),
+            },
+            self.objects,
+        )
+
+        self.assertEqual(calls, ["shared"])
+        self.assertEqual(
+            [obj._expand for obj in result],
+            [Extension(left="a:A", right="A:a"), Extension(left="b:B", right="B:b")],
+        )
+
+    def test_unused_internal_expansions_dont_run(self):
+        def shared(client, objects):
+            raise AssertionError("should not run")
+
+        result = expand_many(
+            None,  # pyright: ignore[reportArgumentType]
+            {"left": expansion("l"), "shared": ExpansionNode(shared, internal=True)},
+            self.objects,
+        )
+
+        self.assertEqual(result[0]._expand, Extension(left="l:a"))
+
+    def test_select_expansions_adds_dependencies(self):
+        graph = {
+            "left": ExpansionNode(expansion("l"), depends_on=("shared",)),
+            "right": expansion("r"),
+            "shared": ExpansionNode(expansion("s"), internal=True),
+        }
+
+        self.assertEqual(list(select_expansions(graph, ["left"])), ["left", "shared"])
+        self.assertEqual(list(select_expansions(graph, ["unknown"])), [])
+
+    def test_circular_dependencies(self):
+        with self.assertRaises(ValueError):
+            expand_many(
+                None,  # pyright: ignore[reportArgumentType]
+                {
+                    "left": ExpansionNode(expansion("l"), depends_on=("right",)),
+                    "right": ExpansionNode(expansion("r"), depends_on=("left",)),
+                },
+                self.objects,
+            )
+
+
+class StatusType(Struct):
+    omschrijving: str
+    zaaktype: str
+
+
+class BesluitType(Struct):
+    omschrijving: str
+    zaaktypen: list[str]
+
+
+class ZaakTypeExtension(Struct, frozen=True):
+    left: list[StatusType] = []
+    right: list[BesluitType] = []
+
+
+class ZaakType(Struct):
+    url: str
+    catalogus: str
+    _expand: ZaakTypeExtension = ZaakTypeExtension()
+
+
+BASE_URL = "https://example.com/api/"
+
+
+def paged(*results) -> dict:
+    return {"count": len(results), "next": None, "previous": None, "results": results}
+
+
+@requests_mock.Mocker()
+class BatchedExpansionTests(SimpleTestCase):
+    api_client = APIClient(BASE_URL)
+    zaaktypen = [
+        ZaakType(url=f"{BASE_URL}zaaktypen/1", catalogus=f"{BASE_URL}catalogussen/1"),
+        ZaakType(url=f"{BASE_URL}zaaktypen/2", catalogus=f"{BASE_URL}catalogussen/1"),
+        ZaakType(url=f"{BASE_URL}zaaktypen/3", catalogus=f"{BASE_URL}catalogussen/2"),
+    ]
+
+    def test_one_query_per_catalogus(self, m):
+        m.get(
+            f"{BASE_URL}statustypen?catalogus={BASE_URL}catalogussen/1",
+            json=paged(
+                {"omschrijving": "open", "zaaktype": f"{BASE_URL}zaaktypen/1"},
+                {"omschrijving": "dicht", "zaaktype": f"{BASE_URL}zaaktypen/2"},
+                {"omschrijving": "half", "zaaktype": f"{BASE_URL}zaaktypen/1"},
+            ),
+        )
+        m.get(
+            f"{BASE_URL}statustypen?catalogus={BASE_URL}catalogussen/2",
+            json=paged(),
+        )
+        expansion = make_batched_expansion(
+            "statustypen",
+            by_catalogus,
+            lambda statustype: statustype.zaaktype,
+            lambda zaaktype: zaaktype.url,  # pyright: ignore[reportAttributeAccessIssue]
+            StatusType,
+        )
+
+        result = expand_many(self.api_client, {"left": expansion}, self.zaaktypen)
+
+        self.assertEqual(m.call_count, 2)
+        self.assertEqual(
+            [[st.omschrijving for st in zt._expand.left] for zt in result],
+            [["open", "half"], ["dicht"], []],
+        )
+
+    def test_children_with_multiple_parents(self, m):
+        m.get(
+            f"{BASE_URL}besluittypen?catalogus={BASE_URL}catalogussen/2",
+            json=paged(),
+        )
+        m.get(
+            f"{BASE_URL}besluittypen?catalogus={BASE_URL}catalogussen/1",
+            json=paged(
+                {
+                    "omschrijving": "ja",
+                    "zaaktypen": [f"{BASE_URL}zaaktypen/1", f"{BASE_URL}zaaktypen/3"],
+                },
+            ),
+        )
+        expansion = make_batched_expansion(
+            "besluittypen",
+            partial(by_catalogus, status="alles"),
+            lambda besluittype: besluittype.zaaktypen,
+            lambda zaaktype: zaaktype.url,  # pyright: ignore[reportAttributeAccessIssue]
+            BesluitType,
+        )
+
+        result = expand_many(self.api_client, {"right": expansion}, self.zaaktypen)
+
+        self.assertEqual(
+            [[bt.omschrijving for bt in zt._expand.right] for zt in result],
+            [["ja"], [], ["ja"]],
+        )
+        self.assertEqual(
+            [request.qs["status"] for request in m.request_history],
+            [["alles"], ["alles"]],
+        )
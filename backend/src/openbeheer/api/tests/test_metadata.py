@@ -0,0 +1,128 @@
+import json
+from unittest.mock import patch
+
+import requests_mock
+from drf_spectacular.utils import extend_schema, extend_schema_view
+from freezegun import freeze_time
+from requests.exceptions import ConnectionError
+
+from openbeheer.api.views import DetailView, MetadataView, _metadata
+from openbeheer.types import DetailResponseWithoutVersions, OBOption
+
+from . import BASE_URL, UUID, Thing, Unauthenticated, ZTCTestCase
+
+
+@extend_schema_view(
+    get=extend_schema(),
+    put=extend_schema(),
+    patch=extend_schema(),
+    delete=extend_schema(),
+)
+class ThingDetailView(Unauthenticated, DetailView[Thing]):
+    has_versions = False
+    data_type = Thing
+    return_data_type = DetailResponseWithoutVersions[Thing]
+    endpoint_path = "zaaktypen/{uuid}"
+    object_options = frozenset({"catalogus"})
+
+    def get_option_overrides(self, data: Thing):
+        return {"catalogus": [OBOption(label="catalogus", value=data.catalogus)]}
+
+
+@extend_schema_view(get=extend_schema())
+class ThingMetadataView(Unauthenticated, MetadataView):
+    detail_view = ThingDetailView
+
+
+@requests_mock.Mocker()
+class MetadataTests(ZTCTestCase):
+    def setUp(self):
+        super().setUp()
+        _metadata.clear()
+        self.addCleanup(_metadata.clear)
+
+    def get_detail(self, m, query: str = "") -> dict:
+        m.get(
+            f"{BASE_URL}zaaktypen/{UUID}",
+            json={
+                "url": f"{BASE_URL}zaaktypen/{UUID}",
+                "omschrijving": "thing",
+                "catalogus": f"{BASE_URL}catalogussen/1",
+            },
+        )
+        response = ThingDetailView.as_view()(
+            self.factory.get(f"/?{query}"), slug="ztc", uuid=UUID
+        )
+        return json.loads(response.rendered_content)
+
+    def get_metadata(self, query: str = "", **headers):
+        response = ThingMetadataView.as_view()(
+            self.factory.get(f"/?{query}", headers=headers), slug="ztc"
+        )
+        response.render()
+        return response
+
+    def test_omitted_fields(self, m):
+        full = self.get_detail(m)
+        data = self.get_detail(m, "fields=omit")
+
+        self.assertEqual(data["result"], full["result"])
+        self.assertNotIn("fieldsets", data)
+        # only the field with options of this object
+        self.assertEqual([field["name"] for field in data["fields"]], ["catalogus"])
+        self.assertEqual(
+            data["fields"][0]["options"],
+            [{"label": "catalogus", "value": f"{BASE_URL}catalogussen/1"}],
+        )
+
+        metadata = json.loads(self.get_metadata().content)
+        self.assertEqual(data["metadata"], metadata["version"])
+        self.assertEqual(
+            [field["name"] for field in metadata["fields"]],
+            ["url", "omschrijving", "catalogus"],
+        )
+        # they depend on the object
+        self.assertEqual(metadata["fields"][2]["options"], [])
+
+    def test_etag(self, m):
+        response = self.get_metadata()
+        version = json.loads(response.content)["version"]
+
+        self.assertEqual(response["ETag"], f'"{version}"')
+        self.assertIn("no-cache", response["Cache-Control"])
+
+        response = self.get_metadata(if_none_match=f'"{version}"')
+
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response.content, b"")
+
+    def test_versioned_is_cached(self, m):
+        version = json.loads(self.get_metadata().content)["version"]
+
+        response = self.get_metadata(f"version={version}")
+
+        self.assertIn("max-age=", response["Cache-Control"])
+        self.assertNotIn("no-cache", response["Cache-Control"])
+        self.assertIn("no-cache", self.get_metadata("version=stale")["Cache-Control"])
+
+    def test_built_once_per_timeout(self, m):
+        with (
+            freeze_time("2025-01-01 12:00:00"),
+            patch.object(
+                ThingDetailView, "get_fields", wraps=ThingDetailView().get_fields
+            ) as get_fields,
+        ):
+            version = json.loads(self.get_metadata().content)["version"]
+            self.get_metadata(f"version={version}")
+            self.get_detail(m, "fields=omit")
+            self.assertEqual(get_fields.call_count, 2)  # once more for the detail
+
+            with freeze_time("2025-01-01 12:01:01"):
+                self.get_metadata()
+            self.assertEqual(get_fields.call_count, 3)
+
+    def test_service_error(self, m):
+        with patch.object(ThingDetailView, "get_fields", side_effect=ConnectionError):
+            response = self.get_metadata()
+
+        self.assertEqual(response.status_code, 502)
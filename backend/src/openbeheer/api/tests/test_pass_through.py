@@ -0,0 +1,113 @@
+import json
+
+from django.test import SimpleTestCase, override_settings
+
+import requests_mock
+from drf_spectacular.utils import extend_schema, extend_schema_view
+from msgspec import Raw
+from msgspec.json import decode
+
+from openbeheer.statustypen.api import views
+from openbeheer.types import StatusTypeWithUUID
+from openbeheer.types._open_beheer import (
+    ExpandableZaakObjectTypeWithUUID,
+    ResultaatTypeWithUUID,
+)
+from openbeheer.types.ztc import ResultaatType, StatusType, ZaakObjectType
+
+from ..views import _ENCODER, pass_through, passes_through
+from . import BASE_URL, UUID, Unauthenticated, ZTCTestCase
+
+STATUSTYPE = (
+    b'{"url":"' + f"{BASE_URL}statustypen/{UUID}".encode() + b'",'
+    b'"omschrijving":"Ontvangen","omschrijvingGeneriek":"","statustekst":"",'
+    b'"zaaktype":"' + f"{BASE_URL}zaaktypen/1".encode() + b'",'
+    b'"zaaktypeIdentificatie":"ZAAKTYPE-1","volgnummer":1,"isEindstatus":true,'
+    b'"informeren":false,"doorlooptijd":null,"toelichting":null,'
+    b'"checklistitemStatustype":[],'
+    b'"catalogus":"' + f"{BASE_URL}catalogussen/1".encode() + b'",'
+    b'"eigenschappen":[],"zaakobjecttypen":[],"beginGeldigheid":null,'
+    b'"eindeGeldigheid":null,"beginObject":null,"eindeObject":null} '
+)
+
+
+class PassThroughTests(SimpleTestCase):
+    def test_same_as_decoded(self):
+        raw = pass_through(StatusTypeWithUUID, Raw(STATUSTYPE))
+
+        # the same JSON as decoding and encoding it
+        decoded = _ENCODER.encode(decode(STATUSTYPE, type=StatusTypeWithUUID))
+        self.assertEqual(decode(_ENCODER.encode(raw)), decode(decoded))
+        data = decode(raw)
+        self.assertEqual(data["uuid"], UUID)
+        self.assertIn("/admin/catalogi/statustype/", data["adminUrl"])
+
+    def test_without_url(self):
+        self.assertEqual(bytes(pass_through(StatusTypeWithUUID, Raw(b"{}"))), b"{}")
+
+    @override_settings(RAW_PASS_THROUGH=True)
+    def test_passes_through(self):
+        self.assertTrue(passes_through(StatusTypeWithUUID, StatusType, {}))
+        # derives fields from more than the url
+        self.assertFalse(passes_through(ResultaatTypeWithUUID, ResultaatType, {}))
+        # has an _expand, even if it's empty
+        self.assertFalse(
+            passes_through(ExpandableZaakObjectTypeWithUUID, ZaakObjectType, {})
+        )
+        self.assertFalse(
+            passes_through(StatusTypeWithUUID, StatusType, {"x": lambda c, o: o})
+        )
+
+    def test_off_by_default(self):
+        self.assertFalse(passes_through(StatusTypeWithUUID, StatusType, {}))
+
+
+@extend_schema_view(get=extend_schema())
+class StatusTypeListView(Unauthenticated, views.StatusTypeListView):
+    pass
+
+
+@extend_schema_view(get=extend_schema())
+class StatusTypeDetailView(Unauthenticated, views.StatusTypeDetailView):
+    pass
+
+
+@requests_mock.Mocker()
+class PassThroughViewTests(ZTCTestCase):
+    def get_both(self, view, query: str = "", **kwargs) -> tuple[dict, dict]:
+        "Return the response of `view` decoding upstream objects, and passing them through"
+        responses = []
+        for raw in (False, True):
+            with override_settings(RAW_PASS_THROUGH=raw):
+                response = view.as_view()(
+                    self.factory.get(f"/?{query}"), slug="ztc", **kwargs
+                )
+            content = (
+                b"".join(response.streaming_content)
+                if response.streaming
+                else response.rendered_content
+            )
+            responses.append(json.loads(content))
+        return responses[0], responses[1]
+
+    def test_list_same_as_decoded(self, m):
+        m.get(
+            f"{BASE_URL}statustypen",
+            content=b'{"count":1,"next":null,"previous":null,"results":['
+            + STATUSTYPE
+            + b"]}",
+        )
+
+        for query in ("", "all=true"):
+            with self.subTest(query):
+                decoded, passed_through = self.get_both(StatusTypeListView, query)
+                self.assertEqual(passed_through, decoded)
+                self.assertEqual(decoded["results"][0]["uuid"], UUID)
+
+    def test_detail_same_as_decoded(self, m):
+        m.get(f"{BASE_URL}statustypen/{UUID}", content=STATUSTYPE)
+
+        decoded, passed_through = self.get_both(StatusTypeDetailView, uuid=UUID)
+
+        self.assertEqual(passed_through, decoded)
+        self.assertEqual(decoded["uuid"], UUID)
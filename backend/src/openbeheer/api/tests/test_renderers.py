@@ -0,0 +1,70 @@
+from unittest.mock import patch
+
+from django.test import SimpleTestCase
+from django.utils.translation import gettext_lazy
+
+from djangorestframework_camel_case.render import (
+    CamelCaseBrowsableAPIRenderer,
+    CamelCaseJSONRenderer,
+)
+from msgspec import Struct
+from rest_framework.renderers import JSONRenderer
+
+from .. import views
+from ..views import (
+    MsgspecAPIView,
+    MsgspecJSONMixin,
+    MsgspecJSONRenderer,
+    _renderers,
+)
+
+
+class Thing(Struct):
+    zaaktype_url: str
+
+
+class View(MsgspecAPIView):
+    renderer_classes = [CamelCaseJSONRenderer, CamelCaseBrowsableAPIRenderer]
+
+
+class PlainView(MsgspecAPIView):
+    renderer_classes = [JSONRenderer]
+
+
+class RendererTests(SimpleTestCase):
+    def test_built_once(self):
+        _renderers.cache_clear()
+        self.addCleanup(_renderers.cache_clear)
+
+        with patch.object(views, "_add_mixin", wraps=views._add_mixin) as add_mixin:
+            first, *_, last = [View().get_renderers() for _ in range(10)]
+
+        # once per renderer class, not per request
+        self.assertEqual(add_mixin.call_count, 3)
+        for a, b in zip(first, last, strict=True):
+            self.assertIs(type(a), type(b))
+        self.assertIsInstance(first[0], MsgspecJSONRenderer)
+        # stateless, so shared
+        self.assertIs(first[1], last[1])
+        # the browsable API keeps the request it renders
+        self.assertIsNot(first[2], last[2])
+
+    def test_json_renderers_encode_with_msgspec(self):
+        renderer = PlainView().get_renderers()[1]
+
+        self.assertIsInstance(renderer, JSONRenderer)
+        self.assertIsInstance(renderer, MsgspecJSONMixin)
+        self.assertEqual(
+            renderer.render(Thing(zaaktype_url="x")), b'{"zaaktype_url":"x"}'
+        )
+
+    def test_camel_case_renderer_camelizes(self):
+        renderer = View().get_renderers()[1]
+
+        self.assertIsInstance(renderer, CamelCaseJSONRenderer)
+        self.assertNotIsInstance(renderer, MsgspecJSONMixin)
+        self.assertEqual(
+            renderer.render(Thing(zaaktype_url="x")), b'{"zaaktypeUrl":"x"}'
+        )
+        # not msgspec supported, so rendered by DRF
+        self.assertEqual(renderer.render({"a_b": gettext_lazy("x")}), b'{"aB":"x"}')
@@ -0,0 +1,134 @@
+import datetime
+import json
+
+import requests_mock
+from drf_spectacular.utils import extend_schema, extend_schema_view
+from msgspec import UNSET, Struct, UnsetType
+
+from openbeheer.api.views import DetailView, DetailWithVersions, make_expansion
+from openbeheer.types import DetailResponse, VersionSummary
+
+from . import BASE_URL, UUID, Unauthenticated, ZTCTestCase
+
+URL = f"{BASE_URL}zaaktypen/{UUID}"
+
+
+class Related(Struct):
+    omschrijving: str
+
+
+class ThingExtension(Struct, frozen=True, rename="camel"):
+    statustypen: UnsetType | list[Related] = UNSET
+    resultaat_typen: UnsetType | list[Related] = UNSET
+
+
+class Thing(Struct):
+    url: str
+    omschrijving: str
+    _expand: ThingExtension = ThingExtension()
+
+
+@extend_schema_view(
+    get=extend_schema(),
+    put=extend_schema(),
+    patch=extend_schema(),
+    delete=extend_schema(),
+)
+class ThingDetailView(Unauthenticated, DetailWithVersions, DetailView[Thing]):
+    data_type = Thing
+    return_data_type = DetailResponse[Thing]
+    endpoint_path = "zaaktypen/{uuid}"
+    expansions = {
+        "statustypen": make_expansion(
+            f"{BASE_URL}statustypen",
+            lambda t: {"zaaktype": t.url},  # pyright: ignore[reportAttributeAccessIssue]
+            Related,
+        ),
+        "resultaat_typen": make_expansion(
+            f"{BASE_URL}resultaattypen",
+            lambda t: {"zaaktype": t.url},  # pyright: ignore[reportAttributeAccessIssue]
+            Related,
+        ),
+    }
+    version_lookups = 0
+
+    def get_item_versions(self, slug, data):
+        type(self).version_lookups += 1
+        return [data], 200
+
+    def get_version_identificatie(self, data):
+        return data.url
+
+    def format_version(self, data):
+        return VersionSummary(
+            uuid=UUID,
+            begin_geldigheid=datetime.date(2025, 1, 1),
+            einde_geldigheid=None,
+            concept=False,
+        )
+
+
+def page(*omschrijvingen: str) -> dict:
+    return {
+        "count": len(omschrijvingen),
+        "next": None,
+        "previous": None,
+        "results": [{"omschrijving": o} for o in omschrijvingen],
+    }
+
+
+@requests_mock.Mocker()
+class SparseDetailTests(ZTCTestCase):
+    def setUp(self):
+        super().setUp()
+        ThingDetailView.version_lookups = 0
+
+    def get(self, m, query: str = "") -> dict:
+        m.get(URL, json={"url": URL, "omschrijving": "thing"})
+        self.statustypen = m.get(f"{BASE_URL}statustypen", json=page("open"))
+        self.resultaattypen = m.get(f"{BASE_URL}resultaattypen", json=page("klaar"))
+        response = ThingDetailView.as_view()(
+            self.factory.get(f"/?{query}"), slug="ztc", uuid=UUID
+        )
+        return json.loads(response.rendered_content)
+
+    def test_everything_by_default(self, m):
+        data = self.get(m)
+
+        self.assertEqual(
+            data["result"]["_expand"],
+            {
+                "statustypen": [{"omschrijving": "open"}],
+                "resultaatTypen": [{"omschrijving": "klaar"}],
+            },
+        )
+        self.assertIn("versions", data)
+        self.assertEqual(ThingDetailView.version_lookups, 1)
+
+    def test_selected_expansions(self, m):
+        data = self.get(m, "expand=resultaatTypen")
+
+        self.assertEqual(
+            data["result"]["_expand"], {"resultaatTypen": [{"omschrijving": "klaar"}]}
+        )
+        self.assertFalse(self.statustypen.called)
+
+        data = self.get(m, "expand=")
+
+        self.assertEqual(data["result"]["_expand"], {})
+        self.assertFalse(self.resultaattypen.called)
+
+    def test_sparse_fields(self, m):
+        data = self.get(m, "fields=omschrijving,_expand.statustypen")
+
+        self.assertEqual(
+            [field["name"] for field in data["fields"]],
+            ["omschrijving", "_expand.statustypen.omschrijving"],
+        )
+        self.assertNotIn("versions", data)
+        self.assertEqual(ThingDetailView.version_lookups, 0)
+
+        data = self.get(m, "fields=versions")
+
+        self.assertEqual(data["fields"], [])
+        self.assertIn("versions", data)
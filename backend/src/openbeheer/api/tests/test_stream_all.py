@@ -0,0 +1,165 @@
+import json
+from unittest.mock import patch
+
+from django.test import override_settings
+
+import requests
+import requests_mock
+from drf_spectacular.utils import extend_schema, extend_schema_view
+from msgspec import UNSET, Struct, UnsetType, field
+
+from openbeheer import clients
+from openbeheer.api.views import ListView, make_expansion
+from openbeheer.types import OBPagedQueryParams
+
+from . import BASE_URL, Unauthenticated, ZTCTestCase
+
+
+class StatusType(Struct):
+    omschrijving: str
+
+
+class ThingExtension(Struct, frozen=True):
+    statustypen: UnsetType | list[StatusType] = UNSET
+
+
+class Thing(Struct):
+    url: str
+    omschrijving: str
+
+
+class ExpandedThing(Thing):
+    _expand: ThingExtension = ThingExtension()
+
+
+class ThingQueryParams(OBPagedQueryParams):
+    pass
+
+
+class ExpandedThingQueryParams(OBPagedQueryParams):
+    expand: list[str] = field(default_factory=lambda: ["statustypen"])
+
+
+@extend_schema_view(get=extend_schema(), post=extend_schema())
+class ThingListView(Unauthenticated, ListView[ThingQueryParams, Thing, Thing]):
+    data_type = Thing
+    return_data_type = Thing
+    query_type = ThingQueryParams
+    endpoint_path = "zaaktypen"
+
+
+@extend_schema_view(get=extend_schema(), post=extend_schema())
+class ExpandedThingListView(ThingListView):
+    data_type = ExpandedThing
+    return_data_type = ExpandedThing
+    query_type = ExpandedThingQueryParams
+    expansions = {
+        "statustypen": make_expansion(
+            f"{BASE_URL}statustypen",
+            lambda t: {"zaaktype": t.url},  # pyright: ignore[reportAttributeAccessIssue]
+            StatusType,
+        ),
+    }
+
+
+def thing(id: int) -> dict:
+    return {"url": f"{BASE_URL}zaaktypen/{id}", "omschrijving": f"thing {id}"}
+
+
+@requests_mock.Mocker()
+class StreamAllTests(ZTCTestCase):
+    def mock_pages(self, m):
+        m.get(
+            f"{BASE_URL}zaaktypen",
+            json={
+                "count": 3,
+                "next": f"{BASE_URL}zaaktypen?page=2",
+                "previous": None,
+                "results": [thing(1), thing(2)],
+            },
+        )
+        m.get(
+            f"{BASE_URL}zaaktypen?page=2",
+            complete_qs=True,
+            json={
+                "count": 3,
+                "next": None,
+                "previous": f"{BASE_URL}zaaktypen",
+                "results": [thing(3)],
+            },
+        )
+
+    def get(self, view, query: str) -> dict:
+        response = view.as_view()(self.factory.get(f"/?{query}"), slug="ztc")
+        self.assertTrue(response.streaming)
+        return json.loads(b"".join(response.streaming_content))
+
+    def test_streams_all_pages(self, m):
+        self.mock_pages(m)
+
+        data = self.get(ThingListView, "all=true")
+
+        self.assertEqual(
+            [result["omschrijving"] for result in data["results"]],
+            ["thing 1", "thing 2", "thing 3"],
+        )
+        self.assertEqual(
+            data["pagination"],
+            {"count": 3, "page": 1, "pageSize": 3, "next": None, "previous": None},
+        )
+        self.assertIn("omschrijving", [f["name"] for f in data["fields"]])
+
+    @override_settings(PAGE_PREFETCH_WINDOW=4)
+    def test_prefetches_pages(self, m):
+        self.mock_pages(m)
+
+        with patch.object(
+            clients, "_prefetch_pages", wraps=clients._prefetch_pages
+        ) as prefetch:
+            data = self.get(ThingListView, "all=true")
+
+        prefetch.assert_called_once()
+        self.assertEqual(prefetch.call_args.args[1], [f"{BASE_URL}zaaktypen?page=2"])
+        self.assertEqual(len(data["results"]), 3)
+
+    def test_expands_every_page(self, m):
+        self.mock_pages(m)
+        m.get(
+            f"{BASE_URL}statustypen",
+            json={
+                "count": 1,
+                "next": None,
+                "previous": None,
+                "results": [{"omschrijving": "open"}],
+            },
+        )
+
+        data = self.get(ExpandedThingListView, "all=true")
+
+        self.assertEqual(
+            [result["_expand"] for result in data["results"]],
+            [{"statustypen": [{"omschrijving": "open"}]}] * 3,
+        )
+
+    def test_asks_for_large_pages(self, m):
+        self.mock_pages(m)
+
+        self.get(ThingListView, "all=true")
+
+        self.assertEqual(m.request_history[0].qs["pagesize"], ["500"])
+
+    def test_failing_page_ends_with_an_error(self, m):
+        self.mock_pages(m)
+        m.get(
+            f"{BASE_URL}zaaktypen?page=2",
+            complete_qs=True,
+            exc=requests.exceptions.ConnectionError,
+        )
+
+        data = self.get(ThingListView, "all=true")
+
+        self.assertEqual(
+            [result["omschrijving"] for result in data["results"]],
+            ["thing 1", "thing 2"],
+        )
+        self.assertEqual(data["error"]["code"], "connection_error")
@@ -0,0 +1,227 @@
+from django.core.cache import cache
+from django.test import SimpleTestCase, override_settings
+
+import requests_mock
+from drf_spectacular.utils import extend_schema, extend_schema_view
+
+from openbeheer.invalidation import publish_change
+
+from ..validators import get_validator, set_etag, tags_of
+from . import BASE_URL, UUID, ZTCTestCase
+from .test_metadata import ThingDetailView
+from .test_sparse_detail import (
+    ThingDetailView as ExpandedThingDetailView,
+    page,
+)
+
+ZAAKTYPE = f"{BASE_URL}zaaktypen/1"
+
+
+class ValidatorCacheTests(SimpleTestCase):
+    def setUp(self):
+        cache.clear()
+        set_etag(
+            "view:OZ:1",
+            '"1"',
+            tags=[ZAAKTYPE, f"{BASE_URL}statustypen/1"],
+            upstream_etags={ZAAKTYPE: '"u1"'},
+        )
+
+    def test_tags_of(self):
+        self.assertEqual(
+            tags_of(
+                {
+                    "url": ZAAKTYPE,
+                    "omschrijving": "not a url",
+                    "_expand": {
+                        "statustypen": [
+                            {"url": f"{BASE_URL}statustypen/1", "zaaktype": ZAAKTYPE}
+                        ],
+                        "besluittypen": [{"zaaktypen": [f"{BASE_URL}zaaktypen/2"]}],
+                    },
+                    "identificatie": "ZAAKTYPE-1",
+                    "catalogus": None,
+                }
+            ),
+            {
+                ZAAKTYPE,
+                f"{BASE_URL}statustypen/1",
+                f"{BASE_URL}zaaktypen/2",
+                "ZAAKTYPE-1",
+            },
+        )
+
+    def test_cached(self):
+        validator = get_validator("view:OZ:1")
+
+        assert validator
+        self.assertEqual(validator.etag, '"1"')
+        self.assertEqual(validator.upstream_etags, {ZAAKTYPE: '"u1"'})
+        self.assertIsNone(get_validator("view:OZ:2"))
+
+    def test_changed_resource_invalidates(self):
+        publish_change(None, urls=[f"{BASE_URL}statustypen/1"])
+
+        self.assertIsNone(get_validator("view:OZ:1"))
+
+    def test_new_sub_resource_invalidates(self):
+        publish_change(None, {"url": f"{BASE_URL}statustypen/2", "zaaktype": ZAAKTYPE})
+
+        self.assertIsNone(get_validator("view:OZ:1"))
+
+    def test_other_changes_keep_cache(self):
+        publish_change(None, {"url": f"{BASE_URL}zaaktypen/3"})
+
+        self.assertIsNotNone(get_validator("view:OZ:1"))
+
+
+@extend_schema_view(
+    get=extend_schema(),
+    put=extend_schema(),
+    patch=extend_schema(),
+    delete=extend_schema(),
+)
+class RawThingDetailView(ThingDetailView):
+    return_data_type = ThingDetailView.data_type
+
+
+@requests_mock.Mocker()
+class ConditionalRequestTests(ZTCTestCase):
+    def get(self, view, **headers):
+        response = view.as_view()(
+            self.factory.get("/", headers=headers), slug="ztc", uuid=UUID
+        )
+        response.render()
+        return response
+
+    def mock(self, m, omschrijving: str = "thing", **headers):
+        return m.get(
+            f"{BASE_URL}zaaktypen/{UUID}",
+            json={
+                "url": f"{BASE_URL}zaaktypen/{UUID}",
+                "omschrijving": omschrijving,
+                "catalogus": f"{BASE_URL}catalogussen/1",
+            },
+            headers=headers,
+        )
+
+    @override_settings(RAW_PASS_THROUGH=True)
+    def test_not_modified(self, m):
+        for view in (ThingDetailView, RawThingDetailView):
+            with self.subTest(view=view):
+                self.mock(m, ETag='"u1"')
+                response = self.get(view)
+                etag = response["ETag"]
+
+                self.assertEqual(response.status_code, 200)
+                self.assertIn("no-cache", response["Cache-Control"])
+
+                upstream = m.get(
+                    f"{BASE_URL}zaaktypen/{UUID}",
+                    status_code=304,
+                    headers={"ETag": '"u1"'},
+                )
+                response = self.get(view, if_none_match=etag)
+
+                self.assertEqual(response.status_code, 304)
+                self.assertEqual(response["ETag"], etag)
+                self.assertEqual(response.content, b"")
+                # revalidated upstream
+                self.assertEqual(upstream.call_count, 1)
+                self.assertEqual(upstream.last_request.headers["If-None-Match"], '"u1"')
+
+    def test_modified_upstream(self, m):
+        self.mock(m, ETag='"u1"')
+        etag = self.get(ThingDetailView)["ETag"]
+        self.mock(m, "changed elsewhere", ETag='"u2"')
+
+        response = self.get(ThingDetailView, if_none_match=etag)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response["ETag"], etag)
+        self.assertIn(b"changed elsewhere", response.content)
+
+    def test_without_upstream_etag(self, m):
+        upstream = self.mock(m)
+        etag = self.get(ThingDetailView)["ETag"]
+
+        response = self.get(ThingDetailView, if_none_match=etag)
+
+        self.assertEqual(response.status_code, 304)
+        # answered from the validator cache
+        self.assertEqual(upstream.call_count, 1)
+
+    def test_modified(self, m):
+        upstream = self.mock(m)
+        etag = self.get(ThingDetailView)["ETag"]
+        publish_change(None, urls=[f"{BASE_URL}zaaktypen/{UUID}"])
+        m.get(
+            f"{BASE_URL}zaaktypen/{UUID}",
+            json={
+                "url": f"{BASE_URL}zaaktypen/{UUID}",
+                "omschrijving": "changed",
+                "catalogus": f"{BASE_URL}catalogussen/1",
+            },
+        )
+
+        response = self.get(ThingDetailView, if_none_match=etag)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response["ETag"], etag)
+        self.assertEqual(upstream.call_count, 1)
+
+    def test_unchanged_after_rebuild(self, m):
+        upstream = self.mock(m)
+        etag = self.get(ThingDetailView)["ETag"]
+        cache.clear()
+
+        response = self.get(ThingDetailView, if_none_match=etag)
+
+        # rebuilt, but the client still has it
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(upstream.call_count, 2)
+
+    def test_plain_type_has_etag(self, m):
+        self.mock(m)
+        response = self.get(RawThingDetailView)
+
+        self.assertEqual(response.status_code, 200)
+        etag = response["ETag"]
+        self.assertEqual(
+            self.get(RawThingDetailView, if_none_match=etag).status_code, 304
+        )
+
+    def mock_expanded(self, m, statustypen_etag: str, statustype: str = "open"):
+        m.get(
+            f"{BASE_URL}zaaktypen/{UUID}",
+            json={"url": f"{BASE_URL}zaaktypen/{UUID}", "omschrijving": "thing"},
+            headers={"ETag": '"u1"'},
+        )
+        statustypen = m.get(
+            f"{BASE_URL}statustypen",
+            json=page(statustype),
+            headers={"ETag": statustypen_etag},
+        )
+        m.get(f"{BASE_URL}resultaattypen", json=page("klaar"))
+        return statustypen
+
+    def test_expansions_revalidated(self, m):
+        self.mock_expanded(m, '"s1"')
+        etag = self.get(ExpandedThingDetailView)["ETag"]
+
+        statustypen = self.mock_expanded(m, '"s1"')
+        response = self.get(ExpandedThingDetailView, if_none_match=etag)
+
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(statustypen.call_count, 1)
+        self.assertEqual(statustypen.last_request.headers["If-None-Match"], '"s1"')
+
+    def test_modified_expansion_upstream(self, m):
+        self.mock_expanded(m, '"s1"')
+        etag = self.get(ExpandedThingDetailView)["ETag"]
+
+        self.mock_expanded(m, '"s2"', "changed elsewhere")
+        response = self.get(ExpandedThingDetailView, if_none_match=etag)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertIn(b"changed elsewhere", response.content)
@@ -0,0 +1,117 @@
+import datetime
+
+from django.core.cache import cache
+from django.test import SimpleTestCase
+
+from drf_spectacular.utils import extend_schema, extend_schema_view
+from msgspec import Struct
+
+from openbeheer.invalidation import publish_change
+from openbeheer.types import VersionSummary
+
+from ..versions import get_versions, set_versions
+from ..views import DetailView, DetailWithVersions
+
+BASE_URL = "https://example.com/catalogi/api/v1/"
+
+
+class VersionsCacheTests(SimpleTestCase):
+    def setUp(self):
+        cache.clear()
+        self.versions = [
+            VersionSummary(
+                uuid="1",
+                begin_geldigheid=datetime.date(2025, 1, 1),
+                einde_geldigheid=None,
+                concept=False,
+            )
+        ]
+        set_versions(
+            "view:OZ", "ZAAKTYPE-1", self.versions, urls=[f"{BASE_URL}zaaktypen/1"]
+        )
+
+    def test_cached_per_scope(self):
+        self.assertEqual(get_versions("view:OZ", "ZAAKTYPE-1"), self.versions)
+        self.assertIsNone(get_versions("view:other", "ZAAKTYPE-1"))
+        self.assertIsNone(get_versions("view:OZ", "ZAAKTYPE-2"))
+
+    def test_new_version_invalidates(self):
+        set_versions("view:other", "ZAAKTYPE-1", self.versions, urls=[])
+
+        publish_change(
+            None, {"url": f"{BASE_URL}zaaktypen/2", "identificatie": "ZAAKTYPE-1"}
+        )
+
+        self.assertIsNone(get_versions("view:OZ", "ZAAKTYPE-1"))
+        self.assertIsNone(get_versions("view:other", "ZAAKTYPE-1"))
+
+    def test_deleted_version_invalidates(self):
+        publish_change(None, urls=[f"{BASE_URL}zaaktypen/1"])
+
+        self.assertIsNone(get_versions("view:OZ", "ZAAKTYPE-1"))
+
+    def test_other_changes_keep_cache(self):
+        publish_change(
+            None, {"url": f"{BASE_URL}zaaktypen/3", "identificatie": "ZAAKTYPE-3"}
+        )
+
+        self.assertEqual(get_versions("view:OZ", "ZAAKTYPE-1"), self.versions)
+
+
+class Thing(Struct):
+    url: str | None = None
+    identificatie: str | None = None
+
+
+@extend_schema_view(
+    get=extend_schema(),
+    put=extend_schema(),
+    patch=extend_schema(),
+    delete=extend_schema(),
+)
+class ThingDetailView(DetailWithVersions, DetailView[Thing]):
+    data_type = return_data_type = Thing
+    endpoint_path = "things/{uuid}"
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.fetched = 0
+
+    def get_item_versions(self, slug: str, data: Thing) -> tuple[list[Thing], int]:
+        self.fetched += 1
+        return [data], 200
+
+    def format_version(self, data: Thing) -> VersionSummary:
+        return VersionSummary(
+            uuid="1",
+            begin_geldigheid=datetime.date(2025, 1, 1),
+            einde_geldigheid=None,
+            concept=False,
+        )
+
+    def get_version_identificatie(self, data: Thing) -> str | None:
+        return data.identificatie
+
+
+class DetailViewVersionsTests(SimpleTestCase):
+    def setUp(self):
+        cache.clear()
+        self.view = ThingDetailView()
+
+    def test_versions_are_cached(self):
+        thing = Thing(url=f"{BASE_URL}things/1", identificatie="THING-1")
+
+        first = self.view.get_versions("OZ", thing)
+        second = self.view.get_versions("OZ", thing)
+
+        self.assertEqual(first, second)
+        self.assertEqual(self.view.fetched, 1)
+
+    def test_without_identificatie_the_cache_is_skipped(self):
+        thing = Thing(url=f"{BASE_URL}things/1")
+
+        versions, status_code = self.view.get_versions("OZ", thing)
+
+        self.assertEqual(status_code, 200)
+        self.assertEqual(versions, self.view.get_versions("OZ", thing)[0])
+        self.assertEqual(self.view.fetched, 2)
@@ -0,0 +1,124 @@
+"""Cache of the ETags of detail responses, to answer conditional requests
+
+A detail response is built from the main resource, its expansions and its
+versions; its ETag is a hash of what was sent. The ETag is kept together with
+the upstream ETags of the responses it was built from, and the generations of
+every resource the response was built from: its own url, the urls it contains,
+its zaaktype, catalogus and identificatie.
+
+A conditional request is answered from this cache as long as none of those
+generations changed, and the upstream responses still have their ETags, which
+is checked with conditional GETs. Generations are dropped when one of those
+resources is created, changed or deleted through Open Beheer; changes made
+elsewhere to resources whose responses had no ETag are picked up after
+DETAIL_VALIDATORS_TIMEOUT.
+"""
+
+import hashlib
+import uuid
+from collections.abc import Iterable, Mapping
+
+from django.conf import settings
+from django.core.cache import caches
+from django.dispatch import receiver
+
+import msgspec
+
+from openbeheer.invalidation import resources_changed
+
+_TAG_KEYS = frozenset({"url", "zaaktype", "zaaktypen", "catalogus", "identificatie"})
+
+
+class Validator(msgspec.Struct):
+    etag: str
+    generations: dict[str, str]
+    "generation key -> generation, of the resources the response was built from"
+    upstream_etags: dict[str, str] = {}
+    "url -> ETag, of the upstream responses the response was built from"
+
+
+def _cache():
+    return caches[settings.DETAIL_VALIDATORS_CACHE]
+
+
+def _hash(value: str) -> str:
+    return hashlib.sha256(value.encode()).hexdigest()
+
+
+def _generation_key(tag: str) -> str:
+    return f"validators:generation:{_hash(tag)}"
+
+
+def _key(scope: str) -> str:
+    return f"validators:{_hash(scope)}"
+
+
+def tags_of(data: object) -> set[str]:
+    """Return the urls and identificaties in decoded JSON `data`"""
+    match data:
+        case dict():
+            tags = set()
+            for name, value in data.items():
+                if name in _TAG_KEYS and isinstance(value, str) and value:
+                    tags.add(value)
+                elif name in _TAG_KEYS and isinstance(value, list):
+                    tags |= {v for v in value if isinstance(v, str) and v}
+                else:
+                    tags |= tags_of(value)
+            return tags
+        case list():
+            return set().union(*map(tags_of, data))
+        case _:
+            return set()
+
+
+def get_validator(scope: str) -> Validator | None:
+    """Return the validator of the response for `scope`, if none of its resources changed
+
+    :param scope: what the response is of, like the view, service, uuid and
+        query parameters
+    """
+    cache = _cache()
+    if not (data := cache.get(_key(scope))):
+        return None
+    validator = msgspec.msgpack.decode(data, type=Validator)
+    if cache.get_many(list(validator.generations)) != validator.generations:
+        return None
+    return validator
+
+
+def set_etag(
+    scope: str,
+    etag: str,
+    tags: Iterable[str],
+    upstream_etags: Mapping[str, str] = {},
+) -> None:
+    """Remember `etag` for `scope`, until one of the resources in `tags` changes
+
+    :param upstream_etags: url -> ETag of the upstream responses it was built from
+    """
+    cache = _cache()
+    timeout = settings.DETAIL_VALIDATORS_TIMEOUT
+    keys = [_generation_key(tag) for tag in tags]
+    generations = cache.get_many(keys)
+    if missing := {key: uuid.uuid4().hex for key in keys if key not in generations}:
+        cache.set_many(missing, timeout=timeout)
+        generations |= missing
+    cache.set(
+        _key(scope),
+        msgspec.msgpack.encode(
+            Validator(
+                etag=etag,
+                generations=generations,
+                upstream_etags=dict(upstream_etags),
+            )
+        ),
+        timeout=timeout,
+    )
+
+
+@receiver(resources_changed, weak=False)
+def _invalidate_changed(sender, urls, zaaktypen, catalogi, identificaties, **_):
+    _cache().delete_many(
+        [_generation_key(tag) for tag in urls | zaaktypen | catalogi | identificaties]
+    )
@@ -0,0 +1,91 @@
+"""Cache of the version histories shown on detail views
+
+Listing the versions of a zaaktype means paging through every zaaktype with
+the same identificatie. The summaries are cached per identificatie, and
+dropped when a version is created, changed, published or deleted through Open
+Beheer.
+
+All cached histories of an identificatie share a generation in their key, so
+dropping the generation drops them for every view and service at once.
+"""
+
+import hashlib
+import uuid
+from collections.abc import Iterable
+
+from django.conf import settings
+from django.core.cache import caches
+from django.dispatch import receiver
+
+import msgspec
+
+from openbeheer.invalidation import resources_changed
+from openbeheer.types import VersionSummary
+
+
+def _cache():
+    return caches[settings.VERSIONS_CACHE]
+
+
+def _hash(value: str) -> str:
+    return hashlib.sha256(value.encode()).hexdigest()
+
+
+def _generation_key(identificatie: str) -> str:
+    return f"versions:generation:{_hash(identificatie)}"
+
+
+def _index_key(url: str) -> str:
+    "Key of the identificatie of version `url`"
+    return f"versions:index:{_hash(url)}"
+
+
+def _key(scope: str, identificatie: str) -> str:
+    generation = _cache().get_or_set(
+        _generation_key(identificatie), lambda: uuid.uuid4().hex, timeout=None
+    )
+    return f"versions:{generation}:{_hash(f'{scope}:{identificatie}')}"
+
+
+def get_versions(scope: str, identificatie: str) -> list[VersionSummary] | None:
+    """Return the cached versions of `identificatie`
+
+    :param scope: what the versions are of, like the view and service slug
+    """
+    if data := _cache().get(_key(scope, identificatie)):
+        return msgspec.msgpack.decode(data, type=list[VersionSummary])
+    return None
+
+
+def set_versions(
+    scope: str,
+    identificatie: str,
+    versions: list[VersionSummary],
+    urls: Iterable[str],
+) -> None:
+    """Cache the versions of `identificatie`
+
+    :param urls: of the versions, so deleting one of them drops the cache
+    """
+    cache = _cache()
+    cache.set(
+        _key(scope, identificatie),
+        msgspec.msgpack.encode(versions),
+        timeout=settings.VERSIONS_TIMEOUT,
+    )
+    cache.set_many(
+        {_index_key(url): identificatie for url in urls},
+        timeout=settings.VERSIONS_TIMEOUT,
+    )
+
+
+@receiver(resources_changed, weak=False)
+def _invalidate_changed(sender, urls, identificaties, **_):
+    # deleted versions only come with their url
+    indexed = _cache().get_many([_index_key(url) for url in urls])
+    _cache().delete_many(
+        [
+            _generation_key(identificatie)
+            for identificatie in identificaties | set(indexed.values())
+        ]
+    )
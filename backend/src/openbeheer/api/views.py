@@ -1,36 +1,56 @@
 from __future__ import annotations
 
+import asyncio
+import hashlib
+import inspect
+import time
 from abc import ABC
-from collections.abc import Callable
-from functools import partial
+from collections import defaultdict
+from collections.abc import Awaitable, Callable
+from concurrent.futures import ThreadPoolExecutor
+from contextvars import copy_context
+from functools import cache, partial
+from itertools import batched, chain, islice
 from typing import (
     TYPE_CHECKING,
     Iterable,
+    Iterator,
     Mapping,
     NoReturn,
     Protocol,
     Sequence,
+    cast,
     get_origin,
     override,
     runtime_checkable,
 )
 from uuid import UUID
 
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.db import connections
+from django.http import StreamingHttpResponse
+from django.utils.cache import patch_cache_control
+from django.utils.http import parse_etags
 from django.utils.translation import gettext as _
 
 import structlog
 from ape_pie import APIClient
-from drf_spectacular.utils import extend_schema
+from asgiref.sync import sync_to_async
+from drf_spectacular.utils import OpenApiParameter, extend_schema
 from furl import furl
 from msgspec import (
     UNSET,
+    Raw,
     Struct,
+    UnsetType,
     ValidationError,
     convert,
     structs,
     to_builtins,
 )
 from msgspec.json import Encoder, decode
+from requests.exceptions import ConnectionError, ReadTimeout
 from rest_framework import status
 from rest_framework.parsers import BaseParser, JSONParser
 from rest_framework.renderers import BaseRenderer, JSONRenderer
@@ -39,13 +59,25 @@ from rest_framework.views import APIView as _APIView
 from typing_extensions import TypeIs
 
 from openbeheer.api.drf_spectacular.schema import MsgSpecFilterBackend
-from openbeheer.clients import iter_pages, ztc_client
+from openbeheer.api.validators import get_validator, set_etag, tags_of
+from openbeheer.api.versions import get_versions, set_versions
+from openbeheer.clients import (
+    aiter_pages,
+    iter_pages,
+    thread_client,
+    upstream_etags,
+    ztc_client,
+)
+from openbeheer.invalidation import publish_change
 from openbeheer.types import (
     DetailResponse,
+    DetailResponseWithMetadataVersion,
+    DetailResponseWithoutVersions,
     ExternalServiceError,
     FrontendFieldsets,
     OBField,
     OBList,
+    OBMetadata,
     OBOption,
     OBPagedQueryParams,
     OBPagination,
@@ -53,13 +85,18 @@ from openbeheer.types import (
     ZGWError,
     ZGWResponse,
 )
-from openbeheer.types._open_beheer import CamelCaseFieldName, ob_fields_of_type
-from openbeheer.utils.decorators import handle_service_errors
+from openbeheer.types._open_beheer import (
+    CamelCaseFieldName,
+    UUIDMixin,
+    ob_fields_of_type,
+)
+from openbeheer.utils import camelize
+from openbeheer.utils.decorators import handle_service_errors, service_error
 
 if TYPE_CHECKING:
-    from rest_framework.request import Request
+    from django.http import HttpRequest
 
-    from openbeheer.types._open_beheer import DetailResponseWithoutVersions
+    from rest_framework.request import Request
 
     # poor man's Comprarable
     # don't want to import SupportsRichComparison from pyright's private _typeshed
@@ -69,14 +106,22 @@ logger = structlog.stdlib.get_logger(__name__)
 
 _ENCODER = Encoder()
 
+_metadata: dict[type, tuple[OBMetadata, float]] = {}
+"The metadata of each detail view class, with when it expires"
+
 # requests query param type
 type _RequestParamT = (
     str | bytes | int | float | None | Iterable[str | bytes | int | float]
 )
 
 
-class MsgspecJSONRenderer(JSONRenderer):
-    def render(self, data, *_, **__) -> bytes:
+class MsgspecJSONMixin:
+    def render(self, data, *args, **kwargs) -> bytes:
+        """Encode data straight to JSON with msgspec, skipping `to_builtins`
+
+        The data can be anything msgspec supports, falling back to the DRF
+        renderer for anything else.
+        """
         match data:
             case None:
                 return bytes()
@@ -86,7 +131,11 @@ class MsgspecJSONRenderer(JSONRenderer):
                 try:
                     return _ENCODER.encode(data)
                 except TypeError:  # raised errors contain DRF types
-                    return super().render(data, *_, **__)
+                    return super().render(data, *args, **kwargs)  # pyright: ignore[reportAttributeAccessIssue]
+
+
+class MsgspecJSONRenderer(MsgspecJSONMixin, JSONRenderer):
+    pass
 
 
 class _Renderer(Protocol):
@@ -100,21 +149,50 @@ class MsgspecMixin:
         this mixin translates it to builtins so any DRF renderer can handle them.
         """
         try:
-            return super().render(to_builtins(data), *args, **kwargs)
+            return super().render(
+                decode(data) if isinstance(data, Raw) else to_builtins(data),
+                *args,
+                **kwargs,
+            )
         except TypeError:
             # data is probably some DRF class returned by exception handling
             return super().render(data, *args, **kwargs)
 
 
+@cache
 def _add_mixin(render_class: type[BaseRenderer]) -> type[BaseRenderer]:
-    """Return a new `render_class`, with `MsgspecMixin` added
+    """Return a `render_class` that supports the types of data msgspec supports
 
-    Adapts any DRF Renderer to support the types of data msgspec supports.
+    JSON renderers that don't override `render` get `MsgspecJSONMixin`, as
+    msgspec's JSON is what they'd render anyway; others, like the camelCase
+    renderer, get `MsgspecMixin`. Built once per renderer class.
     """
-    return type(
-        f"Msgspec{render_class.__name__}",
-        (MsgspecMixin, render_class),
-        {},
+    if issubclass(render_class, MsgspecJSONMixin):
+        return render_class
+    mixin = (
+        MsgspecJSONMixin
+        if issubclass(render_class, JSONRenderer)
+        and render_class.render is JSONRenderer.render
+        else MsgspecMixin
+    )
+    return cast(
+        "type[BaseRenderer]",
+        type(f"Msgspec{render_class.__name__}", (mixin, render_class), {}),
+    )
+
+
+@cache
+def _renderers(
+    renderer_classes: tuple[type[BaseRenderer], ...],
+) -> tuple[BaseRenderer | type[BaseRenderer], ...]:
+    """The renderers for views with `renderer_classes`
+
+    JSON renderers keep no state, so one instance of them is shared; others, like
+    the browsable API, store the request they render and are left to instantiate.
+    """
+    return tuple(
+        renderer() if issubclass(renderer, JSONRenderer) else renderer
+        for renderer in map(_add_mixin, (MsgspecJSONRenderer, *renderer_classes))
     )
 
 
@@ -123,8 +201,10 @@ class MsgspecAPIView(_APIView):
 
     @override
     def get_renderers(self) -> list[BaseRenderer]:
-        render_classes = (_add_mixin(_class) for _class in self.renderer_classes)
-        return [MsgspecJSONRenderer()] + [r() for r in render_classes]
+        return [
+            renderer() if isinstance(renderer, type) else renderer
+            for renderer in _renderers(tuple(self.renderer_classes))
+        ]
 
     @override
     def get_parsers(self) -> list[BaseParser]:
@@ -133,9 +213,152 @@ class MsgspecAPIView(_APIView):
         return [JSONParser()] + super().get_parsers()
 
 
+class AsyncMsgspecAPIView(MsgspecAPIView):
+    """MsgspecAPIView with an async `dispatch`, for views with ``async def`` handlers
+
+    Authentication, permission and throttling checks run in a thread, as they may hit
+    the database. Sync handlers (e.g. DRF's `options`) are run with `sync_to_async`.
+
+    There is no async HTTP client: upstream requests are still made with the sync
+    client, offloaded to threads. A request still holds a thread while it waits on
+    the service, but no longer the event loop.
+    """
+
+    # @extend_schema_view wraps inherited handlers in sync functions, that hide
+    # they are async from Django's detection.
+    view_is_async = True
+
+    @override
+    async def dispatch(self, request: HttpRequest, *args, **kwargs):  # pyright: ignore[reportIncompatibleMethodOverride]
+        self.args = args
+        self.kwargs = kwargs
+        request = self.initialize_request(request, *args, **kwargs)
+        self.request = request
+        self.headers = self.default_response_headers
+
+        try:
+            await sync_to_async(self.initial)(request, *args, **kwargs)
+
+            method = (request.method or "").lower()
+            if method in self.http_method_names:
+                handler = getattr(self, method, self.http_method_not_allowed)
+            else:
+                handler = self.http_method_not_allowed
+
+            if asyncio.iscoroutinefunction(inspect.unwrap(handler)):
+                response = await cast("Callable[..., Awaitable[Response]]", handler)(
+                    request, *args, **kwargs
+                )
+            else:
+                response = await sync_to_async(handler)(request, *args, **kwargs)
+        except Exception as exc:
+            response = self.handle_exception(exc)
+
+        self.response = self.finalize_response(request, response, *args, **kwargs)
+        return self.response
+
+
 type Expansion[T: Struct, R] = Callable[[APIClient, Iterable[T]], Iterable[R]]
 
 
+class _Url(Struct):
+    url: str | None = None
+
+
+def passes_through(
+    return_type: object, data_type: type, expansions: Mapping[str, object]
+) -> bool:
+    """Whether upstream objects can be returned as `return_type` without decoding
+
+    That is if nothing is expanded, `return_type` has all fields of the service's
+    `data_type` and only adds fields derived from the url, like uuid and adminUrl.
+    """
+    return (
+        settings.RAW_PASS_THROUGH
+        and not expansions
+        and isinstance(return_type, type)
+        and issubclass(return_type, data_type)
+        # an empty _expand is part of the response too
+        and "_expand" not in getattr(return_type, "__struct_fields__", ())
+        and getattr(return_type, "__post_init__", None)
+        in (None, UUIDMixin.__post_init__)
+    )
+
+
+@cache
+def _encode_names(type_: type[Struct]) -> dict[str, str]:
+    return {field.name: field.encode_name for field in structs.fields(type_)}
+
+
+def pass_through(return_type: type[Struct], raw: Raw) -> Raw:
+    """Return the upstream JSON object `raw` as `return_type`
+
+    Only the url is decoded; the fields `return_type` derives from it are spliced
+    into the object.
+    """
+    if not (issubclass(return_type, UUIDMixin) and (url := decode(raw, type=_Url).url)):
+        return raw
+
+    names = _encode_names(return_type)
+    derived = _ENCODER.encode(
+        {
+            names[name]: value
+            for name, value in return_type.url_fields(url).items()
+            if value is not UNSET
+        }
+    )
+    obj = bytes(raw).rstrip()
+    if obj.endswith(b"}") and obj[:-1].rstrip() != b"{":
+        return Raw(obj[:-1] + b"," + derived[1:])
+    return Raw(derived)
+
+
+_STREAM_BATCH_SIZE = 100
+_STREAM_PAGE_SIZE = 500
+"pageSize asked of the service when streaming, it may cap it"
+
+
+def _stream_error(error: Exception) -> ExternalServiceError:
+    if isinstance(error, (ConnectionError, ReadTimeout, ImproperlyConfigured)):
+        return service_error(error)
+    return ExternalServiceError(
+        title="Bad response",
+        detail="The external service returned an error or an out of spec response.",
+        code="bad_response",
+        status=502,
+    )
+
+
+def stream_list(
+    fields: Sequence[OBField], pagination: OBPagination, pages: Iterable[Sequence]
+) -> Iterator[bytes]:
+    """Yield an `OBList` as JSON chunks, one per page of results
+
+    Everything is encoded into one reused buffer. Once the fields and
+    pagination are sent the status can't change anymore, so a failing page
+    ends the results early, and the JSON object gets an ``error`` instead.
+    """
+    buffer = bytearray()
+    _ENCODER.encode_into({"fields": fields, "pagination": pagination}, buffer)
+    buffer[-1:] = b',"results":['
+    yield bytes(buffer)
+
+    separator = b""
+    try:
+        for page in pages:
+            del buffer[:]
+            for obj in page:
+                buffer += separator
+                _ENCODER.encode_into(obj, buffer, -1)
+                separator = b","
+            yield bytes(buffer)
+    except Exception as e:
+        logger.exception("streaming list failed")
+        yield b'],"error":' + _ENCODER.encode(_stream_error(e)) + b"}"
+        return
+    yield b"]}"
+
+
 def fetch_one[T](client: APIClient, path: str, result_type: type[T]) -> T | NoReturn:
     response = client.get(path)
     response.raise_for_status()
@@ -186,6 +409,37 @@ def fetch_all[T](
     )
 
 
+async def afetch_one[T](
+    client: APIClient, path: str, result_type: type[T]
+) -> T | NoReturn:
+    "Async version of :func:`fetch_one`"
+    return await asyncio.to_thread(fetch_one, client, path, result_type)
+
+
+async def afetch_response[T](
+    client: APIClient,
+    path: str,
+    params: Mapping,
+    result_type: type[T],
+) -> ZGWResponse[T] | NoReturn:
+    "Async version of :func:`fetch_response`"
+    return await asyncio.to_thread(fetch_response, client, path, params, result_type)
+
+
+async def afetch_all[T](
+    client: APIClient, path: str, params: Mapping, result_type: type[T]
+) -> list[T]:
+    "Async version of :func:`fetch_all`"
+    return [
+        item
+        async for item in aiter_pages(
+            client,
+            await afetch_response(client, path, params, result_type),
+            result_type,
+        )
+    ]
+
+
 def make_expansion[T: Struct, R](
     path: str, key: Callable[[T], dict], result_type: type[R]
 ) -> Expansion[T, list[R]]:
@@ -208,32 +462,303 @@ def make_expansion[T: Struct, R](
     return expand
 
 
-def expand_many[T: Struct, R](
+def make_batched_expansion[T: Struct, R](
+    path: str,
+    batch_params: Callable[[Sequence[T]], Iterable[dict]],
+    parent: Callable[[R], str | Iterable[str] | None],
+    key: Callable[[T], str | None],
+    result_type: type[R],
+) -> Expansion[T, list[R]]:
+    """Like `make_expansion`, but with one query for a whole page of objects
+
+    Fetches the children of all objects with the queries from `batch_params`, and
+    joins them back to their parents by url.
+
+    :param path: path or full url that will get passed to APIClient
+    :param batch_params: function objects -> query param dicts, e.g. `by_catalogus`.
+                         Each distinct dict is fetched (all pages) once.
+    :param parent: function R -> url(s) of the object(s) the child belongs to
+    :param key: function T -> url of the object, as `parent` would return it
+    :param result_type: type used to decode the .results of the paginated response
+
+    Any HTTP/ValidationError will be raised.
+    """
+
+    def expand(client: APIClient, objects: Iterable[T]) -> Iterable[list[R]]:
+        objects = list(objects)
+        queries = {tuple(sorted(q.items())): q for q in batch_params(objects)}
+
+        children: defaultdict[str, list[R]] = defaultdict(list)
+        for params in queries.values():
+            for child in fetch_all(client, path, params, result_type):
+                match parent(child):
+                    case str() as url:
+                        children[url].append(child)
+                    case None:
+                        pass
+                    case urls:
+                        for url in urls:
+                            children[url].append(child)
+
+        return [children.get(url, []) if (url := key(obj)) else [] for obj in objects]
+
+    return expand
+
+
+def by_catalogus(objects: Sequence[Struct], **params: _RequestParamT) -> Iterable[dict]:
+    """Query params selecting everything in the catalogi of `objects`
+
+    For `make_batched_expansion`, extra query `params` are added to each query.
+    """
+    catalogi = dict.fromkeys(obj.catalogus for obj in objects)  # pyright: ignore[reportAttributeAccessIssue]
+    return ({"catalogus": catalogus} | params for catalogus in catalogi if catalogus)
+
+
+def expansion_names(expand: object) -> Iterable[str]:
+    "The names in an `expand` query param, a comma separated string or a list"
+    if isinstance(expand, str):
+        return filter(None, expand.split(","))
+    return expand if isinstance(expand, Iterable) else ()
+
+
+def _run_expansion[T: Struct, R](
+    expansion: Expansion[T, R], client: APIClient, objects: list[T]
+) -> list[R]:
+    "Run `expansion` in a worker thread and materialize its results"
+    try:
+        with thread_client(client) as own_client:
+            return list(expansion(own_client, objects))
+    finally:
+        # worker threads get their own database connections
+        connections.close_all()
+
+
+def run_expansions[T: Struct, R](
     client: APIClient,
-    expansions: Mapping[str, Expansion[T, R]],  # {attribute_name: expansion}
-    objects: Iterable[T],
+    expansions: Iterable[Expansion[T, R]],
+    objects: list[T],
+    max_workers: int,
+) -> list[list[R]]:
+    """Return the results of each expansion, in the order of `expansions`
+
+    With `max_workers` > 1 the expansions run concurrently in a thread pool that
+    lives as long as this call. Each task runs in a copy of the current context,
+    so context variables (e.g. structlog's and the deadline) carry over, with a
+    client and database connections of its own.
+    The first exception, in the order of `expansions`, is raised.
+    """
+    expansions = list(expansions)
+    if max_workers <= 1 or len(expansions) <= 1:
+        # call all of them before consuming any, lazy expansions only hit the
+        # service after eager ones had the chance to fail
+        results = [expansion(client, objects) for expansion in expansions]
+        return [list(result) for result in results]
+
+    with ThreadPoolExecutor(
+        max_workers=min(max_workers, len(expansions)),
+        thread_name_prefix="expansion",
+    ) as executor:
+        futures = [
+            executor.submit(
+                copy_context().run, _run_expansion, expansion, client, objects
+            )
+            for expansion in expansions
+        ]
+        try:
+            return [future.result() for future in futures]
+        except BaseException:
+            for future in futures:
+                future.cancel()
+            raise
+
+
+class ExpansionNode[T: Struct, R](Struct, frozen=True):
+    """An expansion that uses the results of other expansions
+
+    `expand` is called as ``expand(client, objects, **dependencies)``, with for each
+    name in `depends_on` the results of that expansion, one per object. Every
+    expansion runs once per call to `expand_many`, however many dependents it has.
+
+    A node is an `Expansion` itself, so it fits in the same mappings as plain ones.
+    """
+
+    expand: Callable[..., Iterable[R]]
+    depends_on: tuple[str, ...] = ()
+    internal: bool = False
+    "Only run for its dependents, the results are not set on ._expand"
+
+    def __call__(
+        self, client: APIClient, objects: Iterable[T], /, **dependencies: list
+    ) -> Iterable[R]:
+        return self.expand(client, objects, **dependencies)
+
+
+type Expansions[T: Struct] = Mapping[str, Expansion[T, object]]
+
+
+def _as_node[T: Struct](expansion: Expansion[T, object]) -> ExpansionNode[T, object]:
+    if isinstance(expansion, ExpansionNode):
+        return expansion
+    return ExpansionNode(expansion)
+
+
+def select_expansions[T: Struct](
+    expansions: Expansions[T], names: Iterable[object]
+) -> dict[str, ExpansionNode[T, object]]:
+    """Return the expansions in `names` and the ones they depend on
+
+    Unknown names are ignored, unknown dependencies raise a ValueError.
+    """
+    nodes = {name: _as_node(expansion) for name, expansion in expansions.items()}
+    selected: set[str] = set()
+
+    def select(name: str):
+        if name in selected:
+            return
+        if name not in nodes:
+            raise ValueError(f"Unknown expansion dependency {name!r}")
+        selected.add(name)
+        for dependency in nodes[name].depends_on:
+            select(dependency)
+
+    for name in nodes.keys() & set(names):
+        select(name)
+
+    # keep the declaration order
+    return {name: node for name, node in nodes.items() if name in selected}
+
+
+def _waves[T: Struct](nodes: Mapping[str, ExpansionNode[T, object]]) -> list[list[str]]:
+    "Group `nodes` into waves, that only depend on the waves before them"
+    done: set[str] = set()
+    waves: list[list[str]] = []
+    todo = dict(nodes)
+    while todo:
+        wave = [name for name, node in todo.items() if done.issuperset(node.depends_on)]
+        if not wave:
+            raise ValueError(f"Circular dependencies between expansions {list(todo)}")
+        waves.append(wave)
+        done.update(wave)
+        for name in wave:
+            del todo[name]
+    return waves
+
+
+def _bind[T: Struct](
+    node: ExpansionNode[T, object], results: Mapping[str, list]
+) -> Expansion[T, object]:
+    return partial(node.expand, **{name: results[name] for name in node.depends_on})
+
+
+def _apply_expansions[T: Struct](
+    objects: list[T],
+    nodes: Mapping[str, ExpansionNode[T, object]],
+    results: Mapping[str, list],
 ) -> list[T]:
-    "Return new objects with all expansions applied to their ._expand"
-    objects = list(objects)
-    if not expansions:
-        return objects
+    "Return new objects with the results of the non-internal `nodes` on their ._expand"
     szip = partial(zip, strict=True)
-    expansion_results = [fetch(client, objects) for fetch in expansions.values()]
+    names = [name for name, node in nodes.items() if not node.internal]
+    if not names:
+        return objects
     return [
         structs.replace(
             obj,
             _expand=structs.replace(
                 obj._expand,  # type: ignore
-                **dict(szip(expansions, expansions_for_obj)),
+                **dict(szip(names, expansions_for_obj)),
             ),
         )
-        for obj, expansions_for_obj in szip(objects, szip(*expansion_results))
+        for obj, expansions_for_obj in szip(
+            objects, szip(*(results[name] for name in names))
+        )
     ]
 
 
-def expand_one[T: Struct, R](
+def expand_many[T: Struct](
+    client: APIClient,
+    expansions: Expansions[T],  # {attribute_name: expansion}
+    objects: Iterable[T],
+    *,
+    max_workers: int | None = None,
+) -> list[T]:
+    """Return new objects with all expansions applied to their ._expand
+
+    Expansions run in waves: first the ones without dependencies, then the ones
+    whose dependencies have run, etc. Internal expansions only run if another
+    expansion depends on them.
+
+    :param max_workers: number of expansions to run concurrently, defaults to
+        ``settings.EXPANSION_MAX_WORKERS``
+    """
+    objects = list(objects)
+    nodes = select_expansions(
+        expansions,
+        (name for name, e in expansions.items() if not _as_node(e).internal),
+    )
+    if not nodes:
+        return objects
+
+    workers = settings.EXPANSION_MAX_WORKERS if max_workers is None else max_workers
+    results: dict[str, list] = {}
+    for wave in _waves(nodes):
+        start = time.perf_counter()
+        wave_results = run_expansions(
+            client, [_bind(nodes[name], results) for name in wave], objects, workers
+        )
+        results.update(zip(wave, wave_results, strict=True))
+        logger.debug(
+            "ran expansions",
+            expansions=wave,
+            objects=len(objects),
+            duration=round(time.perf_counter() - start, 3),
+        )
+
+    return _apply_expansions(objects, nodes, results)
+
+
+async def aexpand_many[T: Struct](
+    client: APIClient,
+    expansions: Expansions[T],  # {attribute_name: expansion}
+    objects: Iterable[T],
+) -> list[T]:
+    """Async version of :func:`expand_many`
+
+    All expansions of a wave run concurrently, each in a worker thread, gathered
+    with `asyncio.gather`. The first exception to occur is raised.
+    """
+    objects = list(objects)
+    nodes = select_expansions(
+        expansions,
+        (name for name, e in expansions.items() if not _as_node(e).internal),
+    )
+    if not nodes:
+        return objects
+
+    results: dict[str, list] = {}
+    for wave in _waves(nodes):
+        start = time.perf_counter()
+        wave_results = await asyncio.gather(
+            *(
+                asyncio.to_thread(
+                    _run_expansion, _bind(nodes[name], results), client, objects
+                )
+                for name in wave
+            )
+        )
+        results.update(zip(wave, wave_results, strict=True))
+        logger.debug(
+            "ran expansions",
+            expansions=wave,
+            objects=len(objects),
+            duration=round(time.perf_counter() - start, 3),
+        )
+
+    return _apply_expansions(objects, nodes, results)
+
+
+def expand_one[T: Struct](
     client: APIClient,
-    expansions: Mapping[str, Expansion[T, R]],
+    expansions: Expansions[T],
     obj: T,
 ) -> T:
     "Return a new object T with all expansions applied to its ._expand"
@@ -246,6 +771,16 @@ def expand_one[T: Struct, R](
     return result
 
 
+async def aexpand_one[T: Struct](
+    client: APIClient,
+    expansions: Expansions[T],
+    obj: T,
+) -> T:
+    "Async version of :func:`expand_one`"
+    [result] = await aexpand_many(client, expansions, [obj])
+    return result
+
+
 def create_one[T](
     client: APIClient, path: str, result_type: type[T], data: Mapping
 ) -> T | ZGWError:
@@ -348,7 +883,7 @@ class ListView[P: OBPagedQueryParams, T: Struct, S: Struct](MsgspecAPIView):
     endpoint_path: str
     "Path part of the ZGW API endpoint url"
 
-    expansions: Mapping[str, Expansion[T, object]] = {}
+    expansions: Expansions[T] = {}
     "Maps T._expand.'attribute_name` to fetch functions"
 
     def __init__(self, **kwargs):
@@ -359,6 +894,17 @@ class ListView[P: OBPagedQueryParams, T: Struct, S: Struct](MsgspecAPIView):
         super().__init__(**kwargs)
 
         self.get = extend_schema(
+            parameters=[
+                OpenApiParameter(
+                    "all",
+                    bool,
+                    description=(
+                        "Return all results at once, streamed, instead of a page. "
+                        "If a page can't be fetched, the results end early and "
+                        "an `error` is added."
+                    ),
+                )
+            ],
             responses={
                 "200": OBList[self.return_data_type],
                 "400": ZGWError,
@@ -368,7 +914,9 @@ class ListView[P: OBPagedQueryParams, T: Struct, S: Struct](MsgspecAPIView):
         )(self.get)
 
     @handle_service_errors
-    def get(self, request: Request, slug: str = "", **path_params) -> Response:
+    def get(
+        self, request: Request, slug: str = "", **path_params
+    ) -> Response | StreamingHttpResponse:
         as_url = reverse(slug)
         client = ztc_client(slug=slug)
         params = self.parse_query_params(request, client)
@@ -378,10 +926,19 @@ class ListView[P: OBPagedQueryParams, T: Struct, S: Struct](MsgspecAPIView):
             if hasattr(params, param) and (url := as_url(param, value)):
                 setattr(params, param, url)
 
-        data, status_code = self.get_data(client, params)
+        if streaming := request.query_params.get("all") == "true":
+            params.page = 1
+
+        data, status_code = (
+            self.get_data(client, params, {"pageSize": _STREAM_PAGE_SIZE})
+            if streaming
+            else self.get_data(client, params)
+        )
         match data:
             case ZGWError():
                 return Response(data, status=status_code)
+            case _ if streaming:
+                return self.stream_all(client, params, data)
             case _:
                 return Response(
                     self.paginate(
@@ -416,6 +973,8 @@ class ListView[P: OBPagedQueryParams, T: Struct, S: Struct](MsgspecAPIView):
                 type=self.data_type,
                 strict=False,
             )
+            # also covers related resources created for it, they share a parent
+            publish_change(type(self), data)
             data, errors = self.create_related(client, data, request.data)
             if errors:
                 return Response(
@@ -499,9 +1058,9 @@ class ListView[P: OBPagedQueryParams, T: Struct, S: Struct](MsgspecAPIView):
         params |= base_params
         params |= to_builtins(query_params)
 
-        expand = params.pop("expand", [])  # no ZTC endpoints have expand
-        assert isinstance(expand, Iterable)
-        expansions = {a: f for a, f in self.expansions.items() if a in set(expand)}
+        # no ZTC endpoints have expand
+        expand = expansion_names(params.pop("expand", ()))
+        expansions = select_expansions(self.expansions, expand)
 
         with api_client:
             response = api_client.get(self.endpoint_path, params=params)
@@ -513,6 +1072,14 @@ class ListView[P: OBPagedQueryParams, T: Struct, S: Struct](MsgspecAPIView):
             content = response.content
 
             try:
+                if passes_through(self.return_data_type, self.data_type, expansions):
+                    raw = decode(content, type=ZGWResponse[Raw], strict=False)
+                    raw.results = [
+                        pass_through(self.return_data_type, obj) for obj in raw.results
+                    ]
+                    # serialized the same way
+                    return cast("ZGWResponse[T]", raw), response.status_code
+
                 data = decode(
                     content,
                     type=ZGWResponse[self.return_data_type],
@@ -532,6 +1099,51 @@ class ListView[P: OBPagedQueryParams, T: Struct, S: Struct](MsgspecAPIView):
                     invalid_params=[],
                 ), 500
 
+    def stream_all(
+        self, client: APIClient, params: P, first_page: ZGWResponse[T]
+    ) -> StreamingHttpResponse:
+        """Return the results of all pages as one OBList, streamed
+
+        The fields and pagination are sent first, then the results are encoded
+        page by page, while the next pages are being fetched. This keeps memory
+        bounded for exports and large lists.
+        """
+        expansions = select_expansions(
+            self.expansions, expansion_names(to_builtins(params).get("expand"))
+        )
+        raw = passes_through(self.return_data_type, self.data_type, expansions)
+
+        def process(batch: Sequence) -> Sequence:
+            if raw:
+                return [pass_through(self.return_data_type, obj) for obj in batch]
+            return expand_many(client, expansions, batch)
+
+        # the first page is already processed by get_data; iter_pages needs its
+        # results to prefetch the following pages, but we skip them
+        rest = islice(
+            iter_pages(client, first_page, Raw if raw else self.return_data_type),
+            len(first_page.results),
+            None,
+        )
+        pages = chain(
+            [first_page.results],
+            map(process, batched(rest, _STREAM_BATCH_SIZE)),
+        )
+        return StreamingHttpResponse(
+            stream_list(
+                fields=self.parse_ob_fields(params),
+                pagination=OBPagination(
+                    count=first_page.count,
+                    page=1,
+                    page_size=first_page.count,
+                    next=None,
+                    previous=None,
+                ),
+                pages=pages,
+            ),
+            content_type="application/json",
+        )
+
     @staticmethod
     def paginate(
         request: Request,
@@ -576,6 +1188,10 @@ class DetailWithVersions[T: Struct](Protocol):
 
     def format_version(self, data: T) -> VersionSummary: ...
 
+    def get_version_identificatie(self, data: T) -> str | None:
+        "Return what all versions of `data` share, None if it isn't known"
+        ...
+
 
 @runtime_checkable
 class DetailViewWithoutVersions(Protocol):
@@ -591,17 +1207,55 @@ class DetailView[T: Struct](MsgspecAPIView, ABC):
 
     has_versions: bool
     endpoint_path: str
-    expansions: Mapping[str, Expansion[T, object]] = {}
+    expansions: Expansions[T] = {}
+    object_options: frozenset[CamelCaseFieldName] = frozenset()
+    """Fields whose options `get_option_overrides` builds per object
+
+    The metadata has them without options, they come with each object.
+    """
+    upstream_etags: Mapping[str, str] = {}
+    "url -> ETag, of the upstream responses this response is built from"
 
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
         set_schema_responses = extend_schema(
+            parameters=(
+                [
+                    OpenApiParameter(
+                        "fields",
+                        str,
+                        description=(
+                            "`omit` leaves out the fieldsets and the fields that are "
+                            "the same for every object; they are served by the "
+                            "metadata endpoint. Otherwise, comma separated names of "
+                            "the fields to describe, and `versions` for the versions"
+                        ),
+                    )
+                ]
+                if get_origin(self.return_data_type)
+                in (DetailResponse, DetailResponseWithoutVersions)
+                else []
+            )
+            + (
+                [
+                    OpenApiParameter(
+                        "expand",
+                        str,
+                        description=(
+                            "Comma separated expansions to apply, all of them if "
+                            "not given"
+                        ),
+                    )
+                ]
+                if self.expansions
+                else []
+            ),
             responses={
                 "200": self.return_data_type,
                 "400": ZGWError,
                 "502": ExternalServiceError,
                 "504": ExternalServiceError,
-            }
+            },
         )
         self.get = set_schema_responses(self.get)
         self.put = set_schema_responses(self.put)
@@ -615,7 +1269,13 @@ class DetailView[T: Struct](MsgspecAPIView, ABC):
             },
         )(self.delete)
 
-    def get_item_data(self, slug: str, uuid: UUID) -> tuple[T | ZGWError, int]:
+    def get_item_data(
+        self, slug: str, uuid: UUID, expansions: Expansions[T] | None = None
+    ) -> tuple[T | ZGWError, int]:
+        """Fetch the object and apply `expansions` to it
+
+        :param expansions: to apply, all of `self.expansions` if None
+        """
         with ztc_client(slug) as client:
             response = client.get(
                 self.endpoint_path.format(uuid=uuid),
@@ -641,6 +1301,7 @@ class DetailView[T: Struct](MsgspecAPIView, ABC):
                         type=self.data_type,
                         strict=False,
                     ),
+                    expansions,
                 ), response.status_code
             except ValidationError as e:
                 return ZGWError(
@@ -652,17 +1313,58 @@ class DetailView[T: Struct](MsgspecAPIView, ABC):
                     invalid_params=[],
                 ), 500
 
-    def _expand(self, client, object: T):
-        return expand_one(client, self.expansions, object)
+    def get_raw_item_data(self, slug: str, uuid: UUID) -> tuple[Raw | ZGWError, int]:
+        "Like `get_item_data`, for views that `passes_through`"
+        with ztc_client(slug) as client:
+            response = client.get(self.endpoint_path.format(uuid=uuid))
+
+        if not response.ok:
+            return ZGWError(
+                code="",
+                title="",
+                detail="",
+                instance="",
+                status=response.status_code,
+                invalid_params=[],
+            ), response.status_code
+
+        assert isinstance(self.return_data_type, type)
+        return pass_through(
+            self.return_data_type, Raw(response.content)
+        ), response.status_code
+
+    def _expand(self, client, object: T, expansions: Expansions[T] | None = None):
+        return expand_one(
+            client, self.expansions if expansions is None else expansions, object
+        )
+
+    def get_expansions(self, request: Request) -> Expansions[T]:
+        "The expansions asked for with `?expand=`, all of them if it isn't given"
+        if (expand := request.query_params.get("expand")) is None:
+            return self.expansions
+        names = {camelize(name): name for name in self.expansions}
+        return select_expansions(
+            self.expansions, (names.get(name, name) for name in expand.split(","))
+        )
+
+    def get_requested_fields(self, request: Request) -> frozenset[str] | None:
+        "The names asked for with `?fields=`, None if all of them are"
+        fields = request.query_params.get("fields")
+        if fields is None or fields == "omit":
+            return None
+        return frozenset(name for name in fields.split(",") if name)
+
+    def wants_versions(self, request: Request) -> bool:
+        requested = self.get_requested_fields(request)
+        return self.has_versions and (requested is None or "versions" in requested)
 
     def get_fields(
         self,
-        data: T,
         option_overrides: Mapping[str, list[OBOption]] = {},
         *,
         base_editable: Callable[[str], bool] = bool,
     ) -> Iterable[OBField]:
-        """Create OBFields for attributes on `data`.
+        """Create OBFields for attributes of `self.data_type`.
 
         :param option_overrides: Normally options are inferred from type annotations
             of `self.return_data_type`, but they may be overridden here.
@@ -677,6 +1379,99 @@ class DetailView[T: Struct](MsgspecAPIView, ABC):
             base_editable=base_editable,
         )
 
+    def get_option_overrides(
+        self, data: T
+    ) -> Mapping[CamelCaseFieldName, list[OBOption]]:
+        "Options of fields that depend on `data`, instead of only on its type"
+        return {}
+
+    def get_metadata(self) -> OBMetadata:
+        """The fieldsets and fields that are the same for every object
+
+        Kept per view class for ``METADATA_MEMO_TIMEOUT`` seconds, since options
+        of the fields can come from upstream option lists.
+        """
+        now = time.monotonic()
+        if (memo := _metadata.get(type(self))) and now < memo[1]:
+            return memo[0]
+
+        fieldsets = self.get_fieldsets()
+        fields = list(self.get_fields({name: [] for name in self.object_options}))
+        metadata = OBMetadata(
+            version=hashlib.sha256(_ENCODER.encode((fieldsets, fields))).hexdigest()[
+                :16
+            ],
+            fieldsets=fieldsets,
+            fields=fields,
+        )
+        _metadata[type(self)] = metadata, now + settings.METADATA_MEMO_TIMEOUT
+        return metadata
+
+    def get_detail_response(
+        self,
+        request: Request,
+        data: T,
+        versions: list[VersionSummary] | UnsetType,
+    ) -> DetailResponse[T] | DetailResponseWithMetadataVersion[T]:
+        option_overrides = self.get_option_overrides(data)
+        if request.query_params.get("fields") == "omit":
+            return DetailResponseWithMetadataVersion(
+                versions=versions,
+                result=data,
+                metadata=self.get_metadata().version,
+                fields=[
+                    field
+                    for field in self.get_fields(option_overrides)
+                    if field.name in option_overrides
+                ],
+            )
+
+        fields = self.get_fields(option_overrides)
+        if (requested := self.get_requested_fields(request)) is not None:
+            fields = (
+                field
+                for field in fields
+                if field.name in requested
+                or any(field.name.startswith(f"{name}.") for name in requested)
+            )
+
+        return DetailResponse(
+            versions=versions,
+            result=data,
+            fieldsets=self.get_fieldsets(),
+            fields=list(fields),
+        )
+
+    def get_versions(
+        self, slug: str, data: T
+    ) -> tuple[list[VersionSummary] | ZGWError, int]:
+        """Return the summaries of all versions of `data`, cached per identificatie
+
+        Without an identificatie there is nothing to key the cache on, and the
+        versions are fetched every time.
+        """
+        assert isinstance(self, DetailWithVersions)
+        scope = f"{type(self).__qualname__}:{slug}"
+        identificatie = self.get_version_identificatie(data)
+        if identificatie is not None and (
+            (versions := get_versions(scope, identificatie)) is not None
+        ):
+            return versions, status.HTTP_200_OK
+
+        items, status_code = self.get_item_versions(slug, data)
+        if isinstance(items, ZGWError):
+            return items, status_code
+
+        versions = [self.format_version(item) for item in items]
+        if identificatie is not None:
+            set_versions(
+                scope,
+                identificatie,
+                versions,
+                urls=[url for item in items if isinstance(url := item.url, str)],
+            )
+        return versions, status_code
+
     def _has_return_type(self, obj: object) -> TypeIs[T | ZGWError]:
         # obj has correct return_data_type, so we can return it
         # see pyright #10916 why this is pulled into a type guard
@@ -684,32 +1479,134 @@ class DetailView[T: Struct](MsgspecAPIView, ABC):
             obj, (ZGWError, get_origin(self.return_data_type) or self.return_data_type)
         )
 
+    def get_validator_scope(self, request: Request, slug: str, uuid: UUID) -> str:
+        "What the response to `request` depends on, besides the upstream data"
+        return ":".join(
+            [
+                type(self).__qualname__,
+                slug,
+                str(uuid),
+                getattr(request.accepted_renderer, "format", ""),
+                request.GET.urlencode(),
+            ]
+        )
+
+    def cached_etag(
+        self, request: Request, scope: str, slug: str, uuid: UUID
+    ) -> str | None:
+        """Return the ETag of `request`'s If-None-Match the cached response still has
+
+        The upstream responses it was built from that had an ETag, the main
+        resource and its expansions, are revalidated upstream.
+        """
+        if not (if_none_match := request.headers.get("If-None-Match")):
+            return None
+        validator = get_validator(scope)
+        if not (validator and validator.etag in parse_etags(if_none_match)):
+            return None
+        if validator.upstream_etags and not self.upstream_unchanged(
+            slug, validator.upstream_etags
+        ):
+            return None
+        return validator.etag
+
+    def upstream_unchanged(self, slug: str, etags: Mapping[str, str]) -> bool:
+        """Whether the urls in `etags` still have those ETags, with conditional GETs
+
+        Only urls of the service `slug` are checked, concurrently.
+        """
+        client = ztc_client(slug)
+
+        def unchanged(url: str, etag: str) -> bool:
+            with thread_client(client) as own_client:
+                response = own_client.get(url, headers={"If-None-Match": etag})
+            # the HTTP cache of the client may have turned the 304 into a 200
+            return response.status_code in (200, 304) and (
+                response.headers.get("ETag") == etag
+            )
+
+        etags = {
+            url: etag for url, etag in etags.items() if url.startswith(client.base_url)
+        }
+        if len(etags) <= 1:
+            return all(unchanged(url, etag) for url, etag in etags.items())
+        with ThreadPoolExecutor(
+            max_workers=min(settings.EXPANSION_MAX_WORKERS, len(etags)),
+            thread_name_prefix="revalidate",
+        ) as executor:
+            return all(
+                executor.map(
+                    lambda item: copy_context().run(unchanged, *item), etags.items()
+                )
+            )
+
+    @staticmethod
+    def not_modified(etag: str) -> Response:
+        response = Response(status=status.HTTP_304_NOT_MODIFIED)
+        response["ETag"] = etag
+        patch_cache_control(response, private=True, no_cache=True)
+        return response
+
+    def with_etag(self, request: Request, scope: str, response: Response) -> Response:
+        """Add an ETag to a successful `response`, remembered for `scope`
+
+        Returns a 304 instead if the client already has this response.
+        """
+        if response.status_code != status.HTTP_200_OK:
+            return response
+        try:
+            body = _ENCODER.encode(response.data)
+        except TypeError:
+            return response
+
+        etag = f'"{hashlib.sha256(body).hexdigest()[:32]}"'
+        set_etag(
+            scope, etag, tags=tags_of(decode(body)), upstream_etags=self.upstream_etags
+        )
+        if etag in parse_etags(request.headers.get("If-None-Match", "")):
+            return self.not_modified(etag)
+
+        # encoded already
+        response = Response(Raw(body))
+        response["ETag"] = etag
+        patch_cache_control(response, private=True, no_cache=True)
+        return response
+
     @handle_service_errors
     def get(self, request: Request, slug: str, uuid: UUID, *args, **kwargs) -> Response:
-        data, status_code = self.get_item_data(slug, uuid)
+        scope = self.get_validator_scope(request, slug, uuid)
+        if etag := self.cached_etag(request, scope, slug, uuid):
+            return self.not_modified(etag)
+
+        with upstream_etags() as self.upstream_etags:
+            response = self.get_response(request, slug, uuid)
+        return self.with_etag(request, scope, response)
+
+    def get_response(self, request: Request, slug: str, uuid: UUID) -> Response:
+        "The response to GET `request`, before it gets its ETag"
+        expansions = self.get_expansions(request)
+        if passes_through(self.return_data_type, self.data_type, expansions):
+            raw, status_code = self.get_raw_item_data(slug, uuid)
+            return Response(raw, status=status_code)
+
+        data, status_code = self.get_item_data(slug, uuid, expansions)
 
         if self._has_return_type(data):
             return Response(data, status=status_code)
 
         versions = []
-        if self.has_versions:
-            assert isinstance(self, DetailWithVersions)
-            versions, status_code = self.get_item_versions(slug, data)
+        if wants_versions := self.wants_versions(request):
+            versions, status_code = self.get_versions(slug, data)
 
             if isinstance(versions, ZGWError):
                 return Response(versions, status=status_code)
 
-            versions = [self.format_version(version) for version in versions]
-
-        response_data = DetailResponse(
-            versions=(versions if self.has_versions else UNSET),
-            result=data,
-            fieldsets=self.get_fieldsets(),
-            fields=list(self.get_fields(data)),
+        return Response(
+            self.get_detail_response(
+                request, data, versions if wants_versions else UNSET
+            )
         )
 
-        return Response(response_data)
-
     def update(
         self, request: Request, slug: str, uuid: UUID, is_partial: bool = True
     ) -> Response:
@@ -724,14 +1621,13 @@ class DetailView[T: Struct](MsgspecAPIView, ABC):
                     status=response.status_code,
                 )
 
-            data = self._expand(
-                client,
-                decode(
-                    response.content,
-                    type=self.data_type,
-                    strict=False,
-                ),
+            updated = decode(response.content, type=self.data_type, strict=False)
+            publish_change(
+                type(self),
+                updated,
+                urls=[client.to_absolute_url(self.endpoint_path.format(uuid=uuid))],
             )
+            data = self._expand(client, updated, self.get_expansions(request))
 
         if isinstance(
             data, (ZGWError, get_origin(self.return_data_type) or self.return_data_type)
@@ -739,24 +1635,18 @@ class DetailView[T: Struct](MsgspecAPIView, ABC):
             return Response(data, status=response.status_code)
 
         versions = []
-        if self.has_versions:
-            assert isinstance(self, DetailWithVersions)
-            versions, status_code = self.get_item_versions(slug, data)
+        if wants_versions := self.wants_versions(request):
+            versions, status_code = self.get_versions(slug, data)
 
             if isinstance(versions, ZGWError):
                 return Response(versions, status=status_code)
 
-            versions = [self.format_version(version) for version in versions]
-
-        response_data = DetailResponse(
-            versions=versions if self.has_versions else UNSET,
-            result=data,
-            fieldsets=self.get_fieldsets(),
-            fields=list(self.get_fields(data)),
+        return Response(
+            self.get_detail_response(
+                request, data, versions if wants_versions else UNSET
+            )
         )
 
-        return Response(response_data)
-
     @handle_service_errors
     def patch(
         self, request: Request, slug: str, uuid: UUID, *args, **path_params
@@ -790,7 +1680,8 @@ class DetailView[T: Struct](MsgspecAPIView, ABC):
         self, request: Request, slug: str, uuid: UUID, *args, **kwargs
     ) -> Response:
         with ztc_client(slug) as client:
-            response = client.delete(self.endpoint_path.format(uuid=uuid))
+            path = self.endpoint_path.format(uuid=uuid)
+            response = client.delete(path)
 
             if not response.ok:
                 error = decode(response.content, type=ZGWError)
@@ -799,7 +1690,246 @@ class DetailView[T: Struct](MsgspecAPIView, ABC):
                     status=response.status_code,
                 )
 
+            publish_change(type(self), urls=[client.to_absolute_url(path)])
             return Response(status=status.HTTP_204_NO_CONTENT)
 
     def get_fieldsets(self) -> FrontendFieldsets:
         return []
+
+
+class MetadataView(MsgspecAPIView):
+    """The fieldsets and fields of `detail_view` that are the same for every object
+
+    Clients request the detail view with `?fields=omit` and fetch this once per
+    `metadata` version in those responses. Asked for with `?version=`, the
+    response is cached for good; otherwise it's revalidated by ETag.
+    """
+
+    detail_view: type[DetailView]
+
+    @extend_schema(
+        parameters=[
+            OpenApiParameter(
+                "version",
+                str,
+                description="The `metadata` of a detail response, makes it cacheable",
+            )
+        ],
+        responses={"200": OBMetadata, "304": None},
+    )
+    @handle_service_errors
+    def get(self, request: Request, *args, **kwargs) -> Response:
+        metadata = self.detail_view().get_metadata()
+        etag = f'"{metadata.version}"'
+        if etag in parse_etags(request.headers.get("If-None-Match", "")):
+            response = Response(status=status.HTTP_304_NOT_MODIFIED)
+        else:
+            response = Response(metadata)
+
+        response["ETag"] = etag
+        if request.query_params.get("version") == metadata.version:
+            patch_cache_control(
+                response, private=True, max_age=settings.METADATA_MAX_AGE
+            )
+        else:
+            patch_cache_control(response, private=True, no_cache=True)
+        return response
+
+
+class AsyncListView[P: OBPagedQueryParams, T: Struct, S: Struct](  # pyright: ignore[reportIncompatibleMethodOverride]
+    AsyncMsgspecAPIView, ListView[P, T, S]
+):
+    """ListView with async handlers, that offload the upstream requests to threads
+
+    Drop-in replacement for `ListView`, when served by ASGI. Hooks like
+    `parse_query_params` and `create_related` stay sync.
+    """
+
+    @handle_service_errors
+    async def get(self, request: Request, slug: str = "", **path_params) -> Response:  # pyright: ignore[reportIncompatibleMethodOverride]
+        as_url = await sync_to_async(reverse)(slug)
+        client = await sync_to_async(ztc_client)(slug=slug)
+        params = self.parse_query_params(request, client)
+
+        # insert our path_params that map to ZGW API query_params
+        for param, value in path_params.items():
+            if hasattr(params, param) and (url := as_url(param, value)):
+                setattr(params, param, url)
+
+        data, status_code = await self.aget_data(client, params)
+        match data:
+            case ZGWError():
+                return Response(data, status=status_code)
+            case _:
+                return Response(
+                    self.paginate(
+                        request,
+                        data,
+                        params.page,
+                        fields=self.parse_ob_fields(params),
+                    ),
+                    status=status_code,
+                )
+
+    @handle_service_errors
+    async def post(self, request: Request, slug: str = "", **path_params) -> Response:  # pyright: ignore[reportIncompatibleMethodOverride]
+        return await sync_to_async(super().post)(request, slug, **path_params)
+
+    async def aget_data(
+        self,
+        api_client: APIClient,
+        query_params: P,
+        base_params: Mapping[str, _RequestParamT] = {
+            "pageSize": 10,
+        },
+    ) -> tuple[
+        ZGWResponse[T] | ZGWError,
+        int,
+    ]:
+        "Async version of :meth:`ListView.get_data`"
+
+        params: dict[str, _RequestParamT] = {}
+        params |= base_params
+        params |= to_builtins(query_params)
+
+        # no ZTC endpoints have expand
+        expand = expansion_names(params.pop("expand", ()))
+        expansions = select_expansions(self.expansions, expand)
+
+        with api_client:
+            response = await asyncio.to_thread(
+                api_client.get, self.endpoint_path, params=params
+            )
+
+            if not response.ok:
+                error = decode(response.content, type=ZGWError)
+                return error, response.status_code
+
+            try:
+                data = decode(
+                    response.content,
+                    type=ZGWResponse[self.return_data_type],
+                    strict=False,
+                )
+                data.results = await aexpand_many(api_client, expansions, data.results)
+
+                return data, response.status_code
+            except ValidationError as e:
+                logger.debug("invalid service response", validation_error=e)
+                return ZGWError(
+                    code="Bad response",
+                    title="Server returned out of spec response",
+                    detail=str(e),
+                    instance="",
+                    status=500,
+                    invalid_params=[],
+                ), 500
+
+
+class AsyncDetailView[T: Struct](AsyncMsgspecAPIView, DetailView[T]):  # pyright: ignore[reportIncompatibleMethodOverride]
+    """DetailView with async handlers, that offload the upstream requests to threads
+
+    Drop-in replacement for `DetailView`, when served by ASGI. Hooks like
+    `get_item_versions` and `get_fields` stay sync and run in a thread; the
+    mutating methods run the sync implementation in a thread as a whole.
+    """
+
+    async def aget_item_data(
+        self, slug: str, uuid: UUID, expansions: Expansions[T] | None = None
+    ) -> tuple[T | ZGWError, int]:
+        "Async version of :meth:`DetailView.get_item_data`"
+        client = await sync_to_async(ztc_client)(slug)
+        with client:
+            response = await asyncio.to_thread(
+                client.get, self.endpoint_path.format(uuid=uuid)
+            )
+
+            if not response.ok:
+                return ZGWError(
+                    code="",
+                    title="",
+                    detail="",
+                    instance="",
+                    status=response.status_code,
+                    invalid_params=[],
+                ), response.status_code
+
+            try:
+                data = decode(response.content, type=self.data_type, strict=False)
+            except ValidationError as e:
+                return ZGWError(
+                    code="Bad response",
+                    title="Server returned out of spec response",
+                    detail=str(e),
+                    instance="",
+                    status=500,
+                    invalid_params=[],
+                ), 500
+
+            return await self._aexpand(client, data, expansions), response.status_code
+
+    async def _aexpand(
+        self, client: APIClient, object: T, expansions: Expansions[T] | None = None
+    ):
+        "Async version of `_expand`, views that override that get theirs in a thread"
+        if type(self)._expand is not DetailView._expand:
+            return await asyncio.to_thread(self._expand, client, object, expansions)
+        return await aexpand_one(
+            client, self.expansions if expansions is None else expansions, object
+        )
+
+    @handle_service_errors
+    async def get(  # pyright: ignore[reportIncompatibleMethodOverride]
+        self, request: Request, slug: str, uuid: UUID, *args, **kwargs
+    ) -> Response:
+        scope = self.get_validator_scope(request, slug, uuid)
+        if etag := await sync_to_async(self.cached_etag)(request, scope, slug, uuid):
+            return self.not_modified(etag)
+
+        with upstream_etags() as self.upstream_etags:
+            response = await self.aget_response(request, slug, uuid)
+        return await sync_to_async(self.with_etag)(request, scope, response)
+
+    async def aget_response(self, request: Request, slug: str, uuid: UUID) -> Response:
+        "Async version of :meth:`DetailView.get_response`"
+        data, status_code = await self.aget_item_data(
+            slug, uuid, self.get_expansions(request)
+        )
+
+        if self._has_return_type(data):
+            return Response(data, status=status_code)
+
+        versions = []
+        if wants_versions := self.wants_versions(request):
+            versions, status_code = await sync_to_async(self.get_versions)(slug, data)
+
+            if isinstance(versions, ZGWError):
+                return Response(versions, status=status_code)
+
+        return Response(
+            await sync_to_async(self.get_detail_response)(
+                request, data, versions if wants_versions else UNSET
+            )
+        )
+
+    @handle_service_errors
+    async def patch(  # pyright: ignore[reportIncompatibleMethodOverride]
+        self, request: Request, slug: str, uuid: UUID, *args, **path_params
+    ) -> Response:
+        return await sync_to_async(super().patch)(
+            request, slug, uuid, *args, **path_params
+        )
+
+    @handle_service_errors
+    async def put(  # pyright: ignore[reportIncompatibleMethodOverride]
+        self, request: Request, slug: str, uuid: UUID, *args, **path_params
+    ) -> Response:
+        return await sync_to_async(super().put)(
+            request, slug, uuid, *args, **path_params
+        )
+
+    @handle_service_errors
+    async def delete(  # pyright: ignore[reportIncompatibleMethodOverride]
+        self, request: Request, slug: str, uuid: UUID, *args, **kwargs
+    ) -> Response:
+        return await sync_to_async(super().delete)(request, slug, uuid, *args, **kwargs)
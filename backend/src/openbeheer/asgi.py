@@ -0,0 +1,18 @@
+"""
+ASGI config for openbeheer project.
+
+It exposes the ASGI callable as a module-level variable named ``application``.
+Views built on ``AsyncListView``/``AsyncDetailView`` only free up the worker while
+waiting on upstream services when served through this entrypoint.
+
+For more information on this file, see
+https://docs.djangoproject.com/en/5.2/howto/deployment/asgi/
+"""
+
+from django.core.asgi import get_asgi_application
+
+from openbeheer.setup import setup_env
+
+setup_env()
+
+application = get_asgi_application()
@@ -12,6 +12,7 @@ from openbeheer.api.views import (
     reverse,
 )
 from openbeheer.clients import ztc_client
+from openbeheer.invalidation import publish_change
 from openbeheer.types import (
     BesluitTypeWithUUID,
     ExternalServiceError,
@@ -94,6 +95,7 @@ class BesluittypeListView(
                     )
                     if patched.ok:
                         response.data.zaaktypen.append(zaaktype_url)
+                        publish_change(type(self), urls=[zaaktype_url])
 
         return response
 
@@ -0,0 +1,312 @@
+"""Snapshots of a whole catalogus, to expand zaaktypen without asking Open Zaak
+
+A snapshot holds the JSON of the zaaktypen of a catalogus and of their
+besluittypen, statustypen, resultaattypen, eigenschappen, informatieobjecttypen,
+roltypen and zaaktype-informatieobjecttypen, by url. It is kept in the
+``CATALOGUS_SNAPSHOT_CACHE``, and each process keeps the last one it decoded.
+
+Snapshots are built by the ``warm_caches`` command, and in a background thread
+when a request finds one missing or older than ``CATALOGUS_SNAPSHOT_MAX_AGE``.
+Requests never wait for a build: without a snapshot the expansions are fetched
+as usual.
+
+A zaaktype lists the urls of its related resources, so the zaaktype itself is
+enough to check whether the snapshot is still complete for it: a resource that
+was added or removed in the mean time makes us rebuild the snapshot.
+Changes to the related resources themselves are picked up when the snapshot
+expires, or when a view publishes a change of one of them, see
+:mod:`openbeheer.invalidation`.
+"""
+
+import hashlib
+import threading
+import time
+from collections.abc import Mapping
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Protocol
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import connections
+from django.dispatch import receiver
+
+import msgspec
+import structlog
+from ape_pie import APIClient
+from msgspec import Raw, Struct
+from msgspec.json import decode
+
+from openbeheer.api.views import fetch_all, make_expansion, run_expansions
+from openbeheer.clients import thread_client
+from openbeheer.invalidation import resources_changed
+
+logger = structlog.get_logger(__name__)
+
+# resources that can be filtered on catalogus
+_CATALOGUS_RESOURCES = ("besluittypen", "informatieobjecttypen")
+# resources that can only be filtered on a single zaaktype, fetched per zaaktype
+_ZAAKTYPE_RESOURCES = ("statustypen", "resultaattypen", "eigenschappen", "roltypen")
+
+# builds don't run in the context of the request that triggered them, so
+# deadlines and log context don't carry over
+_builder = ThreadPoolExecutor(max_workers=1, thread_name_prefix="catalogus-snapshot")
+
+_decoded: dict[str, "CatalogusSnapshot"] = {}
+"The last snapshot this process decoded, by catalogus"
+_decoded_lock = threading.Lock()
+
+
+class ZaakTypeLike(Protocol):
+    "The fields of a ZaakType that a snapshot needs"
+
+    url: str | None
+    catalogus: str
+    besluittypen: list[str]
+    statustypen: list[str] | None
+    resultaattypen: list[str] | None
+    eigenschappen: list[str] | None
+    informatieobjecttypen: list[str] | None
+    roltypen: list[str] | None
+
+
+class CatalogusSnapshot(Struct, array_like=True):
+    catalogus: str
+    taken_at: float
+    resources: dict[str, bytes]
+    "url -> JSON of every resource in the snapshot"
+    zaaktype_informatieobjecttypen: dict[str, dict[str, str]]
+    "zaaktype url -> {zaaktype-informatieobjecttype url: informatieobjecttype url}"
+
+    def related(self, zaaktype: ZaakTypeLike) -> dict[str, list[bytes]] | None:
+        """Return the JSON of the resources related to `zaaktype`, by expansion
+
+        Returns None if the snapshot doesn't match the zaaktype (anymore).
+        """
+        if (
+            zaaktype.url is None
+            or (ziots := self.zaaktype_informatieobjecttypen.get(zaaktype.url)) is None
+        ):
+            return None
+        if set(ziots.values()) != set(zaaktype.informatieobjecttypen or []):
+            return None
+
+        urls = {
+            "besluittypen": zaaktype.besluittypen,
+            "statustypen": zaaktype.statustypen or [],
+            "resultaattypen": zaaktype.resultaattypen or [],
+            "eigenschappen": zaaktype.eigenschappen or [],
+            "informatieobjecttypen": zaaktype.informatieobjecttypen or [],
+            "roltypen": zaaktype.roltypen or [],
+            "zaaktypeinformatieobjecttypen": list(ziots),
+        }
+        if any(url not in self.resources for group in urls.values() for url in group):
+            return None
+        # keep the order in which Open Zaak returned them
+        order = {url: i for i, url in enumerate(self.resources)}
+        return {
+            name: [self.resources[url] for url in sorted(group, key=order.__getitem__)]
+            for name, group in urls.items()
+        }
+
+
+class _Resource(Struct):
+    url: str
+
+
+class _ZaakTypeInformatieObjectType(_Resource):
+    informatieobjecttype: str
+
+
+def _of_zaaktype(zaaktype: _Resource) -> dict:
+    return {"zaaktype": zaaktype.url, "status": "alles"}
+
+
+def _cache():
+    return caches[settings.CATALOGUS_SNAPSHOT_CACHE]
+
+
+def _key(catalogus: str) -> str:
+    return f"catalogus-snapshot:{hashlib.sha256(catalogus.encode()).hexdigest()}"
+
+
+def _taken_at_key(catalogus: str) -> str:
+    "Key of when the stored snapshot was taken, to check the decoded one against"
+    return f"{_key(catalogus)}:taken_at"
+
+
+def _index_key(url: str) -> str:
+    "Key of the catalogus of the snapshot that holds resource `url`"
+    return f"catalogus-snapshot:index:{hashlib.sha256(url.encode()).hexdigest()}"
+
+
+def build_snapshot(client: APIClient, catalogus: str) -> CatalogusSnapshot:
+    "Fetch everything a snapshot of `catalogus` holds from the ZTC service"
+    start = time.monotonic()
+    resources: dict[str, bytes] = {}
+
+    def add[T: _Resource](raws: list[Raw], type_: type[T]) -> list[T]:
+        added = []
+        for raw in raws:
+            resource = decode(raw, type=type_, strict=False)
+            added.append(resource)
+            resources[resource.url] = bytes(raw)
+        return added
+
+    params = {"catalogus": catalogus, "status": "alles"}
+    zaaktypen = add(fetch_all(client, "zaaktypen", params, Raw), _Resource)
+    for path in _CATALOGUS_RESOURCES:
+        add(fetch_all(client, path, params, Raw), _Resource)
+
+    *per_zaaktype, ziots_per_zaaktype = run_expansions(
+        client,
+        [
+            make_expansion(path, _of_zaaktype, Raw)
+            for path in (*_ZAAKTYPE_RESOURCES, "zaaktype-informatieobjecttypen")
+        ],
+        zaaktypen,
+        settings.EXPANSION_MAX_WORKERS,
+    )
+    for results in per_zaaktype:
+        for raws in results:
+            add(raws, _Resource)
+    ziots = {
+        zaaktype.url: {
+            ziot.url: ziot.informatieobjecttype
+            for ziot in add(raws, _ZaakTypeInformatieObjectType)
+        }
+        for zaaktype, raws in zip(zaaktypen, ziots_per_zaaktype, strict=True)
+    }
+
+    logger.info(
+        "built catalogus snapshot",
+        catalogus=catalogus,
+        zaaktypen=len(zaaktypen),
+        resources=len(resources),
+        duration=round(time.monotonic() - start, 3),
+    )
+    return CatalogusSnapshot(
+        catalogus=catalogus,
+        taken_at=time.time(),
+        resources=resources,
+        zaaktype_informatieobjecttypen=ziots,
+    )
+
+
+def _set_decoded(snapshot: CatalogusSnapshot) -> None:
+    with _decoded_lock:
+        _decoded[snapshot.catalogus] = snapshot
+
+
+def refresh_snapshot(client: APIClient, catalogus: str) -> CatalogusSnapshot | None:
+    """Build and store a new snapshot of `catalogus`
+
+    Returns None if another process or thread is already building it.
+    """
+    cache = _cache()
+    lock = f"{_key(catalogus)}:lock"
+    if not cache.add(lock, True, timeout=settings.CATALOGUS_SNAPSHOT_BUILD_TIMEOUT):
+        return None
+    try:
+        return _build_and_store(client, catalogus)
+    finally:
+        cache.delete(lock)
+
+
+def _build_and_store(client: APIClient, catalogus: str) -> CatalogusSnapshot:
+    snapshot = build_snapshot(client, catalogus)
+    cache = _cache()
+    cache.set(_key(catalogus), msgspec.msgpack.encode(snapshot), timeout=None)
+    cache.set(_taken_at_key(catalogus), snapshot.taken_at, timeout=None)
+    cache.set_many(
+        {_index_key(url): catalogus for url in snapshot.resources}, timeout=None
+    )
+    _set_decoded(snapshot)
+    return snapshot
+
+
+def _refresh(client: APIClient, catalogus: str, lock: str) -> None:
+    try:
+        with thread_client(client) as own_client:
+            _build_and_store(own_client, catalogus)
+    except Exception:
+        logger.exception("building catalogus snapshot failed", catalogus=catalogus)
+    finally:
+        _cache().delete(lock)
+        # the builder thread gets its own database connections
+        connections.close_all()
+
+
+def refresh_in_background(client: APIClient, catalogus: str) -> Future[None] | None:
+    """Build and store a new snapshot of `catalogus` in a background thread
+
+    Returns None if another process or thread is already building it.
+    """
+    lock = f"{_key(catalogus)}:lock"
+    if not _cache().add(lock, True, timeout=settings.CATALOGUS_SNAPSHOT_BUILD_TIMEOUT):
+        return None
+    return _builder.submit(_refresh, client, catalogus, lock)
+
+
+def get_snapshot(client: APIClient, catalogus: str) -> CatalogusSnapshot | None:
+    """Return the stored snapshot of `catalogus`, if there is one
+
+    A missing or old snapshot is rebuilt in the background; an old one is still
+    returned in the mean time. The snapshot is only decoded again when another
+    one was stored since this process last decoded it.
+    """
+    cache = _cache()
+    taken_at = cache.get(_taken_at_key(catalogus))
+    with _decoded_lock:
+        snapshot = _decoded.get(catalogus)
+    if snapshot is None or snapshot.taken_at != taken_at:
+        snapshot = None
+        if taken_at and (data := cache.get(_key(catalogus))):
+            snapshot = msgspec.msgpack.decode(data, type=CatalogusSnapshot)
+            _set_decoded(snapshot)
+
+    if snapshot is None or (
+        time.time() - snapshot.taken_at >= settings.CATALOGUS_SNAPSHOT_MAX_AGE
+    ):
+        refresh_in_background(client, catalogus)
+    return snapshot
+
+
+def invalidate_snapshot(catalogus: str) -> None:
+    "Make the next request rebuild the snapshot of `catalogus`"
+    _cache().delete_many([_key(catalogus), _taken_at_key(catalogus)])
+
+
+@receiver(resources_changed, weak=False)
+def _invalidate_changed(sender, urls, zaaktypen, catalogi, **_):
+    if not settings.CATALOGUS_SNAPSHOTS:
+        return
+    # deleted resources, and ones created for a zaaktype, only come with urls
+    # of resources already in a snapshot
+    indexed = _cache().get_many([_index_key(url) for url in urls | zaaktypen])
+    for catalogus in catalogi | set(indexed.values()):
+        invalidate_snapshot(catalogus)
+
+
+def snapshot_expansions(
+    client: APIClient, zaaktype: ZaakTypeLike, extension_type: type[Struct]
+) -> Mapping[str, object] | None:
+    """Return the expansions of `zaaktype` that the catalogus snapshot holds
+
+    The values are decoded into the types of the fields of `extension_type`.
+    Returns None if snapshots are disabled, or if no up to date one is available.
+    """
+    if not settings.CATALOGUS_SNAPSHOTS:
+        return None
+
+    if not (snapshot := get_snapshot(client, zaaktype.catalogus)):
+        return None
+    if (related := snapshot.related(zaaktype)) is None:
+        # something was added or removed since the snapshot was taken
+        refresh_in_background(client, zaaktype.catalogus)
+        return None
+
+    types = {f.name: f.type for f in msgspec.structs.fields(extension_type)}
+    return {
+        name: decode(b"[" + b",".join(items) + b"]", type=types[name], strict=False)
+        for name, items in related.items()
+    }
@@ -0,0 +1,263 @@
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+
+import requests_mock
+from freezegun import freeze_time
+from msgspec import UNSET, Struct, UnsetType
+from zgw_consumers.constants import APITypes
+from zgw_consumers.test.factories import ServiceFactory
+
+from openbeheer.clients import build_client
+from openbeheer.invalidation import publish_change
+
+from ..snapshot import (
+    _builder,
+    _decoded,
+    _key,
+    invalidate_snapshot,
+    refresh_snapshot,
+    snapshot_expansions,
+)
+
+BASE_URL = "https://example.com/catalogi/api/v1/"
+CATALOGUS = f"{BASE_URL}catalogussen/1"
+ZAAKTYPE = f"{BASE_URL}zaaktypen/1"
+OTHER_ZAAKTYPE = f"{BASE_URL}zaaktypen/2"
+
+
+class Resource(Struct):
+    url: str
+
+
+class Extension(Struct, frozen=True):
+    besluittypen: UnsetType | list[Resource] = UNSET
+    statustypen: UnsetType | list[Resource] = UNSET
+    resultaattypen: UnsetType | list[Resource] = UNSET
+    eigenschappen: UnsetType | list[Resource] = UNSET
+    informatieobjecttypen: UnsetType | list[Resource] = UNSET
+    roltypen: UnsetType | list[Resource] = UNSET
+    zaaktypeinformatieobjecttypen: UnsetType | list[Resource] = UNSET
+
+
+class ZaakType(Struct):
+    url: str | None
+    catalogus: str = CATALOGUS
+    besluittypen: list[str] = []
+    statustypen: list[str] | None = []
+    resultaattypen: list[str] | None = []
+    eigenschappen: list[str] | None = []
+    informatieobjecttypen: list[str] | None = []
+    roltypen: list[str] | None = []
+
+
+def paged(*results) -> dict:
+    return {"count": len(results), "next": None, "previous": None, "results": results}
+
+
+def url(resource: str, id: int) -> str:
+    return f"{BASE_URL}{resource}/{id}"
+
+
+def wait_for_builds():
+    _builder.submit(lambda: None).result()
+
+
+@override_settings(CATALOGUS_SNAPSHOTS=True, CATALOGUS_SNAPSHOT_MAX_AGE=60)
+@requests_mock.Mocker()
+class CatalogusSnapshotTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        _decoded.clear()
+        service = ServiceFactory.create(
+            api_type=APITypes.ztc, slug="ztc", api_root=BASE_URL
+        )
+        self.api_client = build_client(service)
+        self.zaaktype = ZaakType(
+            url=ZAAKTYPE,
+            statustypen=[url("statustypen", 2), url("statustypen", 1)],
+            informatieobjecttypen=[url("informatieobjecttypen", 1)],
+        )
+
+    def mock_catalogus(self, m, *, statustypen=(1, 2)):
+        m.get(
+            f"{BASE_URL}zaaktypen",
+            json=paged({"url": ZAAKTYPE}, {"url": OTHER_ZAAKTYPE}),
+        )
+        m.get(f"{BASE_URL}besluittypen", json=paged())
+        m.get(
+            f"{BASE_URL}informatieobjecttypen",
+            json=paged({"url": url("informatieobjecttypen", 1)}),
+        )
+        for resource in (
+            "statustypen",
+            "resultaattypen",
+            "eigenschappen",
+            "roltypen",
+            "zaaktype-informatieobjecttypen",
+        ):
+            m.get(f"{BASE_URL}{resource}", json=paged())
+        m.get(
+            f"{BASE_URL}statustypen?zaaktype={ZAAKTYPE}",
+            json=paged(
+                *(
+                    {"url": url("statustypen", i), "zaaktype": ZAAKTYPE}
+                    for i in statustypen
+                )
+            ),
+        )
+        m.get(
+            f"{BASE_URL}zaaktype-informatieobjecttypen?zaaktype={ZAAKTYPE}",
+            json=paged(
+                {
+                    "url": url("zaaktype-informatieobjecttypen", 1),
+                    "zaaktype": ZAAKTYPE,
+                    "informatieobjecttype": url("informatieobjecttypen", 1),
+                }
+            ),
+        )
+
+    def expansions(self, zaaktype: ZaakType | None = None):
+        expanded = snapshot_expansions(
+            self.api_client, zaaktype or self.zaaktype, Extension
+        )
+        wait_for_builds()
+        return expanded
+
+    def test_builds_snapshot_and_serves_from_it(self, m):
+        self.mock_catalogus(m)
+
+        # the snapshot is built in the background
+        self.assertIsNone(self.expansions())
+        expanded = self.expansions()
+
+        assert expanded
+        self.assertEqual(
+            expanded["statustypen"],
+            [Resource(url("statustypen", 1)), Resource(url("statustypen", 2))],
+        )
+        self.assertEqual(
+            expanded["zaaktypeinformatieobjecttypen"],
+            [Resource(url("zaaktype-informatieobjecttypen", 1))],
+        )
+        self.assertEqual(expanded["besluittypen"], [])
+        self.assertEqual(
+            m.request_history[0].qs,
+            {"catalogus": [CATALOGUS.lower()], "status": ["alles"]},
+        )
+        # resources of a zaaktype are fetched for the zaaktypen of the catalogus
+        self.assertEqual(
+            {
+                (r.path, r.qs["zaaktype"][0])
+                for r in m.request_history
+                if "zaaktype" in r.qs
+            },
+            {
+                (f"/catalogi/api/v1/{resource}", zaaktype.lower())
+                for resource in (
+                    "statustypen",
+                    "resultaattypen",
+                    "eigenschappen",
+                    "roltypen",
+                    "zaaktype-informatieobjecttypen",
+                )
+                for zaaktype in (ZAAKTYPE, OTHER_ZAAKTYPE)
+            },
+        )
+
+        m.reset_mock()
+        self.assertEqual(self.expansions(), expanded)
+        self.assertFalse(m.called)
+
+        other = self.expansions(ZaakType(url=OTHER_ZAAKTYPE))
+        assert other
+        self.assertEqual(other["statustypen"], [])
+        self.assertFalse(m.called)
+
+    def test_reuses_decoded_snapshot(self, m):
+        self.mock_catalogus(m)
+        refresh_snapshot(self.api_client, CATALOGUS)
+        snapshot = _decoded[CATALOGUS]
+
+        self.expansions()
+        self.assertIs(_decoded[CATALOGUS], snapshot)
+
+        # another process stored a newer one
+        _decoded.clear()
+        refresh_snapshot(self.api_client, CATALOGUS)
+        _decoded[CATALOGUS] = snapshot
+
+        self.expansions()
+        self.assertIsNot(_decoded[CATALOGUS], snapshot)
+
+    def test_rebuilds_when_zaaktype_changed(self, m):
+        self.mock_catalogus(m, statustypen=(1,))
+        refresh_snapshot(self.api_client, CATALOGUS)
+
+        self.mock_catalogus(m)
+        # the snapshot misses statustype 2
+        self.assertIsNone(self.expansions())
+        expanded = self.expansions()
+
+        assert expanded
+        self.assertEqual(
+            expanded["statustypen"],
+            [Resource(url("statustypen", 1)), Resource(url("statustypen", 2))],
+        )
+
+    def test_rebuilds_when_old(self, m):
+        self.mock_catalogus(m)
+        with freeze_time("2025-01-01 12:00"):
+            refresh_snapshot(self.api_client, CATALOGUS)
+
+        m.reset_mock()
+        with freeze_time("2025-01-01 12:00:59"):
+            self.assertIsNotNone(self.expansions())
+        self.assertFalse(m.called)
+
+        with freeze_time("2025-01-01 12:01:01"):
+            # the old snapshot is served while the new one is built
+            self.assertIsNotNone(self.expansions())
+        self.assertTrue(m.called)
+
+    def test_invalidate(self, m):
+        self.mock_catalogus(m)
+        refresh_snapshot(self.api_client, CATALOGUS)
+
+        invalidate_snapshot(CATALOGUS)
+        m.reset_mock()
+
+        self.assertIsNone(self.expansions())
+        self.assertTrue(m.called)
+
+    def test_published_changes_invalidate(self, m):
+        self.mock_catalogus(m)
+        refresh_snapshot(self.api_client, CATALOGUS)
+
+        # a deleted statustype, we only know its url
+        publish_change(None, urls=[url("statustypen", 1)])
+        m.reset_mock()
+
+        self.assertIsNone(self.expansions())
+        self.assertTrue(m.called)
+
+    def test_failed_build_is_retried(self, m):
+        self.mock_catalogus(m)
+        m.get(f"{BASE_URL}besluittypen", status_code=500)
+
+        self.assertIsNone(self.expansions())
+
+        m.get(f"{BASE_URL}besluittypen", json=paged())
+        self.assertIsNone(self.expansions())
+        self.assertIsNotNone(self.expansions())
+
+    def test_no_build_while_another_request_builds_it(self, m):
+        cache.add(f"{_key(CATALOGUS)}:lock", True)
+
+        self.assertIsNone(self.expansions())
+        self.assertFalse(m.called)
+        self.assertIsNone(refresh_snapshot(self.api_client, CATALOGUS))
+
+    @override_settings(CATALOGUS_SNAPSHOTS=False)
+    def test_disabled(self, m):
+        self.assertIsNone(self.expansions())
+        self.assertFalse(m.called)
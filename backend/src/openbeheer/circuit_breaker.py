@@ -0,0 +1,163 @@
+"""Per Service circuit breakers, with their state shared by all workers
+
+A breaker is *closed* while the Service is healthy. After a number of failed
+requests in a row it *opens*: requests fail immediately with `CircuitOpenError`,
+instead of waiting out their timeout. After a cool down period the breaker is
+*half-open*: a limited number of probe requests go through. A successful probe
+closes the breaker, a failed probe opens it again.
+
+The state lives in the ``UPSTREAM_CIRCUIT_BREAKER_CACHE``, Redis in production,
+so all workers fail fast as soon as one of them has seen the Service go down.
+"""
+
+import time
+from math import ceil
+from typing import Callable, NamedTuple
+
+from django.conf import settings
+from django.core.cache import caches
+
+import structlog
+from requests import Response
+from requests.exceptions import ConnectionError, Timeout
+from zgw_consumers.models import Service
+
+from openbeheer.deadline import DeadlineExceeded
+
+logger = structlog.get_logger(__name__)
+
+FAILURE_STATUS_CODES = frozenset({502, 503, 504})
+
+
+class CircuitOpenError(ConnectionError):
+    "Raised instead of doing a request to a Service whose circuit breaker is open"
+
+    def __init__(self, slug: str, retry_after: int):
+        super().__init__(f"Circuit breaker for service {slug!r} is open")
+        self.slug = slug
+        self.retry_after = retry_after
+
+
+class _Ticket(NamedTuple):
+    failures: int
+    "Number of failures in a row, as seen when the request started"
+    probe: int | None
+    "Probe slot taken by the request, None if the breaker is closed"
+
+
+class CircuitBreaker:
+    def __init__(
+        self,
+        slug: str,
+        *,
+        failure_threshold: int,
+        reset_timeout: int,
+        half_open_probes: int,
+    ):
+        self.slug = slug
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.half_open_probes = half_open_probes
+
+        prefix = f"circuit-breaker:{slug}"
+        self._failures_key = f"{prefix}:failures"
+        self._opened_key = f"{prefix}:opened"
+        self._probe_keys = [f"{prefix}:probe:{n}" for n in range(half_open_probes)]
+
+    @classmethod
+    def for_service(cls, service: Service) -> "CircuitBreaker | None":
+        """Return the breaker for `service`, or None if breakers are disabled
+
+        Thresholds can be overridden per Service slug in
+        ``UPSTREAM_CIRCUIT_BREAKER_PER_SERVICE``.
+        """
+        if not settings.UPSTREAM_CIRCUIT_BREAKER:
+            return None
+        options = {
+            "failure_threshold": settings.UPSTREAM_CIRCUIT_BREAKER_FAILURE_THRESHOLD,
+            "reset_timeout": settings.UPSTREAM_CIRCUIT_BREAKER_RESET_TIMEOUT,
+            "half_open_probes": settings.UPSTREAM_CIRCUIT_BREAKER_HALF_OPEN_PROBES,
+        } | settings.UPSTREAM_CIRCUIT_BREAKER_PER_SERVICE.get(service.slug, {})
+        return cls(service.slug, **options)
+
+    @property
+    def _cache(self):
+        return caches[settings.UPSTREAM_CIRCUIT_BREAKER_CACHE]
+
+    def call(
+        self, send: Callable[..., Response], method, url, *args, **kwargs
+    ) -> Response:
+        """Do the request with `send`, unless the breaker is open
+
+        Connection errors, timeouts and 502, 503 and 504 responses count as failures.
+        """
+        ticket = self._acquire()
+        try:
+            response = send(method, url, *args, **kwargs)
+        except DeadlineExceeded:
+            # our own budget ran out, that says nothing about the service
+            self._release(ticket)
+            raise
+        except (ConnectionError, Timeout):
+            self._record_failure(ticket)
+            raise
+        except BaseException:
+            self._release(ticket)
+            raise
+
+        if response.status_code in FAILURE_STATUS_CODES:
+            self._record_failure(ticket)
+        else:
+            self._record_success(ticket)
+        return response
+
+    def _acquire(self) -> _Ticket:
+        state = self._cache.get_many([self._failures_key, self._opened_key])
+        failures = state.get(self._failures_key, 0)
+        if (opened := state.get(self._opened_key)) is None:
+            return _Ticket(failures, probe=None)
+
+        if (remaining := opened + self.reset_timeout - time.time()) > 0:
+            raise CircuitOpenError(self.slug, retry_after=ceil(remaining))
+
+        # half-open, try to become one of the probes
+        for probe, key in enumerate(self._probe_keys):
+            if self._cache.add(key, True, timeout=self.reset_timeout):
+                return _Ticket(failures, probe=probe)
+        raise CircuitOpenError(self.slug, retry_after=1)
+
+    def _release(self, ticket: _Ticket) -> None:
+        if ticket.probe is not None:
+            self._cache.delete(self._probe_keys[ticket.probe])
+
+    def _record_success(self, ticket: _Ticket) -> None:
+        if ticket.probe is not None:
+            self._cache.delete_many(
+                [self._failures_key, self._opened_key, *self._probe_keys]
+            )
+            logger.info("circuit breaker closed", service=self.slug)
+        elif ticket.failures:
+            self._cache.delete(self._failures_key)
+
+    def _record_failure(self, ticket: _Ticket) -> None:
+        if ticket.probe is not None:
+            # restart the cool down
+            self._cache.set(self._opened_key, time.time(), timeout=None)
+            self._release(ticket)
+            logger.warning("circuit breaker reopened", service=self.slug)
+            return
+
+        try:
+            failures = self._cache.incr(self._failures_key)
+        except ValueError:  # unknown key
+            if self._cache.add(self._failures_key, 1, timeout=None):
+                failures = 1
+            else:
+                failures = self._cache.incr(self._failures_key)
+
+        if failures >= self.failure_threshold and self._cache.add(
+            self._opened_key, time.time(), timeout=None
+        ):
+            logger.warning(
+                "circuit breaker opened", service=self.slug, failures=failures
+            )
@@ -1,7 +1,29 @@
-from contextlib import nullcontext
-from functools import cache, wraps
-from typing import Callable, Iterator, NoReturn, Protocol, runtime_checkable
-
+import asyncio
+import hashlib
+import secrets
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import contextmanager, nullcontext
+from contextvars import ContextVar, copy_context
+from functools import cache, partial, wraps
+from itertools import islice
+from math import ceil
+from typing import (
+    AsyncIterator,
+    Callable,
+    Generator,
+    Iterator,
+    NoReturn,
+    Protocol,
+    cast,
+    runtime_checkable,
+)
+from weakref import WeakKeyDictionary
+
+from django.conf import settings
+from django.core.cache import caches
 from django.core.exceptions import ImproperlyConfigured
 from django.db.models.signals import post_delete, post_save
 from django.dispatch import receiver
@@ -10,12 +32,20 @@ from django.utils.translation import gettext_lazy as __
 import msgspec
 import structlog
 from ape_pie import APIClient
+from furl import furl
 from msgspec.json import decode
+from requests import PreparedRequest, Response
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
 from zgw_consumers.client import build_client
 from zgw_consumers.constants import APITypes
 from zgw_consumers.models import Service
 
+from openbeheer.circuit_breaker import CircuitBreaker
 from openbeheer.config.models import APIConfig
+from openbeheer.deadline import remaining, send_within_deadline
+from openbeheer.invalidation import resources_changed
+from openbeheer.utils import metrics
 
 logger = structlog.get_logger(__name__)
 
@@ -24,14 +54,427 @@ request_lock = nullcontext()
 """e2e tests replace this with a threading.Lock(), to avoid racing vcr.stubs
 https://github.com/kevin1024/vcrpy/issues/849"""
 
+_semaphores: dict[tuple[str, int], threading.BoundedSemaphore] = {}
+_semaphores_lock = threading.Lock()
+
+
+def service_semaphore(
+    service: Service | None,
+) -> threading.BoundedSemaphore | nullcontext[None]:
+    """Return the per process semaphore that bounds concurrent requests to `service`
+
+    Limits are configured with ``UPSTREAM_MAX_CONCURRENCY`` and
+    ``UPSTREAM_MAX_CONCURRENCY_PER_SERVICE``. A limit of 0 means unbounded.
+    """
+    if service is None:
+        return nullcontext()
+
+    limit = settings.UPSTREAM_MAX_CONCURRENCY_PER_SERVICE.get(
+        service.slug, settings.UPSTREAM_MAX_CONCURRENCY
+    )
+    if not limit:
+        return nullcontext()
+
+    key = (service.slug, limit)
+    with _semaphores_lock:
+        if key not in _semaphores:
+            _semaphores[key] = threading.BoundedSemaphore(limit)
+        return _semaphores[key]
+
+
+class PooledHTTPAdapter(HTTPAdapter):
+    """A transport adapter that is shared by all clients of a Service
+
+    Closing a client session leaves the connection pool alone, so keep-alive
+    connections survive the ``with client:`` blocks of the views. Connections are
+    dropped when the pool is older than `max_age` or has been idle for longer than
+    `idle_timeout` seconds; 0 disables either check.
+    """
+
+    def __init__(self, *, max_age: float = 0, idle_timeout: float = 0, **kwargs):
+        self.max_age = max_age
+        self.idle_timeout = idle_timeout
+        self._lock = threading.Lock()
+        super().__init__(**kwargs)
+        self._created = self._last_used = time.monotonic()
+
+    def send(self, request, *args, **kwargs):
+        self.recycle_expired()
+        try:
+            return super().send(request, *args, **kwargs)
+        finally:
+            self._last_used = time.monotonic()
+
+    def recycle_expired(self) -> bool:
+        "Drop all pooled connections if they are too old or idle; return if it did"
+        now = time.monotonic()
+        with self._lock:
+            expired = bool(
+                (self.max_age and now - self._created > self.max_age)
+                or (self.idle_timeout and now - self._last_used > self.idle_timeout)
+            )
+            if expired:
+                self.poolmanager.clear()
+                self._created = self._last_used = now
+        return expired
+
+    def close(self) -> None:
+        "Shared between sessions; only :func:`discard_pooled_adapter` closes it"
+
+    def discard(self) -> None:
+        super().close()
+
+
+_adapters: dict[int, PooledHTTPAdapter] = {}
+_adapters_lock = threading.Lock()
+
+
+def pooled_adapter(service: Service) -> PooledHTTPAdapter:
+    "Return the process wide transport adapter for `service`"
+    with _adapters_lock:
+        if service.pk not in _adapters:
+            _adapters[service.pk] = PooledHTTPAdapter(
+                pool_maxsize=settings.UPSTREAM_POOL_MAXSIZE,
+                max_age=settings.UPSTREAM_POOL_MAX_AGE,
+                idle_timeout=settings.UPSTREAM_POOL_IDLE_TIMEOUT,
+            )
+        return _adapters[service.pk]
+
+
+def discard_pooled_adapter(service: Service) -> None:
+    "Close the connections to `service`, the next client gets a fresh pool"
+    with _adapters_lock:
+        adapter = _adapters.pop(service.pk, None)
+    if adapter:
+        adapter.discard()
+
+
+HTTP_CACHE_EVENTS = ("hit", "miss", "revalidate")
+"""Counted per Service in :mod:`openbeheer.utils.metrics` as
+``http-cache:<slug>:<event>``.
+
+hit: a conditional GET returned 304 and the cached body was used
+miss: a GET returned a (new) body
+revalidate: a conditional GET was sent"""
+
+
+class CachedResponse(msgspec.Struct, array_like=True):
+    etag: str
+    content: bytes
+    content_type: str
+
+
+def http_cache_enabled(service: Service | None) -> bool:
+    "Whether GET responses of `service` should be cached"
+    enabled = settings.UPSTREAM_HTTP_CACHE_SERVICES
+    return bool(service and ("*" in enabled or service.slug in enabled))
+
+
+def http_cache_key(service: Service, url: str) -> str:
+    return f"http-cache:{service.slug}:{hashlib.sha256(url.encode()).hexdigest()}"
+
+
+def _full_url(client: APIClient, url: str | bytes, params=None) -> str:
+    prepared = PreparedRequest()
+    prepared.prepare_url(client.to_absolute_url(url), params)
+    assert prepared.url
+    return prepared.url
+
+
+def _cached_request(
+    service: Service,
+    client: APIClient,
+    send: Callable[..., Response],
+    method: str | bytes,
+    url: str | bytes,
+    *args,
+    **kwargs,
+) -> Response:
+    """Perform the request, using and maintaining the HTTP cache of `service`
+
+    GETs revalidate with If-None-Match, and a 304 is answered with the cached
+    body. Any other method evicts the cached response of its url.
+    """
+    cache = caches[settings.UPSTREAM_HTTP_CACHE]
+    key = http_cache_key(service, _full_url(client, url, kwargs.get("params")))
+    count = lambda event: metrics.incr(f"http-cache:{service.slug}:{event}")
+
+    if str(method).upper() != "GET":
+        cache.delete(key)
+        return send(method, url, *args, **kwargs)
+
+    cached = cache.get(key)
+    if cached:
+        cached = msgspec.msgpack.decode(cached, type=CachedResponse)
+        kwargs["headers"] = (kwargs.get("headers") or {}) | {
+            "If-None-Match": cached.etag
+        }
+        count("revalidate")
+
+    response = send(method, url, *args, **kwargs)
+
+    if cached and response.status_code == 304:
+        count("hit")
+        response.status_code = 200
+        response.reason = "OK"
+        response._content = cached.content
+        response.headers["Content-Type"] = cached.content_type
+        return response
+
+    count("miss")
+    if (
+        response.status_code == 200
+        and (etag := response.headers.get("etag"))
+        and len(response.content) <= settings.UPSTREAM_HTTP_CACHE_MAX_SIZE
+    ):
+        cache.set(
+            key,
+            msgspec.msgpack.encode(
+                CachedResponse(
+                    etag=etag,
+                    content=response.content,
+                    content_type=response.headers.get("Content-Type", ""),
+                )
+            ),
+            timeout=settings.UPSTREAM_HTTP_CACHE_TIMEOUT,
+        )
+    elif cached:
+        cache.delete(key)
+    return response
+
+
+@receiver(resources_changed, weak=False)
+def _evict_changed_responses(sender, urls, zaaktypen, catalogi, **_):
+    "Drop the cached responses of changed resources and their parents"
+    if not settings.UPSTREAM_HTTP_CACHE_SERVICES:
+        return
+    changed = urls | zaaktypen | catalogi
+    caches[settings.UPSTREAM_HTTP_CACHE].delete_many(
+        [
+            http_cache_key(service, url)
+            for service in Service.objects.all()
+            if http_cache_enabled(service)
+            for url in changed
+            if url.startswith(service.api_root)
+        ]
+    )
+
+
+class _Flight:
+    "An in-flight request, that other threads can wait for"
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.response: Response | None = None
+        self.error: BaseException | None = None
+
+
+_flights: dict[str, _Flight] = {}
+_flights_lock = threading.Lock()
+
+
+class SharedResponse(msgspec.Struct, array_like=True):
+    "The parts of a Response that followers of a single-flight GET get"
+
+    status_code: int
+    reason: str
+    headers: dict[str, str]
+    content: bytes
+
+    @classmethod
+    def from_response(cls, response: Response) -> "SharedResponse":
+        return cls(
+            status_code=response.status_code,
+            reason=response.reason,
+            headers=dict(response.headers),
+            content=response.content,
+        )
+
+    def as_response(self, url: str) -> Response:
+        response = Response()
+        response.status_code = self.status_code
+        response.reason = self.reason
+        response.headers = CaseInsensitiveDict(self.headers)
+        response._content = self.content
+        response.url = url
+        return response
+
+
+def _single_flight_key(
+    service: Service | None, client: APIClient, url: str, headers
+) -> str:
+    identity = service.slug if service else client.base_url
+    return hashlib.sha256(
+        msgspec.json.encode([identity, url, sorted((headers or {}).items())])
+    ).hexdigest()
+
+
+def _follower_wait(client: APIClient, timeout=None) -> float | None:
+    """Return how long to wait for the response of another thread
+
+    That is as long as the request itself may take: its (connect + read) timeout,
+    capped to the remaining deadline. None waits as long as it takes.
+    """
+    match timeout or client._request_kwargs.get("timeout"):
+        case (connect, read):
+            wait = None if connect is None or read is None else connect + read
+        case wait:
+            pass
+    if (budget := remaining()) is not None:
+        wait = budget if wait is None else min(wait, budget)
+    return wait
+
+
+def _single_flight_request(
+    service: Service | None,
+    client: APIClient,
+    send: Callable[..., Response],
+    method: str | bytes,
+    url: str | bytes,
+    *args,
+    **kwargs,
+) -> Response:
+    """Perform the request, sharing the response of identical concurrent GETs
+
+    The first thread to GET a url performs the request; threads that GET the same
+    url while it is in flight wait for it and get a copy of its response, or its
+    exception. Followers wait no longer than their own request could take, then
+    do the request themselves. With ``UPSTREAM_SINGLE_FLIGHT_DISTRIBUTED`` the same happens across
+    processes, see :func:`_distributed_single_flight_request`.
+    """
+    if str(method).upper() != "GET":
+        return send(method, url, *args, **kwargs)
+
+    full_url = _full_url(client, url, kwargs.get("params"))
+    key = _single_flight_key(service, client, full_url, kwargs.get("headers"))
+
+    with _flights_lock:
+        flight = _flights.get(key)
+        leader = flight is None
+        if flight is None:
+            flight = _flights[key] = _Flight()
+
+    if not leader:
+        if flight.done.wait(_follower_wait(client, kwargs.get("timeout"))):
+            if flight.error:
+                raise flight.error
+            assert flight.response
+            return SharedResponse.from_response(flight.response).as_response(full_url)
+        logger.info("single-flight leader is too slow", url=full_url)
+        return send(method, url, *args, **kwargs)
+
+    try:
+        if settings.UPSTREAM_SINGLE_FLIGHT_DISTRIBUTED:
+            send = partial(_distributed_single_flight_request, key, full_url, send)
+        flight.response = send(method, url, *args, **kwargs)
+        return flight.response
+    except BaseException as e:
+        flight.error = e
+        raise
+    finally:
+        with _flights_lock:
+            del _flights[key]
+        flight.done.set()
+
+
+def _distributed_single_flight_request(
+    key: str,
+    full_url: str,
+    send: Callable[..., Response],
+    method: str | bytes,
+    url: str | bytes,
+    *args,
+    **kwargs,
+) -> Response:
+    """Share the response of a GET with other processes that GET the same url
+
+    The process that manages to add the lock key performs the request and
+    publishes the response under a token for a few seconds. Others wait for that
+    result, and do the request themselves if it doesn't show up.
+    """
+    cache = caches[settings.UPSTREAM_SINGLE_FLIGHT_CACHE]
+    lock_key = f"single-flight:{key}"
+    wait = settings.UPSTREAM_SINGLE_FLIGHT_WAIT
+    token = secrets.token_hex(8)
+
+    if cache.add(lock_key, token, timeout=wait):
+        try:
+            response = send(method, url, *args, **kwargs)
+            cache.set(
+                f"single-flight:result:{token}",
+                msgspec.msgpack.encode(SharedResponse.from_response(response)),
+                timeout=wait,
+            )
+            return response
+        finally:
+            cache.delete(lock_key)
+
+    deadline = time.monotonic() + wait
+    last_leader = None
+    while time.monotonic() < deadline:
+        if leader := cache.get(lock_key):
+            last_leader = leader
+        # the leader releases the lock right after publishing its result
+        if last_leader and (result := cache.get(f"single-flight:result:{last_leader}")):
+            return msgspec.msgpack.decode(result, type=SharedResponse).as_response(
+                full_url
+            )
+        if not leader:
+            # it gave up
+            break
+        time.sleep(0.05)
+
+    return send(method, url, *args, **kwargs)
+
+
+_upstream_etags: ContextVar[dict[str, str] | None] = ContextVar(
+    "upstream_etags", default=None
+)
+
+
+@contextmanager
+def upstream_etags() -> Iterator[dict[str, str]]:
+    """Collect the ETags of the successful GETs in the block, by full url
+
+    Worker threads that run in a copy of the context add theirs too.
+    """
+    etags: dict[str, str] = {}
+    token = _upstream_etags.set(etags)
+    try:
+        yield etags
+    finally:
+        _upstream_etags.reset(token)
+
+
+_rebuild: WeakKeyDictionary[APIClient, Callable[[], APIClient]] = WeakKeyDictionary()
+"Clients made by `build_client`, to the call that builds another one like it"
+
 
 def _build_with_logging[**P, C: APIClient](build: Callable[P, C]) -> Callable[P, C]:
     @wraps(build)
     def build_client_with_logging(*args: P.args, **kwargs: P.kwargs) -> C:
         client = build(*args, **kwargs)
+        _rebuild[client] = partial(build_client_with_logging, *args, **kwargs)
+        service = next((arg for arg in args if isinstance(arg, Service)), None)
+
+        if service and service.pk and settings.UPSTREAM_CONNECTION_POOLING:
+            adapter = pooled_adapter(service)
+            client.mount("https://", adapter)
+            client.mount("http://", adapter)
 
         _original_request = client.request
 
+        def _send(request, method, url, *args, **kwargs) -> Response:
+            with request_lock, service_semaphore(service):
+                return send_within_deadline(
+                    request,
+                    client._request_kwargs.get("timeout"),
+                    method,
+                    url,
+                    *args,
+                    **kwargs,
+                )
+
         @wraps(_original_request)
         def logging_request(method: str | bytes, url: str | bytes, *args, **kwargs):
             logger.debug(
@@ -40,8 +483,22 @@ def _build_with_logging[**P, C: APIClient](build: Callable[P, C]) -> Callable[P,
                 url=url,
                 **kwargs,
             )
-            with request_lock:
-                response = _original_request(method, url, *args, **kwargs)
+            send = partial(_send, _original_request)
+            if service and (breaker := CircuitBreaker.for_service(service)):
+                send = partial(breaker.call, send)
+            if service and http_cache_enabled(service):
+                send = partial(_cached_request, service, client, send)
+            if settings.UPSTREAM_SINGLE_FLIGHT:
+                send = partial(_single_flight_request, service, client, send)
+
+            response = send(method, url, *args, **kwargs)
+            if (
+                (etags := _upstream_etags.get()) is not None
+                and str(method).upper() == "GET"
+                and response.status_code == 200
+                and (etag := response.headers.get("ETag"))
+            ):
+                etags[_full_url(client, url, kwargs.get("params"))] = etag
             logger.debug(
                 f"{method} response",
                 base_url=client.base_url,
@@ -62,6 +519,25 @@ def _build_with_logging[**P, C: APIClient](build: Callable[P, C]) -> Callable[P,
 build_client = _build_with_logging(build_client)
 
 
+@contextmanager
+def thread_client(client: APIClient) -> Iterator[APIClient]:
+    """Use a client like `client` in a worker thread
+
+    A `requests.Session` isn't thread safe, so each thread gets a client of its
+    own, that is closed at the end of the block. Clients of a Service still share
+    its connection pool, and the headers set on `client` after it was built,
+    like the Accept-Crs of `ztc_client`. Clients not made by
+    `build_client` are used as they are.
+    """
+    rebuild = _rebuild.get(client) if isinstance(client, APIClient) else None
+    if rebuild is None:
+        yield client
+        return
+    with rebuild() as own_client:
+        own_client.headers.update(client.headers)
+        yield own_client
+
+
 @cache
 def ztc_client(slug: str = "") -> APIClient | NoReturn:
     """Return the APIClient for the configured ZTC service
@@ -119,6 +595,8 @@ def objecttypen_client() -> APIClient | NoReturn:
 
 @receiver([post_delete, post_save], sender=Service, weak=False)
 def _(sender, instance, **_):
+    discard_pooled_adapter(instance)
+
     if instance.api_type == APITypes.ztc:
         ztc_client.cache_clear()
 
@@ -146,14 +624,85 @@ class ZGWPagedResponseProtocol[T](Protocol):
     results: list[T]
 
 
-def iter_pages[T](
-    client: APIClient, response: ZGWPagedResponseProtocol[T], response_type=None
-) -> Iterator[T]:
-    yield from response.results
+def _remaining_page_urls(response: ZGWPagedResponseProtocol) -> list[str]:
+    """Return the urls of all pages after `response`
+
+    Computed from the `count` and the ``page`` query parameter of the `next` link.
+    Returns an empty list if the response doesn't look like a ZGW paginated response.
+    """
+    count = getattr(response, "count", None)
+    if not (count and response.next and response.results):
+        return []
+
+    next_url = furl(response.next)
+    page = next_url.args.get("page", "")
+    if not (isinstance(page, str) and page.isdigit()):
+        return []
+
+    last_page = ceil(count / len(response.results))
+    return [
+        next_url.copy().set({"page": n}).url for n in range(int(page), last_page + 1)
+    ]
+
 
+def _log_missing_page(url: str) -> None:
+    logger.warning(
+        "prefetched page went missing, fetching the rest one page at a time",
+        url=url,
+    )
+
+
+def _prefetch_pages[T](
+    client: APIClient,
+    page_urls: list[str],
+    response_type: type[ZGWPagedResponseProtocol[T]],
+    window: int,
+) -> Generator[T, None, ZGWPagedResponseProtocol[T] | None]:
+    """Fetch `page_urls` with at most `window` requests in flight, yield in order
+
+    Returns the last page it got, so the caller can follow its `next`, in case
+    items were added in the mean time, or a page went missing. Returns None if
+    it got no page at all.
+    """
+
+    def fetch(url: str) -> ZGWPagedResponseProtocol[T] | None:
+        with thread_client(client) as own_client:
+            resp = own_client.get(url)
+        if resp.status_code == 404:  # items were deleted in the mean time
+            return None
+        resp.raise_for_status()
+        return decode(resp.content, type=response_type, strict=False)
+
+    urls = iter(page_urls)
+    pending: deque[tuple[str, Future[ZGWPagedResponseProtocol[T] | None]]] = deque()
+    executor = ThreadPoolExecutor(max_workers=window, thread_name_prefix="pages")
+    try:
+        for url in islice(urls, window):
+            pending.append((url, executor.submit(copy_context().run, fetch, url)))
+
+        page = None
+        while pending:
+            url, future = pending.popleft()
+            if (fetched := future.result()) is None:
+                _log_missing_page(url)
+                return page
+            page = fetched
+            if url := next(urls, None):
+                pending.append((url, executor.submit(copy_context().run, fetch, url)))
+            yield from page.results
+        return page
+    finally:
+        # don't leave requests running in the background when we stop early
+        executor.shutdown(wait=True, cancel_futures=True)
+
+
+def _page_type[T](
+    response: ZGWPagedResponseProtocol[T], response_type=None
+) -> type[ZGWPagedResponseProtocol[T]]:
+    "Return the type to decode the pages following `response` into"
     # TODO: test and fix iter_pages, maybe we can drop `response_type` param again
     # response.__class__ may decode to dicts, instead of T
-    response_type = (
+    page_type = (
         msgspec.defstruct(
             str(response_type),
             fields=[
@@ -165,10 +714,123 @@ def iter_pages[T](
         else response.__class__
     )
 
-    assert isinstance(response_type, ZGWPagedResponseProtocol)
+    assert isinstance(page_type, ZGWPagedResponseProtocol)
+    return cast("type[ZGWPagedResponseProtocol[T]]", page_type)
+
+
+def iter_pages[T](
+    client: APIClient,
+    response: ZGWPagedResponseProtocol[T],
+    response_type=None,
+    *,
+    prefetch: int | None = None,
+) -> Iterator[T]:
+    """Yield the results of `response` and all following pages
+
+    If a prefetched page went missing, because items were deleted in the mean
+    time, the rest is fetched one page at a time, following the `next` links. A
+    page that is still missing then raises an `HTTPError`.
+
+    :param prefetch: number of pages to fetch concurrently, defaults to
+        ``settings.PAGE_PREFETCH_WINDOW``. Requires the response to have a `count`.
+    """
+    yield from response.results
+
+    response_type = _page_type(response, response_type)
+
+    window = settings.PAGE_PREFETCH_WINDOW if prefetch is None else prefetch
+    if window > 1 and (page_urls := _remaining_page_urls(response)):
+        last_page = yield from _prefetch_pages(
+            client,
+            page_urls,
+            cast("type[ZGWPagedResponseProtocol[T]]", response_type),
+            window,
+        )
+        if last_page is not None:
+            response = last_page
 
     while next_url := response.next:
         resp = client.get(next_url)
         resp.raise_for_status()
         response = decode(resp.content, type=response_type, strict=False)
         yield from response.results
+
+
+def _thread_get(client: APIClient, url: str) -> Response:
+    with thread_client(client) as own_client:
+        return own_client.get(url)
+
+
+async def _afetch_page[T](
+    client: APIClient, url: str, response_type: type[ZGWPagedResponseProtocol[T]]
+) -> ZGWPagedResponseProtocol[T] | None:
+    resp = await asyncio.to_thread(_thread_get, client, url)
+    if resp.status_code == 404:  # items were deleted in the mean time
+        return None
+    resp.raise_for_status()
+    return decode(resp.content, type=response_type, strict=False)
+
+
+async def _aprefetch_pages[T](
+    client: APIClient,
+    page_urls: list[str],
+    response_type: type[ZGWPagedResponseProtocol[T]],
+    window: int,
+) -> AsyncIterator[ZGWPagedResponseProtocol[T]]:
+    "Async version of :func:`_prefetch_pages`, that yields the pages it got"
+    urls = iter(page_urls)
+    pending = deque(
+        (url, asyncio.ensure_future(_afetch_page(client, url, response_type)))
+        for url in islice(urls, window)
+    )
+    try:
+        while pending:
+            url, task = pending.popleft()
+            if (page := await task) is None:
+                _log_missing_page(url)
+                return
+            if url := next(urls, None):
+                pending.append(
+                    (
+                        url,
+                        asyncio.ensure_future(_afetch_page(client, url, response_type)),
+                    )
+                )
+            yield page
+    finally:
+        # don't leave requests running in the background when we stop early
+        for _, task in pending:
+            task.cancel()
+        await asyncio.gather(*(task for _, task in pending), return_exceptions=True)
+
+
+async def aiter_pages[T](
+    client: APIClient,
+    response: ZGWPagedResponseProtocol[T],
+    response_type=None,
+    *,
+    prefetch: int | None = None,
+) -> AsyncIterator[T]:
+    """Async version of :func:`iter_pages`
+
+    The requests are done by the (blocking) `client` in worker threads, so the event
+    loop is free to serve other requests in the mean time.
+    """
+    for item in response.results:
+        yield item
+
+    response_type = _page_type(response, response_type)
+
+    window = settings.PAGE_PREFETCH_WINDOW if prefetch is None else prefetch
+    if window > 1 and (page_urls := _remaining_page_urls(response)):
+        async for page in _aprefetch_pages(client, page_urls, response_type, window):
+            for item in page.results:
+                yield item
+            response = page
+
+    while next_url := response.next:
+        resp = await asyncio.to_thread(_thread_get, client, next_url)
+        resp.raise_for_status()
+        response = decode(resp.content, type=response_type, strict=False)
+        for item in response.results:
+            yield item
@@ -138,6 +138,7 @@ INSTALLED_APPS = [
 
 MIDDLEWARE = [
     "django.middleware.security.SecurityMiddleware",
+    "openbeheer.utils.middleware.RequestDeadlineMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     # 'django.middleware.locale.LocaleMiddleware',
     "django.middleware.common.CommonMiddleware",
@@ -178,6 +179,7 @@ TEMPLATES = [
 ]
 
 WSGI_APPLICATION = "openbeheer.wsgi.application"
+ASGI_APPLICATION = "openbeheer.asgi.application"
 
 # Translations
 LOCALE_PATHS = (DJANGO_PROJECT_DIR / "conf" / "locale",)
@@ -406,6 +408,145 @@ REQUESTS_DEFAULT_TIMEOUT = (10, 30)
 #
 
 ZGW_REQUIRED_SERVICE_TYPES = ["ztc", "orc"]
+
+# Number of threads used to run the expansions of a single request concurrently.
+# 1 runs them one after another.
+EXPANSION_MAX_WORKERS = config("EXPANSION_MAX_WORKERS", default=1)
+
+# Maximum number of concurrent requests per process to a single upstream Service.
+# 0 means unbounded. Can be overridden per Service slug with
+# UPSTREAM_MAX_CONCURRENCY_PER_SERVICE = {"open-zaak": 4}
+UPSTREAM_MAX_CONCURRENCY = config("UPSTREAM_MAX_CONCURRENCY", default=0)
+UPSTREAM_MAX_CONCURRENCY_PER_SERVICE: dict[str, int] = {}
+
+# Number of pages `iter_pages` fetches concurrently when following paginated
+# responses. 1 follows the `next` links one at a time.
+PAGE_PREFETCH_WINDOW = config("PAGE_PREFETCH_WINDOW", default=1)
+
+# Keep connections to upstream Services open between requests. One pool per
+# Service per process, shared by all threads.
+UPSTREAM_CONNECTION_POOLING = config("UPSTREAM_CONNECTION_POOLING", default=True)
+# Maximum number of connections kept open per Service host
+UPSTREAM_POOL_MAXSIZE = config("UPSTREAM_POOL_MAXSIZE", default=10)
+# Seconds after which an idle pool is emptied, 0 to keep them around
+UPSTREAM_POOL_IDLE_TIMEOUT = config("UPSTREAM_POOL_IDLE_TIMEOUT", default=60)
+# Seconds after which all connections in the pool are replaced, 0 to never do so
+UPSTREAM_POOL_MAX_AGE = config("UPSTREAM_POOL_MAX_AGE", default=300)
+
+# Slugs of the Services whose GET responses are cached by ETag and revalidated
+# with If-None-Match. "*" enables it for all Services.
+UPSTREAM_HTTP_CACHE_SERVICES = config(
+    "UPSTREAM_HTTP_CACHE_SERVICES", default="", split=True
+)
+UPSTREAM_HTTP_CACHE = "default"  # refers to CACHES setting
+# Responses with larger bodies (in bytes) are not cached
+UPSTREAM_HTTP_CACHE_MAX_SIZE = config(
+    "UPSTREAM_HTTP_CACHE_MAX_SIZE", default=1024 * 1024
+)
+UPSTREAM_HTTP_CACHE_TIMEOUT = config(
+    "UPSTREAM_HTTP_CACHE_TIMEOUT", default=60 * 60 * 24
+)
+
+# Let concurrent identical GETs to upstream Services share one request, within
+# a process, and with UPSTREAM_SINGLE_FLIGHT_DISTRIBUTED across processes.
+UPSTREAM_SINGLE_FLIGHT = config("UPSTREAM_SINGLE_FLIGHT", default=False)
+UPSTREAM_SINGLE_FLIGHT_DISTRIBUTED = config(
+    "UPSTREAM_SINGLE_FLIGHT_DISTRIBUTED", default=False
+)
+UPSTREAM_SINGLE_FLIGHT_CACHE = "default"  # refers to CACHES setting
+# Seconds other processes wait for the response before doing the request themselves
+UPSTREAM_SINGLE_FLIGHT_WAIT = config("UPSTREAM_SINGLE_FLIGHT_WAIT", default=10)
+
+# Fail requests to a Service immediately after it failed this many times in a row,
+# and only let a few probe requests through after the reset timeout (seconds).
+# Can be overridden per Service slug with
+# UPSTREAM_CIRCUIT_BREAKER_PER_SERVICE = {"open-zaak": {"failure_threshold": 10}}
+UPSTREAM_CIRCUIT_BREAKER = config("UPSTREAM_CIRCUIT_BREAKER", default=False)
+UPSTREAM_CIRCUIT_BREAKER_CACHE = "default"  # refers to CACHES setting
+UPSTREAM_CIRCUIT_BREAKER_FAILURE_THRESHOLD = config(
+    "UPSTREAM_CIRCUIT_BREAKER_FAILURE_THRESHOLD", default=5
+)
+UPSTREAM_CIRCUIT_BREAKER_RESET_TIMEOUT = config(
+    "UPSTREAM_CIRCUIT_BREAKER_RESET_TIMEOUT", default=30
+)
+UPSTREAM_CIRCUIT_BREAKER_HALF_OPEN_PROBES = config(
+    "UPSTREAM_CIRCUIT_BREAKER_HALF_OPEN_PROBES", default=1
+)
+UPSTREAM_CIRCUIT_BREAKER_PER_SERVICE: dict[str, dict[str, int]] = {}
+
+# Seconds all upstream requests made for a single incoming request may take
+# together, 0 means no limit. Clients can ask for another budget with the
+# X-Request-Timeout header, up to UPSTREAM_REQUEST_DEADLINE_MAX.
+UPSTREAM_REQUEST_DEADLINE = config("UPSTREAM_REQUEST_DEADLINE", default=0)
+UPSTREAM_REQUEST_DEADLINE_MAX = config("UPSTREAM_REQUEST_DEADLINE_MAX", default=60)
+
+# Serve the expansions of zaaktypen from a snapshot of their catalogus, kept in
+# CATALOGUS_SNAPSHOT_CACHE. Snapshots are built by warm_caches, and rebuilt in
+# the background after CATALOGUS_SNAPSHOT_MAX_AGE seconds.
+CATALOGUS_SNAPSHOTS = config("CATALOGUS_SNAPSHOTS", default=False)
+CATALOGUS_SNAPSHOT_CACHE = config("CATALOGUS_SNAPSHOT_CACHE", default="default")
+CATALOGUS_SNAPSHOT_MAX_AGE = config("CATALOGUS_SNAPSHOT_MAX_AGE", default=15 * 60)
+CATALOGUS_SNAPSHOT_BUILD_TIMEOUT = config(
+    "CATALOGUS_SNAPSHOT_BUILD_TIMEOUT", default=120
+)
+
+# Two-tier cache of the option lists fetched from the Selectielijst and
+# Objecttypen APIs, see openbeheer.utils.caching. Timeouts are in seconds, the
+# jitter and refresh ahead are fractions of CACHED_FUNCTIONS_TIMEOUT.
+CACHED_FUNCTIONS_CACHE = config("CACHED_FUNCTIONS_CACHE", default="default")
+CACHED_FUNCTIONS_TIMEOUT = config("CACHED_FUNCTIONS_TIMEOUT", default=60 * 60 * 24)
+CACHED_FUNCTIONS_L1_TIMEOUT = config("CACHED_FUNCTIONS_L1_TIMEOUT", default=60)
+CACHED_FUNCTIONS_JITTER = config("CACHED_FUNCTIONS_JITTER", default=0.1)
+CACHED_FUNCTIONS_REFRESH_AHEAD = config("CACHED_FUNCTIONS_REFRESH_AHEAD", default=0.8)
+CACHED_FUNCTIONS_MAX_STALE = config("CACHED_FUNCTIONS_MAX_STALE", default=60 * 60 * 24)
+CACHED_FUNCTIONS_LOCK_TIMEOUT = config("CACHED_FUNCTIONS_LOCK_TIMEOUT", default=60)
+CACHED_FUNCTIONS_RETRY_AFTER = config("CACHED_FUNCTIONS_RETRY_AFTER", default=30)
+
+# The hit/miss counters of the caches are kept per process, and added to the
+# shared counters in the default cache every METRICS_FLUSH_INTERVAL seconds.
+METRICS_FLUSH_INTERVAL = config("METRICS_FLUSH_INTERVAL", default=10)
+
+# Return upstream objects that need no transformation as they are, with only
+# the fields derived from their url added, instead of decoding and encoding them.
+# They aren't validated, and fields the service added that our types don't
+# declare are passed on too, so only turn this on for a trusted service.
+RAW_PASS_THROUGH = config("RAW_PASS_THROUGH", default=False)
+
+# Version histories on detail views are cached per identificatie
+VERSIONS_CACHE = config("VERSIONS_CACHE", default="default")
+VERSIONS_TIMEOUT = config("VERSIONS_TIMEOUT", default=60 * 60)
+
+# Objecttypen of the Objecttypen API are kept in one registry, reloaded in the
+# background after this many seconds. A missing objecttype reloads it right away,
+# at most once per OBJECTTYPEN_REGISTRY_RELOAD_INTERVAL seconds.
+OBJECTTYPEN_REGISTRY_TIMEOUT = config("OBJECTTYPEN_REGISTRY_TIMEOUT", default=15 * 60)
+OBJECTTYPEN_REGISTRY_RELOAD_INTERVAL = config(
+    "OBJECTTYPEN_REGISTRY_RELOAD_INTERVAL", default=60
+)
+
+# Published informatieobjecttypen of a catalogus, offered as options on
+# zaaktypen, are cached for this many seconds, or until one of them changes.
+INFORMATIEOBJECTTYPE_OPTIONS_CACHE = config(
+    "INFORMATIEOBJECTTYPE_OPTIONS_CACHE", default="default"
+)
+INFORMATIEOBJECTTYPE_OPTIONS_TIMEOUT = config(
+    "INFORMATIEOBJECTTYPE_OPTIONS_TIMEOUT", default=60 * 60
+)
+
+# ETags of detail responses are kept to answer conditional requests with only
+# conditional GETs of the upstream responses they were built from, until a
+# resource they were built from changes through Open Beheer, or for at most this
+# many seconds
+DETAIL_VALIDATORS_CACHE = config("DETAIL_VALIDATORS_CACHE", default="default")
+DETAIL_VALIDATORS_TIMEOUT = config("DETAIL_VALIDATORS_TIMEOUT", default=30)
+
+# Responses of the metadata endpoints that name the version they want can be
+# cached by the browser for this many seconds, as that version never changes
+METADATA_MAX_AGE = config("METADATA_MAX_AGE", default=60 * 60 * 24 * 365)
+# Each process builds the metadata of a detail view at most once per this many
+# seconds
+METADATA_MEMO_TIMEOUT = config("METADATA_MEMO_TIMEOUT", default=60)
+
 HEALTH_CHECKS = [
     "openbeheer.health_checks.checks.ServiceHealthCheck",
     "openbeheer.health_checks.checks.CatalogueHealthCheck",
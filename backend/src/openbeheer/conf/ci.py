@@ -42,6 +42,10 @@ PASSWORD_HASHERS = ["django.contrib.auth.hashers.MD5PasswordHasher"]
 
 ENVIRONMENT = "CI"
 
+# VCR cassettes patch the connection classes per test; connections kept alive
+# from a previous test would replay the wrong cassette.
+UPSTREAM_CONNECTION_POOLING = False
+
 
 #
 # Django-axes
@@ -0,0 +1,111 @@
+"""A time budget per incoming request, for all the upstream requests it makes
+
+The budget is set by `RequestDeadlineMiddleware` and kept in a context variable,
+so it carries over to the threads that run expansions and fetch pages. Every
+upstream request gets at most the remaining budget as timeout, and once the
+budget is spent, requests fail right away with `DeadlineExceeded`.
+"""
+
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from math import isfinite
+from typing import TYPE_CHECKING, Callable, Iterator
+
+from django.conf import settings
+
+from requests import Response
+from requests.exceptions import ReadTimeout, Timeout
+
+if TYPE_CHECKING:
+    from django.http import HttpRequest
+
+type _Timeout = float | tuple[float | None, float | None] | None
+
+_deadline: ContextVar[float | None] = ContextVar("upstream_deadline", default=None)
+
+
+class DeadlineExceeded(ReadTimeout):
+    "The time budget for upstream requests of the incoming request is spent"
+
+
+@contextmanager
+def deadline(seconds: float | None) -> Iterator[None]:
+    """Limit the time upstream requests may take to `seconds` from now
+
+    Nested deadlines can only shorten the budget. None means no (extra) limit.
+    """
+    current = _deadline.get()
+    if seconds is not None:
+        new = time.monotonic() + seconds
+        current = new if current is None else min(current, new)
+
+    token = _deadline.set(current)
+    try:
+        yield
+    finally:
+        _deadline.reset(token)
+
+
+def remaining() -> float | None:
+    "Return the seconds left in the current budget, or None if there is no deadline"
+    if (current := _deadline.get()) is None:
+        return None
+    return current - time.monotonic()
+
+
+def request_budget(request: "HttpRequest") -> float | None:
+    """Return the budget in seconds for `request`
+
+    Clients can ask for a budget with a ``X-Request-Timeout`` header, up to
+    ``UPSTREAM_REQUEST_DEADLINE_MAX``. Otherwise ``UPSTREAM_REQUEST_DEADLINE``
+    applies, where 0 means no deadline.
+    """
+    try:
+        requested = float(request.headers.get("X-Request-Timeout", ""))
+    except ValueError:
+        requested = 0.0
+
+    if requested > 0 and isfinite(requested):
+        return min(requested, settings.UPSTREAM_REQUEST_DEADLINE_MAX)
+    return settings.UPSTREAM_REQUEST_DEADLINE or None
+
+
+def _cap(timeout: _Timeout, budget: float) -> _Timeout:
+    match timeout:
+        case (connect, read):
+            return (
+                budget if connect is None else min(connect, budget),
+                budget if read is None else min(read, budget),
+            )
+        case None:
+            return budget
+        case _:
+            return min(timeout, budget)
+
+
+def send_within_deadline(
+    send: Callable[..., Response],
+    default_timeout: _Timeout,
+    method,
+    url,
+    *args,
+    **kwargs,
+) -> Response:
+    """Do the request with `send`, with its timeout capped to the remaining budget
+
+    :param default_timeout: the timeout the client uses if the call doesn't pass one
+    :raises DeadlineExceeded: if the budget is spent, before or during the request
+    """
+    if (budget := remaining()) is None:
+        return send(method, url, *args, **kwargs)
+    if budget <= 0:
+        raise DeadlineExceeded(f"No time left to {method} {url}")
+
+    kwargs["timeout"] = _cap(kwargs.get("timeout", default_timeout), budget)
+    try:
+        return send(method, url, *args, **kwargs)
+    except Timeout as e:
+        if (budget := remaining()) is not None and budget <= 0:
+            raise DeadlineExceeded(f"Ran out of time for {method} {url}") from e
+        raise
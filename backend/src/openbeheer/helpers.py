@@ -1,11 +1,54 @@
+from typing import TYPE_CHECKING
+
+from django.conf import settings
+from django.core.cache import caches
+
 from openbeheer.api.views import fetch_all
 from openbeheer.clients import objecttypen_client
+from openbeheer.types._open_beheer import as_ob_option
 from openbeheer.types.objecttypen import ObjectType
+from openbeheer.utils.caching import cached
+
+if TYPE_CHECKING:
+    from openbeheer.types import OBOption
+
+
+class ObjectTypeRegistry:
+    "All objecttypen of the Objecttypen API, indexed on url and uuid"
 
+    def __init__(self, objecttypen: list[ObjectType]):
+        # They should always have a URL
+        self.by_url = {item.url: item for item in objecttypen if item.url}
+        self.by_uuid = {item.uuid: item for item in objecttypen if item.uuid}
+        self.options: list[OBOption[str]] = [
+            as_ob_option(objecttype)
+            for objecttype in sorted(self.by_url.values(), key=lambda item: item.name)
+        ]
 
-def retrieve_objecttypen() -> dict[str, ObjectType]:
+
+@cached(timeout_setting="OBJECTTYPEN_REGISTRY_TIMEOUT")
+def objecttype_registry() -> ObjectTypeRegistry:
+    """Return the registry of objecttypen
+
+    The Objecttypen API has neither ETags nor a modified since filter, so the
+    registry is refreshed as a whole, in the background.
+    """
     with objecttypen_client() as ot_client:
-        objecttypen = fetch_all(ot_client, "objecttypes", {}, ObjectType)
-        return {
-            item.url: item for item in objecttypen if item.url
-        }  # They should always have a URL
+        return ObjectTypeRegistry(fetch_all(ot_client, "objecttypes", {}, ObjectType))
+
+
+def retrieve_objecttypen(reload: bool = False) -> dict[str, ObjectType]:
+    """Return the objecttypen by url
+
+    :param reload: reload the registry first, e.g. because an objecttype is missing.
+        Reloads happen at most once per ``OBJECTTYPEN_REGISTRY_RELOAD_INTERVAL``
+        seconds, so an objecttype that stays missing doesn't reload it on every
+        request.
+    """
+    if reload and caches[settings.CACHED_FUNCTIONS_CACHE].add(
+        "objecttype-registry:reloaded",
+        True,
+        timeout=settings.OBJECTTYPEN_REGISTRY_RELOAD_INTERVAL,
+    ):
+        objecttype_registry.clear_cache()  # pyright: ignore[reportFunctionMemberAccess]
+    return objecttype_registry().by_url
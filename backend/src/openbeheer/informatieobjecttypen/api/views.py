@@ -13,9 +13,11 @@ from openbeheer.api.views import (
     DetailView,
     DetailViewWithoutVersions,
     ListView,
+    MetadataView,
     MsgspecAPIView,
 )
 from openbeheer.clients import ztc_client
+from openbeheer.invalidation import publish_change
 from openbeheer.types import (
     DetailResponseWithoutVersions,
     ExternalServiceError,
@@ -155,17 +157,30 @@ class InformatieObjectTypeDetailView(
 
     def get_fields(
         self,
-        data: InformatieObjectType,
         option_overrides: Mapping[str, list[OBOption]] = {},
         *,
         base_editable: Callable[[str], bool] = bool,
     ) -> Iterable[OBField]:
         # We can't to edit concept directly, we use the "publish" action to change it.
         yield from super().get_fields(
-            data, option_overrides, base_editable=lambda name: name != "concept"
+            option_overrides, base_editable=lambda name: name != "concept"
         )
 
 
+@extend_schema_view(
+    get=extend_schema(
+        tags=["Informatieobjecttypen"],
+        summary="Get the fields and fieldsets of informatieobjecttypen",
+        description=(
+            "The fieldsets and fields that the informatieobjecttype detail leaves "
+            "out when requested with `?fields=omit`."
+        ),
+    ),
+)
+class InformatieObjectTypeMetadataView(MetadataView):
+    detail_view = InformatieObjectTypeDetailView
+
+
 class InformatieObjectTypePublishView(MsgspecAPIView):
     endpoint_path = "informatieobjecttypen/{uuid}/publish"
 
@@ -192,4 +207,11 @@ class InformatieObjectTypePublishView(MsgspecAPIView):
                     status=response.status_code,
                 )
 
+            # the response is the published informatieobjecttype
+            publish_change(
+                type(self),
+                decode(response.content),
+                urls=[client.to_absolute_url(f"informatieobjecttypen/{uuid}")],
+            )
+
         return Response(status=status.HTTP_204_NO_CONTENT)
@@ -0,0 +1,101 @@
+"""Options for the informatieobjecttypen a zaaktype can be related to
+
+Those are the published informatieobjecttypen of the catalogus of the zaaktype
+that are valid today. They are cached per catalogus with their validity, so the
+cache stays right after midnight without asking Open Zaak again. Views publish
+a change when an informatieobjecttype is created, updated, published or
+deleted, which drops the cache of its catalogus. A deleted one only comes with
+its url, so the cache also keeps the catalogus of every informatieobjecttype
+it holds.
+"""
+
+import datetime
+import hashlib
+
+from django.conf import settings
+from django.core.cache import caches
+from django.dispatch import receiver
+
+import msgspec
+from ape_pie import APIClient
+from msgspec import Struct
+
+from openbeheer.api.views import fetch_all
+from openbeheer.invalidation import resources_changed
+from openbeheer.types import OBOption
+
+
+class _InformatieObjectType(Struct, rename="camel"):
+    url: str
+    omschrijving: str
+    begin_geldigheid: datetime.date | None = None
+    einde_geldigheid: datetime.date | None = None
+
+    def valid_on(self, date: datetime.date) -> bool:
+        "Like the datumGeldigheid filter of Open Zaak"
+        return (self.begin_geldigheid is None or self.begin_geldigheid <= date) and (
+            self.einde_geldigheid is None or date <= self.einde_geldigheid
+        )
+
+
+def _cache():
+    return caches[settings.INFORMATIEOBJECTTYPE_OPTIONS_CACHE]
+
+
+def _key(catalogus: str) -> str:
+    digest = hashlib.sha256(catalogus.encode()).hexdigest()
+    return f"informatieobjecttype-options:{digest}"
+
+
+def _index_key(url: str) -> str:
+    "Key of the catalogus of the cached options that hold informatieobjecttype `url`"
+    digest = hashlib.sha256(url.encode()).hexdigest()
+    return f"informatieobjecttype-options:index:{digest}"
+
+
+def _published_informatieobjecttypen(
+    client: APIClient, catalogus: str
+) -> list[_InformatieObjectType]:
+    key = _key(catalogus)
+    if data := _cache().get(key):
+        return msgspec.msgpack.decode(data, type=list[_InformatieObjectType])
+
+    informatieobjecttypen = fetch_all(
+        client,
+        "informatieobjecttypen",
+        {"catalogus": catalogus, "status": "definitief"},
+        _InformatieObjectType,
+    )
+    _cache().set_many(
+        {
+            key: msgspec.msgpack.encode(informatieobjecttypen),
+            **{_index_key(iot.url): catalogus for iot in informatieobjecttypen},
+        },
+        timeout=settings.INFORMATIEOBJECTTYPE_OPTIONS_TIMEOUT,
+    )
+    return informatieobjecttypen
+
+
+def informatieobjecttype_options(
+    client: APIClient, catalogus: str, date: datetime.date | None = None
+) -> list[OBOption]:
+    "Return options for the published informatieobjecttypen of `catalogus` valid on `date`"
+    date = date or datetime.date.today()
+    return [
+        OBOption(
+            label=informatieobjecttype.omschrijving, value=informatieobjecttype.url
+        )
+        for informatieobjecttype in _published_informatieobjecttypen(client, catalogus)
+        if informatieobjecttype.valid_on(date)
+    ]
+
+
+@receiver(resources_changed, weak=False)
+def _invalidate_changed(sender, urls, catalogi, **_):
+    changed = [url for url in urls if "/informatieobjecttypen/" in url]
+    if not changed:
+        return
+    indexed = _cache().get_many([_index_key(url) for url in changed])
+    _cache().delete_many(
+        [_key(catalogus) for catalogus in catalogi | set(indexed.values())]
+    )
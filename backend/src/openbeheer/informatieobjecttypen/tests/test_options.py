@@ -0,0 +1,108 @@
+from django.core.cache import cache
+from django.test import TestCase
+
+import requests_mock
+from freezegun import freeze_time
+from zgw_consumers.constants import APITypes
+from zgw_consumers.test.factories import ServiceFactory
+
+from openbeheer.clients import build_client
+from openbeheer.invalidation import publish_change
+
+from ..options import informatieobjecttype_options
+
+BASE_URL = "https://example.com/catalogi/api/v1/"
+CATALOGUS = f"{BASE_URL}catalogussen/1"
+
+
+def informatieobjecttype(id: int, begin: str | None, einde: str | None = None):
+    return {
+        "url": f"{BASE_URL}informatieobjecttypen/{id}",
+        "omschrijving": f"iot {id}",
+        "catalogus": CATALOGUS,
+        "beginGeldigheid": begin,
+        "eindeGeldigheid": einde,
+    }
+
+
+@requests_mock.Mocker()
+class InformatieObjectTypeOptionsTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        service = ServiceFactory.create(
+            api_type=APITypes.ztc, slug="ztc", api_root=BASE_URL
+        )
+        self.api_client = build_client(service)
+
+    def mock_informatieobjecttypen(self, m):
+        results = [
+            informatieobjecttype(1, "2025-01-01", "2025-01-01"),
+            informatieobjecttype(2, "2025-01-01"),
+            informatieobjecttype(3, "2025-01-02"),
+        ]
+        m.get(
+            f"{BASE_URL}informatieobjecttypen",
+            json={"count": 3, "next": None, "previous": None, "results": results},
+        )
+
+    def options(self) -> list[str]:
+        return [
+            option.value
+            for option in informatieobjecttype_options(self.api_client, CATALOGUS)
+        ]
+
+    def test_filters_on_validity_across_midnight(self, m):
+        self.mock_informatieobjecttypen(m)
+
+        with freeze_time("2025-01-01T23:59"):
+            self.assertEqual(
+                self.options(),
+                [
+                    f"{BASE_URL}informatieobjecttypen/1",
+                    f"{BASE_URL}informatieobjecttypen/2",
+                ],
+            )
+        with freeze_time("2025-01-02T00:01"):
+            self.assertEqual(
+                self.options(),
+                [
+                    f"{BASE_URL}informatieobjecttypen/2",
+                    f"{BASE_URL}informatieobjecttypen/3",
+                ],
+            )
+
+        self.assertEqual(m.call_count, 1)
+        self.assertEqual(
+            m.last_request.qs,
+            {"catalogus": [CATALOGUS.lower()], "status": ["definitief"]},
+        )
+
+    def test_changed_informatieobjecttype_invalidates(self, m):
+        self.mock_informatieobjecttypen(m)
+        self.options()
+
+        publish_change(None, informatieobjecttype(4, "2025-01-01"))
+        self.options()
+
+        self.assertEqual(m.call_count, 2)
+
+    def test_deleted_informatieobjecttype_invalidates(self, m):
+        self.mock_informatieobjecttypen(m)
+        self.options()
+
+        # a delete only comes with the url
+        publish_change(None, urls=[f"{BASE_URL}informatieobjecttypen/2"])
+        self.options()
+
+        self.assertEqual(m.call_count, 2)
+
+    def test_other_changes_in_catalogus_keep_cache(self, m):
+        self.mock_informatieobjecttypen(m)
+        self.options()
+
+        publish_change(
+            None, {"url": f"{BASE_URL}besluittypen/1", "catalogus": CATALOGUS}
+        )
+        self.options()
+
+        self.assertEqual(m.call_count, 1)
@@ -151,6 +151,10 @@ class InformatieObjectTypeListViewTests(VCRAPITestCase):
 
 
 class InformatieObjectTypeDetailViewTest(VCRAPITestCase):
+    replayed_cassettes = {
+        "test_retrieve_without_metadata": "test_retrieve_informatieobjecttype"
+    }
+
     @classmethod
     def setUpTestData(cls) -> None:
         super().setUpTestData()
@@ -233,6 +237,41 @@ class InformatieObjectTypeDetailViewTest(VCRAPITestCase):
             ][0]
             self.assertNotIn("editable", concept_field)
 
+    def test_retrieve_without_metadata(self):
+        iot = self.helper.create_informatieobjecttype()
+        self.client.force_login(self.user)
+
+        response = self.client.get(
+            reverse(
+                "api:informatieobjecttypen:informatieobjecttypen-detail",
+                kwargs={"slug": "OZ", "uuid": iot.uuid},
+            ),
+            {"fields": "omit"},
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        data = response.json()
+        self.assertNotIn("fieldsets", data)
+        self.assertEqual(data["fields"], [])
+
+        endpoint = reverse(
+            "api:informatieobjecttypen:informatieobjecttypen-metadata",
+            kwargs={"slug": "OZ"},
+        )
+        response = self.client.get(endpoint, {"version": data["metadata"]})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        metadata = response.json()
+        self.assertEqual(metadata["version"], data["metadata"])
+        self.assertEqual({f["name"] for f in metadata["fields"]}, set(data["result"]))
+
+        with self.subTest("revalidated by etag"):
+            response = self.client.get(
+                endpoint, headers={"If-None-Match": response["ETag"]}
+            )
+
+            self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
     def test_patch_informatieobjecttype(self):
         iot = self.helper.create_informatieobjecttype()
 
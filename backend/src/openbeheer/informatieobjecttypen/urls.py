@@ -3,6 +3,7 @@ from django.urls import path
 from .api.views import (
     InformatieObjectTypeDetailView,
     InformatieObjectTypeListView,
+    InformatieObjectTypeMetadataView,
     InformatieObjectTypePublishView,
 )
 
@@ -14,6 +15,11 @@ urlpatterns = [
         InformatieObjectTypeListView.as_view(),
         name="informatieobjecttypen-list",
     ),
+    path(
+        "metadata/",
+        InformatieObjectTypeMetadataView.as_view(),
+        name="informatieobjecttypen-metadata",
+    ),
     path(
         "<uuid:uuid>/",
         InformatieObjectTypeDetailView.as_view(),
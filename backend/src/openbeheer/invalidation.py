@@ -0,0 +1,81 @@
+"""Telling caches that resources in a ZGW service changed
+
+Views that create, change or delete resources call `publish_change` once
+the service accepted it. Caches connect to `resources_changed` and evict or
+refresh what they hold of those resources, so editors don't get served stale
+data after their own edits.
+"""
+
+from collections.abc import Iterable, Mapping
+
+from django.dispatch import Signal
+
+import structlog
+
+logger = structlog.get_logger(__name__)
+
+resources_changed = Signal()
+"""Sent when resources in a ZGW service were created, changed or deleted
+
+:param urls: frozenset of the urls of those resources
+:param zaaktypen: frozenset of the urls of the zaaktypen they belong to
+:param catalogi: frozenset of the urls of the catalogi they belong to
+:param identificaties: frozenset of their identificaties, that versions share
+"""
+
+
+def _get(obj: object, name: str) -> object:
+    return obj.get(name) if isinstance(obj, Mapping) else getattr(obj, name, None)
+
+
+def _urls(value: object) -> set[str]:
+    match value:
+        case str() if value:
+            return {value}
+        case list() | tuple():
+            return {url for url in value if isinstance(url, str)}
+        case _:
+            return set()
+
+
+def publish_change(sender: object, *objects: object, urls: Iterable[str] = ()):
+    """Send `resources_changed` for `objects` and `urls`
+
+    :param objects: Structs or mappings of the changed resources, as sent to or
+        returned by the service. Their url, zaaktype(n), catalogus and
+        identificatie are used.
+    :param urls: urls of changed resources we have no object of
+    """
+    changed = set(urls)
+    zaaktypen: set[str] = set()
+    catalogi: set[str] = set()
+    identificaties: set[str] = set()
+    for obj in objects:
+        changed |= _urls(_get(obj, "url"))
+        zaaktypen |= _urls(_get(obj, "zaaktype")) | _urls(_get(obj, "zaaktypen"))
+        catalogi |= _urls(_get(obj, "catalogus"))
+        if (
+            isinstance(identificatie := _get(obj, "identificatie"), str)
+            and identificatie
+        ):
+            identificaties.add(identificatie)
+
+    if not (changed or zaaktypen or catalogi or identificaties):
+        return
+
+    logger.debug(
+        "resources changed",
+        urls=sorted(changed),
+        zaaktypen=sorted(zaaktypen),
+        catalogi=sorted(catalogi),
+        identificaties=sorted(identificaties),
+    )
+    # the change itself succeeded, a failing cache shouldn't turn it into an
+    # error response; send_robust logs the exception
+    resources_changed.send_robust(
+        sender=sender,
+        urls=frozenset(changed),
+        zaaktypen=frozenset(zaaktypen),
+        catalogi=frozenset(catalogi),
+        identificaties=frozenset(identificaties),
+    )
@@ -0,0 +1,145 @@
+from contextlib import suppress
+
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+
+import requests_mock
+from freezegun import freeze_time
+from requests.exceptions import ConnectTimeout
+from rest_framework.response import Response
+from zgw_consumers.constants import APITypes
+from zgw_consumers.test.factories import ServiceFactory
+
+from openbeheer.utils.decorators import handle_service_errors
+
+from ..circuit_breaker import CircuitOpenError
+from ..clients import build_client
+
+BASE_URL = "https://example.com/api/"
+
+
+@override_settings(
+    UPSTREAM_CIRCUIT_BREAKER=True,
+    UPSTREAM_CIRCUIT_BREAKER_FAILURE_THRESHOLD=3,
+    UPSTREAM_CIRCUIT_BREAKER_RESET_TIMEOUT=30,
+)
+@requests_mock.Mocker()
+class CircuitBreakerTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.service = ServiceFactory.create(
+            api_type=APITypes.ztc, slug="slurm", api_root=BASE_URL
+        )
+        self.api_client = build_client(self.service)
+
+    def fail_requests(self, times: int):
+        for _ in range(times):
+            with suppress(ConnectTimeout):
+                self.api_client.get("zaaktypen")
+
+    def test_opens_after_consecutive_failures(self, m):
+        m.get(f"{BASE_URL}zaaktypen", exc=ConnectTimeout)
+        self.fail_requests(3)
+
+        with self.assertRaises(CircuitOpenError) as cm:
+            self.api_client.get("zaaktypen")
+
+        self.assertEqual(m.call_count, 3)
+        self.assertEqual(cm.exception.retry_after, 30)
+
+    def test_server_errors_count_as_failures(self, m):
+        m.get(f"{BASE_URL}zaaktypen", status_code=503)
+        for _ in range(3):
+            self.api_client.get("zaaktypen")
+
+        with self.assertRaises(CircuitOpenError):
+            self.api_client.get("zaaktypen")
+
+    def test_success_resets_failures(self, m):
+        m.get(
+            f"{BASE_URL}zaaktypen",
+            [
+                {"exc": ConnectTimeout},
+                {"exc": ConnectTimeout},
+                {"json": {}},
+                {"exc": ConnectTimeout},
+                {"exc": ConnectTimeout},
+                {"json": {}},
+            ],
+        )
+        self.fail_requests(2)
+        self.api_client.get("zaaktypen")
+        self.fail_requests(2)
+
+        self.assertEqual(self.api_client.get("zaaktypen").status_code, 200)
+
+    def test_client_errors_are_no_failures(self, m):
+        m.get(f"{BASE_URL}zaaktypen", status_code=404)
+        for _ in range(4):
+            self.api_client.get("zaaktypen")
+
+        self.assertEqual(m.call_count, 4)
+
+    def test_successful_probe_closes(self, m):
+        m.get(f"{BASE_URL}zaaktypen", exc=ConnectTimeout)
+        with freeze_time("2025-01-01 12:00:00") as frozen:
+            self.fail_requests(3)
+            frozen.tick(31)
+            m.get(f"{BASE_URL}zaaktypen", json={})
+
+            self.assertEqual(self.api_client.get("zaaktypen").status_code, 200)
+            self.assertEqual(self.api_client.get("zaaktypen").status_code, 200)
+
+    def test_failed_probe_reopens(self, m):
+        m.get(f"{BASE_URL}zaaktypen", exc=ConnectTimeout)
+        with freeze_time("2025-01-01 12:00:00") as frozen:
+            self.fail_requests(3)
+            frozen.tick(31)
+            self.fail_requests(1)  # the probe
+
+            with self.assertRaises(CircuitOpenError):
+                self.api_client.get("zaaktypen")
+        self.assertEqual(m.call_count, 4)
+
+    def test_only_allows_a_limited_number_of_probes(self, m):
+        m.get(f"{BASE_URL}zaaktypen", exc=ConnectTimeout)
+        with freeze_time("2025-01-01 12:00:00") as frozen:
+            self.fail_requests(3)
+            frozen.tick(31)
+            # a probe is in flight
+            cache.add("circuit-breaker:slurm:probe:0", True)
+
+            with self.assertRaises(CircuitOpenError):
+                self.api_client.get("zaaktypen")
+
+    @override_settings(
+        UPSTREAM_CIRCUIT_BREAKER_PER_SERVICE={"slurm": {"failure_threshold": 1}}
+    )
+    def test_per_service_thresholds(self, m):
+        m.get(f"{BASE_URL}zaaktypen", exc=ConnectTimeout)
+        self.fail_requests(1)
+
+        with self.assertRaises(CircuitOpenError):
+            self.api_client.get("zaaktypen")
+
+    @override_settings(UPSTREAM_CIRCUIT_BREAKER=False)
+    def test_disabled(self, m):
+        m.get(f"{BASE_URL}zaaktypen", exc=ConnectTimeout)
+        self.fail_requests(4)
+
+        self.assertEqual(m.call_count, 4)
+
+    def test_service_errors_are_503(self, m):
+        m.get(f"{BASE_URL}zaaktypen", exc=ConnectTimeout)
+        self.fail_requests(3)
+
+        @handle_service_errors
+        def view() -> Response:
+            self.api_client.get("zaaktypen")
+            return Response()
+
+        response = view()
+
+        self.assertEqual(response.status_code, 503)
+        self.assertEqual(response.data.code, "circuit_open")
+        self.assertEqual(response.headers["Retry-After"], "30")
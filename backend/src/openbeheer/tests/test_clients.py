@@ -1,14 +1,41 @@
+import threading
+import time
+
+from django.core.cache import cache
 from django.core.exceptions import ImproperlyConfigured
-from django.test import TestCase, override_settings
+from django.test import SimpleTestCase, TestCase, override_settings
 
+import requests_mock
 from ape_pie import APIClient
+from asgiref.sync import async_to_sync
+from msgspec import Struct
+from msgspec.json import decode, encode
+from msgspec.msgpack import encode as msgpack_encode
+from requests import HTTPError
 from zgw_consumers.constants import APITypes
 from zgw_consumers.test.factories import ServiceFactory
 
 from openbeheer.config.models import APIConfig
 from openbeheer.config.tests.factories import APIConfigFactory
-
-from ..clients import objecttypen_client, selectielijst_client, ztc_client
+from openbeheer.utils import metrics
+
+from ..clients import (
+    HTTP_CACHE_EVENTS,
+    PooledHTTPAdapter,
+    SharedResponse,
+    _follower_wait,
+    _single_flight_key,
+    aiter_pages,
+    build_client,
+    iter_pages,
+    objecttypen_client,
+    selectielijst_client,
+    service_semaphore,
+    thread_client,
+    ztc_client,
+)
+from ..deadline import deadline
+from ..invalidation import publish_change
 
 
 @override_settings(SOLO_CACHE="default")
@@ -117,3 +144,475 @@ class ClientsTests(TestCase):
 
         with self.assertRaises(ImproperlyConfigured):
             selectielijst_client()
+
+    @override_settings(
+        UPSTREAM_MAX_CONCURRENCY=0,
+        UPSTREAM_MAX_CONCURRENCY_PER_SERVICE={"slurm": 2},
+    )
+    def test_service_semaphore(self):
+        slurm = ServiceFactory.create(api_type=APITypes.ztc, slug="slurm")
+        other = ServiceFactory.create(api_type=APITypes.ztc, slug="other")
+
+        semaphore = service_semaphore(slurm)
+        assert isinstance(semaphore, threading.BoundedSemaphore)
+        self.assertIs(semaphore, service_semaphore(slurm))
+
+        # bounded to 2 concurrent requests
+        self.assertTrue(semaphore.acquire(blocking=False))
+        self.assertTrue(semaphore.acquire(blocking=False))
+        self.assertFalse(semaphore.acquire(blocking=False))
+        semaphore.release()
+        semaphore.release()
+
+        # unbounded
+        with service_semaphore(other):
+            pass
+
+    @override_settings(UPSTREAM_CONNECTION_POOLING=True)
+    def test_clients_of_a_service_share_a_connection_pool(self):
+        service = ServiceFactory.create(
+            api_type=APITypes.ztc,
+            slug="slurm",
+            api_root="https://example.com/futurama/",
+        )
+
+        client = ztc_client("slurm")
+        adapter = client.get_adapter(service.api_root)
+        assert isinstance(adapter, PooledHTTPAdapter)
+
+        ztc_client.cache_clear()
+        self.assertIs(ztc_client("slurm").get_adapter(service.api_root), adapter)
+
+        with client:
+            pool = adapter.poolmanager.connection_from_url(service.api_root)
+        # leaving the context manager didn't clear the pool
+        self.assertIs(adapter.poolmanager.connection_from_url(service.api_root), pool)
+
+        service.save()
+
+        self.assertIsNot(ztc_client("slurm").get_adapter(service.api_root), adapter)
+
+    @override_settings(UPSTREAM_CONNECTION_POOLING=True)
+    @requests_mock.Mocker()
+    def test_thread_client(self, m):
+        m.get("https://example.com/futurama/zaaktypen", json={})
+        service = ServiceFactory.create(
+            api_type=APITypes.ztc,
+            slug="slurm",
+            api_root="https://example.com/futurama/",
+        )
+        client = ztc_client("slurm")
+
+        with thread_client(client) as own_client:
+            own_client.get("zaaktypen")
+
+        self.assertIsNot(own_client, client)
+        self.assertEqual(own_client.base_url, client.base_url)
+        # set by ztc_client after building
+        self.assertEqual(m.last_request.headers["Accept-Crs"], "EPSG:4326")
+        self.assertIs(
+            own_client.get_adapter(service.api_root),
+            client.get_adapter(service.api_root),
+        )
+        self.assertEqual(m.call_count, 1)
+
+        plain = APIClient("https://example.com/")
+        with thread_client(plain) as own_client:
+            self.assertIs(own_client, plain)
+
+    def test_pooled_adapter_recycles_old_and_idle_connections(self):
+        adapter = PooledHTTPAdapter(max_age=300, idle_timeout=60)
+        pool = adapter.poolmanager.connection_from_url("https://example.com/")
+
+        self.assertFalse(adapter.recycle_expired())
+        self.assertIs(
+            adapter.poolmanager.connection_from_url("https://example.com/"), pool
+        )
+
+        adapter._last_used -= 61
+        self.assertTrue(adapter.recycle_expired())
+        self.assertIsNot(
+            adapter.poolmanager.connection_from_url("https://example.com/"), pool
+        )
+
+        adapter._created -= 301
+        self.assertTrue(adapter.recycle_expired())
+
+
+class Page(Struct):
+    count: int
+    next: str | None
+    results: list[int]
+
+
+def page_json(page: int, count: int = 7, page_size: int = 2) -> dict:
+    last_page = -(-count // page_size)
+    return {
+        "count": count,
+        "next": f"{BASE_URL}things?page={page + 1}" if page < last_page else None,
+        "results": list(range((page - 1) * page_size, min(page * page_size, count))),
+    }
+
+
+BASE_URL = "https://example.com/api/"
+
+
+@requests_mock.Mocker()
+class IterPagesTests(SimpleTestCase):
+    def setUp(self):
+        self.api_client = APIClient(BASE_URL)
+
+    def register_pages(self, m: requests_mock.Mocker, count: int = 7):
+        for page in range(1, 5):
+            m.get(f"{BASE_URL}things?page={page}", json=page_json(page, count))
+
+    def test_follows_next_links(self, m):
+        self.register_pages(m)
+        first = decode(encode(page_json(1)), type=Page)
+
+        self.assertEqual(list(iter_pages(self.api_client, first)), list(range(7)))
+        self.assertEqual(m.call_count, 3)
+
+    @override_settings(PAGE_PREFETCH_WINDOW=3)
+    def test_prefetch_yields_in_order(self, m):
+        self.register_pages(m)
+        first = decode(encode(page_json(1)), type=Page)
+
+        self.assertEqual(list(iter_pages(self.api_client, first)), list(range(7)))
+        self.assertEqual(
+            sorted(request.qs["page"][0] for request in m.request_history),
+            ["2", "3", "4"],
+        )
+
+    def test_prefetch_follows_next_of_last_page_if_items_were_added(self, m):
+        # count said 5, but page 3 says there is a 4th page
+        self.register_pages(m)
+        first = decode(encode(page_json(1, count=5)), type=Page)
+
+        self.assertEqual(
+            list(iter_pages(self.api_client, first, prefetch=2)), list(range(7))
+        )
+        self.assertEqual(m.call_count, 3)
+
+    def test_prefetch_continues_one_page_at_a_time_when_page_went_missing(self, m):
+        m.get(f"{BASE_URL}things?page=2", json=page_json(2))
+        m.get(
+            f"{BASE_URL}things?page=3",
+            [{"status_code": 404}, {"json": page_json(3)}],
+        )
+        m.get(f"{BASE_URL}things?page=4", json=page_json(4))
+        first = decode(encode(page_json(1)), type=Page)
+
+        self.assertEqual(
+            list(iter_pages(self.api_client, first, prefetch=3)), list(range(7))
+        )
+        self.assertEqual(
+            self.alist(aiter_pages(self.api_client, first, prefetch=3)), list(range(7))
+        )
+
+    def test_missing_page_raises(self, m):
+        m.get(f"{BASE_URL}things?page=2", json=page_json(2))
+        m.get(f"{BASE_URL}things?page=3", status_code=404)
+        m.get(f"{BASE_URL}things?page=4", json=page_json(4))
+        first = decode(encode(page_json(1)), type=Page)
+
+        with self.assertRaises(HTTPError):
+            list(iter_pages(self.api_client, first, prefetch=3))
+        with self.assertRaises(HTTPError):
+            self.alist(aiter_pages(self.api_client, first, prefetch=3))
+
+    def test_prefetch_falls_back_without_page_param(self, m):
+        m.get(f"{BASE_URL}things?cursor=abc", json={**page_json(2), "next": None})
+        first = decode(
+            encode({**page_json(1), "next": f"{BASE_URL}things?cursor=abc"}), type=Page
+        )
+
+        self.assertEqual(
+            list(iter_pages(self.api_client, first, prefetch=3)), [0, 1, 2, 3]
+        )
+
+    def test_async_follows_next_links(self, m):
+        self.register_pages(m)
+        first = decode(encode(page_json(1)), type=Page)
+
+        self.assertEqual(
+            self.alist(aiter_pages(self.api_client, first)), list(range(7))
+        )
+        self.assertEqual(m.call_count, 3)
+
+    def test_async_prefetch(self, m):
+        self.register_pages(m)
+        first = decode(encode(page_json(1, count=5)), type=Page)
+
+        self.assertEqual(
+            self.alist(aiter_pages(self.api_client, first, prefetch=2)), list(range(7))
+        )
+        self.assertEqual(m.call_count, 3)
+
+    @staticmethod
+    @async_to_sync
+    async def alist(items):
+        return [item async for item in items]
+
+
+@override_settings(UPSTREAM_HTTP_CACHE_SERVICES=["slurm"])
+class HTTPCacheTests(TestCase):
+    def setUp(self):
+        metrics.flush()
+        cache.clear()
+        self.service = ServiceFactory.create(
+            api_type=APITypes.ztc, slug="slurm", api_root=BASE_URL
+        )
+        self.api_client = build_client(self.service)
+
+    def etag_response(self, request, context):
+        if request.headers.get("If-None-Match") == '"v1"':
+            context.status_code = 304
+            return b""
+        context.headers["ETag"] = '"v1"'
+        return b'{"omschrijving": "slurm"}'
+
+    def counts(self):
+        return metrics.get_counts(f"http-cache:slurm:{e}" for e in HTTP_CACHE_EVENTS)
+
+    @requests_mock.Mocker()
+    def test_revalidates_with_etag(self, m):
+        m.get(f"{BASE_URL}zaaktypen/1", content=self.etag_response)
+
+        first = self.api_client.get("zaaktypen/1")
+        second = self.api_client.get("zaaktypen/1")
+
+        self.assertNotIn("If-None-Match", m.request_history[0].headers)
+        self.assertEqual(m.request_history[1].headers["If-None-Match"], '"v1"')
+        self.assertEqual(second.status_code, 200)
+        self.assertEqual(second.content, first.content)
+        self.assertEqual(second.json(), {"omschrijving": "slurm"})
+        self.assertEqual(
+            self.counts(),
+            {
+                "http-cache:slurm:hit": 1,
+                "http-cache:slurm:miss": 1,
+                "http-cache:slurm:revalidate": 1,
+            },
+        )
+
+    @requests_mock.Mocker()
+    def test_query_params_are_part_of_the_key(self, m):
+        m.get(f"{BASE_URL}zaaktypen", content=self.etag_response)
+
+        self.api_client.get("zaaktypen", params={"status": "alles"})
+        self.api_client.get("zaaktypen", params={"status": "concept"})
+
+        self.assertNotIn("If-None-Match", m.request_history[1].headers)
+
+    @requests_mock.Mocker()
+    def test_writes_evict(self, m):
+        m.get(f"{BASE_URL}zaaktypen/1", content=self.etag_response)
+        m.patch(f"{BASE_URL}zaaktypen/1", json={})
+
+        self.api_client.get("zaaktypen/1")
+        self.api_client.patch("zaaktypen/1", json={})
+        self.api_client.get("zaaktypen/1")
+
+        self.assertNotIn("If-None-Match", m.request_history[2].headers)
+
+    @requests_mock.Mocker()
+    def test_published_changes_evict(self, m):
+        m.get(f"{BASE_URL}zaaktypen/1", content=self.etag_response)
+
+        self.api_client.get("zaaktypen/1")
+        publish_change(
+            None,
+            {"url": f"{BASE_URL}statustypen/1", "zaaktype": f"{BASE_URL}zaaktypen/1"},
+        )
+        self.api_client.get("zaaktypen/1")
+
+        self.assertNotIn("If-None-Match", m.request_history[1].headers)
+
+    @override_settings(UPSTREAM_HTTP_CACHE_MAX_SIZE=10)
+    @requests_mock.Mocker()
+    def test_large_responses_are_not_cached(self, m):
+        m.get(f"{BASE_URL}zaaktypen/1", content=self.etag_response)
+
+        self.api_client.get("zaaktypen/1")
+        self.api_client.get("zaaktypen/1")
+
+        self.assertNotIn("If-None-Match", m.request_history[1].headers)
+
+    @override_settings(UPSTREAM_HTTP_CACHE_SERVICES=[])
+    @requests_mock.Mocker()
+    def test_opt_in_per_service(self, m):
+        m.get(f"{BASE_URL}zaaktypen/1", content=self.etag_response)
+
+        client = build_client(self.service)
+        client.get("zaaktypen/1")
+        client.get("zaaktypen/1")
+
+        self.assertNotIn("If-None-Match", m.request_history[1].headers)
+
+
+@override_settings(UPSTREAM_SINGLE_FLIGHT=True)
+class SingleFlightTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.service = ServiceFactory.create(
+            api_type=APITypes.ztc, slug="slurm", api_root=BASE_URL
+        )
+
+    def slow_response(self, request, context):
+        time.sleep(0.2)
+        return b'{"omschrijving": "slurm"}'
+
+    def get_concurrently(self, path: str, n: int = 3) -> list:
+        clients = [build_client(self.service) for _ in range(n)]
+        barrier = threading.Barrier(n, timeout=5)
+        responses = [None] * n
+
+        def get(i):
+            barrier.wait()
+            responses[i] = clients[i].get(path)
+
+        threads = [threading.Thread(target=get, args=(i,)) for i in range(n)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        return responses
+
+    @requests_mock.Mocker()
+    def test_concurrent_gets_share_one_request(self, m):
+        m.get(f"{BASE_URL}zaaktypen/1", content=self.slow_response)
+
+        responses = self.get_concurrently("zaaktypen/1")
+
+        self.assertEqual(m.call_count, 1)
+        for response in responses:
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(response.json(), {"omschrijving": "slurm"})
+
+    @requests_mock.Mocker()
+    def test_different_urls_are_not_shared(self, m):
+        m.get(f"{BASE_URL}zaaktypen/1", content=self.slow_response)
+
+        self.get_concurrently("zaaktypen/1", n=2)
+        self.get_concurrently("zaaktypen/1?status=concept", n=1)
+
+        self.assertEqual(m.call_count, 2)
+
+    @requests_mock.Mocker()
+    def test_followers_do_their_own_request_if_the_leader_is_slow(self, m):
+        leading = threading.Event()
+
+        def slow_response(request, context):
+            if not leading.is_set():
+                leading.set()
+                time.sleep(0.5)
+            return b'{"omschrijving": "slurm"}'
+
+        m.get(f"{BASE_URL}zaaktypen/1", content=slow_response)
+        leader = threading.Thread(
+            target=build_client(self.service).get, args=("zaaktypen/1",)
+        )
+        leader.start()
+        leading.wait(timeout=5)
+
+        response = build_client(self.service).get("zaaktypen/1", timeout=(0.05, 0.05))
+        leader.join()
+
+        self.assertEqual(response.json(), {"omschrijving": "slurm"})
+        self.assertEqual(m.call_count, 2)
+
+    def test_follower_wait(self):
+        client = build_client(self.service)
+
+        self.assertEqual(_follower_wait(client, (1, 2)), 3)
+        self.assertEqual(_follower_wait(client, 5), 5)
+        self.assertIsNone(_follower_wait(client, (1, None)))
+        with deadline(2):
+            self.assertLessEqual(_follower_wait(client, 5) or 0, 2)
+
+    @requests_mock.Mocker()
+    def test_followers_get_the_error(self, m):
+        m.get(f"{BASE_URL}zaaktypen/1", exc=ConnectionError("upstream on fire"))
+        client = build_client(self.service)
+
+        with self.assertRaises(ConnectionError):
+            client.get("zaaktypen/1")
+
+    @override_settings(UPSTREAM_SINGLE_FLIGHT_DISTRIBUTED=True)
+    @requests_mock.Mocker()
+    def test_distributed_follower_uses_published_result(self, m):
+        client = build_client(self.service)
+        key = _single_flight_key(self.service, client, f"{BASE_URL}zaaktypen/1", None)
+        cache.set(f"single-flight:{key}", "other-worker")
+        cache.set(
+            "single-flight:result:other-worker",
+            msgpack_encode(
+                SharedResponse(
+                    status_code=200,
+                    reason="OK",
+                    headers={"Content-Type": "application/json"},
+                    content=b'{"omschrijving": "slurm"}',
+                )
+            ),
+        )
+
+        response = client.get("zaaktypen/1")
+
+        self.assertFalse(m.called)
+        self.assertEqual(response.json(), {"omschrijving": "slurm"})
+
+    @override_settings(UPSTREAM_SINGLE_FLIGHT_DISTRIBUTED=True)
+    @requests_mock.Mocker()
+    def test_distributed_follower_uses_result_after_leader_is_done(self, m):
+        client = build_client(self.service)
+        key = _single_flight_key(self.service, client, f"{BASE_URL}zaaktypen/1", None)
+        cache.set(f"single-flight:{key}", "other-worker")
+
+        def finish():
+            # like the leader: publish, then release the lock
+            cache.set(
+                "single-flight:result:other-worker",
+                msgpack_encode(
+                    SharedResponse(
+                        status_code=200,
+                        reason="OK",
+                        headers={"Content-Type": "application/json"},
+                        content=b'{"omschrijving": "slurm"}',
+                    )
+                ),
+            )
+            cache.delete(f"single-flight:{key}")
+
+        threading.Timer(0.1, finish).start()
+        response = client.get("zaaktypen/1")
+
+        self.assertFalse(m.called)
+        self.assertEqual(response.json(), {"omschrijving": "slurm"})
+
+    @override_settings(
+        UPSTREAM_SINGLE_FLIGHT_DISTRIBUTED=True, UPSTREAM_SINGLE_FLIGHT_WAIT=0.1
+    )
+    @requests_mock.Mocker()
+    def test_distributed_follower_falls_back_to_own_request(self, m):
+        m.get(f"{BASE_URL}zaaktypen/1", json={"omschrijving": "slurm"})
+        client = build_client(self.service)
+        key = _single_flight_key(self.service, client, f"{BASE_URL}zaaktypen/1", None)
+        cache.set(f"single-flight:{key}", "stuck-worker")
+
+        response = client.get("zaaktypen/1")
+
+        self.assertEqual(m.call_count, 1)
+        self.assertEqual(response.json(), {"omschrijving": "slurm"})
+
+    @override_settings(UPSTREAM_SINGLE_FLIGHT_DISTRIBUTED=True)
+    @requests_mock.Mocker()
+    def test_distributed_leader_publishes_result(self, m):
+        m.get(f"{BASE_URL}zaaktypen/1", json={"omschrijving": "slurm"})
+        client = build_client(self.service)
+        key = _single_flight_key(self.service, client, f"{BASE_URL}zaaktypen/1", None)
+
+        client.get("zaaktypen/1")
+
+        self.assertEqual(m.call_count, 1)
+        self.assertIsNone(cache.get(f"single-flight:{key}"))
@@ -0,0 +1,141 @@
+from django.http import HttpResponse
+from django.test import RequestFactory, TestCase, override_settings
+
+import requests_mock
+from freezegun import freeze_time
+from msgspec import Struct
+from requests.exceptions import ReadTimeout
+from rest_framework.response import Response
+from zgw_consumers.constants import APITypes
+from zgw_consumers.test.factories import ServiceFactory
+
+from openbeheer.api.views import expand_many
+from openbeheer.utils.decorators import handle_service_errors
+from openbeheer.utils.middleware import RequestDeadlineMiddleware
+
+from ..clients import build_client, iter_pages
+from ..deadline import DeadlineExceeded, deadline, remaining
+
+BASE_URL = "https://example.com/api/"
+
+
+class Page(Struct):
+    count: int
+    next: str | None
+    results: list[int]
+
+
+@requests_mock.Mocker()
+class DeadlineTests(TestCase):
+    def setUp(self):
+        self.service = ServiceFactory.create(
+            api_type=APITypes.ztc, slug="slurm", api_root=BASE_URL, timeout=10
+        )
+        self.api_client = build_client(self.service)
+
+    def test_without_deadline_the_service_timeout_applies(self, m):
+        m.get(f"{BASE_URL}zaaktypen", json={})
+
+        self.api_client.get("zaaktypen")
+
+        self.assertEqual(m.last_request.timeout, 10)
+
+    @freeze_time("2025-01-01 12:00:00")
+    def test_timeout_is_capped_to_the_remaining_budget(self, m):
+        m.get(f"{BASE_URL}zaaktypen", json={})
+
+        with deadline(3):
+            self.api_client.get("zaaktypen")
+            self.api_client.get("zaaktypen", timeout=(1, 30))
+
+        self.assertEqual(m.request_history[0].timeout, 3)
+        self.assertEqual(m.request_history[1].timeout, (1, 3))
+
+    @freeze_time("2025-01-01 12:00:00")
+    def test_worker_threads_share_the_deadline(self, m):
+        m.get(f"{BASE_URL}zaaktypen", json={})
+        for page in (2, 3):
+            m.get(
+                f"{BASE_URL}things?page={page}",
+                json={"count": 6, "next": None, "results": []},
+            )
+
+        def expansion(client, objects):
+            client.get("zaaktypen")
+            return objects
+
+        first_page = Page(count=6, next=f"{BASE_URL}things?page=2", results=[1, 2])
+        with deadline(3):
+            list(iter_pages(self.api_client, first_page, prefetch=2))
+            expand_many(
+                self.api_client,
+                {"left": expansion, "right": expansion},
+                [],
+                max_workers=2,
+            )
+
+        self.assertEqual(m.call_count, 4)
+        self.assertEqual({r.timeout for r in m.request_history}, {3})
+
+    def test_nested_deadlines_only_shorten(self, m):
+        with deadline(3), deadline(10):
+            budget = remaining()
+            assert budget is not None
+            self.assertLessEqual(budget, 3)
+        self.assertIsNone(remaining())
+
+    def test_spent_budget_fails_fast(self, m):
+        with self.assertRaises(DeadlineExceeded), deadline(0):
+            self.api_client.get("zaaktypen")
+
+        self.assertFalse(m.called)
+
+    def test_timeout_after_budget_is_spent(self, m):
+        with freeze_time("2025-01-01 12:00:00") as frozen:
+
+            def slow(request, context):
+                frozen.tick(5)
+                raise ReadTimeout
+
+            m.get(f"{BASE_URL}zaaktypen", json=slow)
+
+            with self.assertRaises(DeadlineExceeded), deadline(3):
+                self.api_client.get("zaaktypen")
+
+    def test_is_a_504(self, m):
+        @handle_service_errors
+        def view() -> Response:
+            with deadline(0):
+                self.api_client.get("zaaktypen")
+            return Response()
+
+        response = view()
+
+        self.assertEqual(response.status_code, 504)
+        self.assertEqual(response.data.code, "deadline_exceeded")
+
+
+class RequestDeadlineMiddlewareTests(TestCase):
+    def budget(self, **headers) -> float | None:
+        seen = []
+
+        def view(request):
+            seen.append(remaining())
+            return HttpResponse()
+
+        RequestDeadlineMiddleware(view)(RequestFactory().get("/", headers=headers))
+        return seen[0]
+
+    @override_settings(UPSTREAM_REQUEST_DEADLINE=0)
+    def test_no_deadline(self):
+        self.assertIsNone(self.budget())
+
+    @override_settings(UPSTREAM_REQUEST_DEADLINE=20)
+    def test_deadline_from_settings(self):
+        self.assertAlmostEqual(self.budget() or 0, 20, delta=1)
+
+    @override_settings(UPSTREAM_REQUEST_DEADLINE=20, UPSTREAM_REQUEST_DEADLINE_MAX=60)
+    def test_deadline_from_header(self):
+        self.assertAlmostEqual(self.budget(x_request_timeout="5") or 0, 5, delta=1)
+        self.assertAlmostEqual(self.budget(x_request_timeout="600") or 0, 60, delta=1)
+        self.assertAlmostEqual(self.budget(x_request_timeout="soon") or 0, 20, delta=1)
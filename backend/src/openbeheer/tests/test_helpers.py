@@ -0,0 +1,66 @@
+from django.core.cache import cache
+from django.test import TestCase
+
+import requests_mock
+from freezegun import freeze_time
+
+from openbeheer.config.tests.factories import APIConfigFactory
+
+from ..helpers import objecttype_registry, retrieve_objecttypen
+
+BASE_URL = "http://localhost:8004/api/v2/"
+
+
+def objecttype(uuid: str, name: str):
+    return {
+        "url": f"{BASE_URL}objecttypes/{uuid}",
+        "uuid": uuid,
+        "name": name,
+        "namePlural": name,
+    }
+
+
+@requests_mock.Mocker()
+class ObjectTypeRegistryTests(TestCase):
+    def setUp(self):
+        APIConfigFactory.create()
+        cache.clear()
+        objecttype_registry.clear_cache()  # pyright: ignore[reportFunctionMemberAccess]
+        self.addCleanup(objecttype_registry.clear_cache)  # pyright: ignore[reportFunctionMemberAccess]
+
+    def test_indexes_one_fetch(self, m):
+        m.get(
+            f"{BASE_URL}objecttypes",
+            json={
+                "count": 2,
+                "next": None,
+                "previous": None,
+                "results": [objecttype("2", "Boom"), objecttype("1", "Adres")],
+            },
+        )
+
+        registry = objecttype_registry()
+
+        self.assertEqual(registry.by_uuid["1"].name, "Adres")
+        self.assertEqual(registry.by_url[f"{BASE_URL}objecttypes/2"].name, "Boom")
+        self.assertEqual(
+            [option.label for option in registry.options], ["Adres", "Boom"]
+        )
+        self.assertIs(retrieve_objecttypen(), registry.by_url)
+        self.assertEqual(m.call_count, 1)
+
+    def test_reloads_at_most_once_per_interval(self, m):
+        m.get(
+            f"{BASE_URL}objecttypes",
+            json={"count": 0, "next": None, "previous": None, "results": []},
+        )
+
+        with freeze_time("2025-01-01 12:00:00"):
+            retrieve_objecttypen()
+            retrieve_objecttypen(reload=True)
+            retrieve_objecttypen(reload=True)
+        self.assertEqual(m.call_count, 2)
+
+        with freeze_time("2025-01-01 12:01:01"):
+            retrieve_objecttypen(reload=True)
+        self.assertEqual(m.call_count, 3)
@@ -0,0 +1,85 @@
+from unittest.mock import Mock
+
+from django.test import SimpleTestCase
+
+from msgspec import UNSET, Struct, UnsetType
+
+from ..invalidation import publish_change, resources_changed
+
+BASE_URL = "https://example.com/catalogi/api/v1/"
+
+
+class StatusType(Struct):
+    url: str
+    zaaktype: str
+    omschrijving: str = ""
+
+
+class BesluitType(Struct):
+    url: UnsetType | str = UNSET
+    catalogus: str = ""
+    zaaktypen: list[str] = []
+
+
+class PublishChangeTests(SimpleTestCase):
+    def setUp(self):
+        self.receiver = Mock()
+        resources_changed.connect(self.receiver)
+        self.addCleanup(resources_changed.disconnect, self.receiver)
+
+    def test_sends_urls_and_parents(self):
+        publish_change(
+            "sender",
+            StatusType(
+                url=f"{BASE_URL}statustypen/1", zaaktype=f"{BASE_URL}zaaktypen/1"
+            ),
+            {
+                "url": f"{BASE_URL}besluittypen/1",
+                "catalogus": f"{BASE_URL}catalogussen/1",
+                "zaaktypen": [f"{BASE_URL}zaaktypen/2"],
+                "identificatie": "BESLUITTYPE-1",
+            },
+            urls=[f"{BASE_URL}roltypen/1"],
+        )
+
+        self.receiver.assert_called_once_with(
+            signal=resources_changed,
+            sender="sender",
+            urls={
+                f"{BASE_URL}statustypen/1",
+                f"{BASE_URL}besluittypen/1",
+                f"{BASE_URL}roltypen/1",
+            },
+            zaaktypen={f"{BASE_URL}zaaktypen/1", f"{BASE_URL}zaaktypen/2"},
+            catalogi={f"{BASE_URL}catalogussen/1"},
+            identificaties={"BESLUITTYPE-1"},
+        )
+
+    def test_ignores_missing_values(self):
+        publish_change("sender", BesluitType(catalogus=f"{BASE_URL}catalogussen/1"))
+
+        self.receiver.assert_called_once_with(
+            signal=resources_changed,
+            sender="sender",
+            urls=set(),
+            zaaktypen=set(),
+            catalogi={f"{BASE_URL}catalogussen/1"},
+            identificaties=set(),
+        )
+
+    def test_nothing_changed(self):
+        publish_change("sender", BesluitType(), {})
+
+        self.receiver.assert_not_called()
+
+    def test_failing_receiver_does_not_raise(self):
+        def failing_receiver(**_):
+            raise ConnectionError
+
+        resources_changed.connect(failing_receiver)
+        self.addCleanup(resources_changed.disconnect, failing_receiver)
+
+        with self.assertLogs("django.dispatch", "ERROR"):
+            publish_change("sender", urls=[f"{BASE_URL}roltypen/1"])
+
+        self.receiver.assert_called_once()
@@ -4,6 +4,7 @@ from ._oidc import OIDCInfo
 from ._open_beheer import (
     BesluitTypeWithUUID,
     DetailResponse,
+    DetailResponseWithMetadataVersion,
     DetailResponseWithoutVersions,
     EigenschapWithUUID,
     ExpandableZaakObjectTypeWithUUID,
@@ -14,6 +15,7 @@ from ._open_beheer import (
     OBField,
     OBFieldType,
     OBList,
+    OBMetadata,
     OBOption,
     OBPagedQueryParams,
     OBPagination,
@@ -32,6 +34,7 @@ from ._zgw import ZGWError, ZGWResponse
 
 __all__ = [
     "DetailResponse",
+    "DetailResponseWithMetadataVersion",
     "DetailResponseWithoutVersions",
     "ExternalServiceError",
     "FrontendFieldSet",
@@ -39,6 +42,7 @@ __all__ = [
     "OBField",
     "OBFieldType",
     "OBList",
+    "OBMetadata",
     "OBOption",
     "OBPagedQueryParams",
     "OBPagination",
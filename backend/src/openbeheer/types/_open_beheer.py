@@ -5,26 +5,28 @@
 
 import datetime
 import enum
-from functools import singledispatch
-from itertools import starmap
+from functools import cache, singledispatch
+from itertools import chain, starmap
 from types import NoneType, UnionType
 from typing import (
     Annotated,
     Callable,
+    ClassVar,
     Iterable,
     Mapping,
+    NamedTuple,
     NewType,
     Self,
     Sequence,
     Type,
     TypeAlias,
     get_args,
+    get_origin,
     get_type_hints,
 )
 from uuid import UUID
 
 from django.conf import settings
-from django.core.cache import cache as django_cache
 
 import msgspec
 from ape_pie import APIClient
@@ -32,9 +34,10 @@ from furl import furl
 from msgspec import UNSET, Meta, Struct, UnsetType, field, structs
 from msgspec.json import decode
 
-from openbeheer.clients import iter_pages, objecttypen_client, selectielijst_client
+from openbeheer.clients import iter_pages, selectielijst_client
 from openbeheer.types.objecttypen import ObjectType
 from openbeheer.utils import camelize
+from openbeheer.utils.caching import cached
 
 from . import objecttypen, selectielijst
 from .selectielijst import (
@@ -184,24 +187,7 @@ def as_ob_fieldtype(
             return OBFieldType.string
 
 
-def _cached[F: Callable[[], object]](f: F) -> F:
-    """Caching decorator, used for caching results in the default django cache for a day
-
-    Like functools cache/lru_cache adds a `clear_cache` method on the function
-    """
-    key = f.__qualname__
-    function: F = lambda: django_cache.get_or_set(
-        # type: ignore get_or_set annotation is bad
-        key,
-        default=f,
-        timeout=60 * 60 * 24,
-    )
-    function.clear_cache = lambda: django_cache.delete(key)  # pyright: ignore[reportFunctionMemberAccess]
-
-    return function
-
-
-@_cached
+@cached
 def fetch_procestype_options():
     with selectielijst_client() as client:
         response = client.get("procestypen")
@@ -214,37 +200,42 @@ def fetch_procestype_options():
     ]
 
 
-@_cached
-def fetch_objecttype_options():
-    from openbeheer.api.views import fetch_all
+def fetch_objecttype_options() -> list[OBOption[str]]:
+    from openbeheer.helpers import objecttype_registry
 
-    with objecttypen_client() as client:
-        objecttypen = fetch_all(client, "objecttypes", {}, ObjectType)
+    return list(objecttype_registry().options)
 
-    return [
-        as_ob_option(objecttype)
-        for objecttype in sorted(objecttypen, key=lambda item: item.name)
-    ]
 
+def _no_options() -> UnsetType:
+    return UNSET
 
-def options(t: type | UnionType | Annotated) -> list[OBOption] | UnsetType:
-    "Find an enum in the type and turn it into options."
+
+def _option_source(
+    t: type | UnionType | Annotated,
+) -> Callable[[], list[OBOption] | UnsetType]:
+    "Return a function that returns the `options` of `t`"
 
     match t:  # 😭 Why does Annotated rsult in an Any judgement
         case enum.EnumType():
-            return OBOption.from_enum(t)
+            enum_options = OBOption.from_enum(t)
+            return lambda: list(enum_options)
         case _ if get_args(t):
-            return options(_core_type(t))
+            return _option_source(_core_type(t))
         case _ if t is ProcesTypeURL:
-            return fetch_procestype_options()
+            return fetch_procestype_options
         case _ if t is ResultaatTypeOmschrijvingURL:
-            return fetch_resultaattypeomschrijving_options()
+            return fetch_resultaattypeomschrijving_options
         case _ if t is ResultaatURL:
-            return fetch_selectielijst_resultaat_options()
+            return fetch_selectielijst_resultaat_options
         case _ if t is ObjectTypeURL:
-            return fetch_objecttype_options()
+            return fetch_objecttype_options
         case _:
-            return UNSET
+            return _no_options
+
+
+def options(t: type | UnionType | Annotated) -> list[OBOption] | UnsetType:
+    "Find an enum in the type and turn it into options."
+    return _option_source(t)()
 
 
 class OBField[T](Struct, rename="camel", omit_defaults=True):
@@ -303,6 +294,64 @@ def _ob_required(annotation) -> bool | UnsetType:
     return not (types & empty_types)
 
 
+class _FieldSchema(NamedTuple):
+    "The part of an OBField that only depends on the type it describes"
+
+    name: CamelCaseFieldName
+    attr: str
+    "name of the attribute, without prefix"
+    type: OBFieldType
+    options: Callable[[], list[OBOption] | UnsetType]
+    editable: bool
+    "whether the types allow editing"
+    required: bool | UnsetType
+    expanded: bool
+    "whether it describes an attribute of an ``_expand``"
+
+
+@cache
+def _field_schemas(data_type: type, prefix: str = "") -> tuple[_FieldSchema, ...]:
+    """Return the static part of the `ob_fields_of_type`
+
+    Walking the annotations is expensive, and types don't change at runtime.
+    Options of fields are resolved by calling `options`, so lists fetched from
+    other APIs are as fresh as their own caches.
+    """
+
+    def to_schemas(name: str, annotation: type) -> Iterable[_FieldSchema]:
+        if name == "_expand":
+            attrs = get_type_hints(annotation, include_extras=True)
+            return (
+                schema._replace(expanded=True)
+                for attr, attr_type in attrs.items()
+                for schema in _field_schemas(
+                    _core_type(attr_type), f"_expand.{camelize(attr)}."
+                )
+            )
+
+        return [
+            _FieldSchema(
+                name=camelize(prefix + name),
+                attr=name,
+                type=as_ob_fieldtype(annotation, name),
+                options=_option_source(annotation),
+                # only editable if neither the whole type nor the attribute type is READ_ONLY
+                editable=not (
+                    set(map(_core_type, (data_type, annotation))) & READ_ONLY_TYPES
+                ),
+                required=_ob_required(annotation),
+                expanded=False,
+            )
+        ]
+
+    attrs = {
+        name: annotation
+        for name, annotation in get_type_hints(data_type, include_extras=True).items()
+        if get_origin(annotation) is not ClassVar
+    }
+    return tuple(chain.from_iterable(starmap(to_schemas, attrs.items())))
+
+
 def ob_fields_of_type(
     data_type: type,
     query_params: OBPagedQueryParams | None = None,
@@ -327,48 +376,32 @@ def ob_fields_of_type(
         logically ANDed with the editability inferred from type annotations and
         other rules.
     """
+    not_applicable = object()
 
-    def to_ob_fields(name: str, annotation: type) -> list[OBField]:
-        if name == "_expand":
-            attrs = get_type_hints(annotation, include_extras=True)
-            return [
-                field
-                for attr, attr_type in attrs.items()
-                for field in ob_fields_of_type(
-                    _core_type(attr_type),
-                    option_overrides=option_overrides,
-                    prefix=f"_expand.{camelize(attr)}.",
-                    base_editable=base_editable,
-                )
-            ]
-
-        # closure over option_overrides
-        not_applicable = object()
-
-        prefixed_name: CamelCaseFieldName = camelize(prefix + name)
-
+    def to_ob_field(schema: _FieldSchema) -> OBField:
         ob_field = OBField(
-            name=prefixed_name,
-            type=as_ob_fieldtype(annotation, name),
-            options=option_overrides.get(prefixed_name, options(annotation)),
-            # only editable if neither the whole type nor the attribute type is READ_ONLY
-            editable=base_editable(prefixed_name)
-            and not (set(map(_core_type, (data_type, annotation))) & READ_ONLY_TYPES),
-            required=_ob_required(annotation),
+            name=schema.name,
+            type=schema.type,
+            options=(
+                option_overrides[schema.name]
+                if schema.name in option_overrides
+                else schema.options()
+            ),
+            editable=base_editable(schema.name) and schema.editable,
+            required=schema.required,
         )
 
-        if query_params:
-            for filter_name in [name, f"{name}__in"]:
+        if query_params and not schema.expanded:
+            for filter_name in [schema.attr, f"{schema.attr}__in"]:
                 if (
                     value := getattr(query_params, filter_name, not_applicable)
                 ) is not not_applicable:
                     ob_field.filter_lookup = filter_name
                     ob_field.filter_value = value
 
-        return [ob_field]
+        return ob_field
 
-    attrs = get_type_hints(data_type, include_extras=True)
-    return sum(starmap(to_ob_fields, attrs.items()), [])
+    return list(map(to_ob_field, _field_schemas(data_type, prefix)))
 
 
 class OBList[T](Struct):
@@ -422,6 +455,28 @@ class DetailResponseWithoutVersions[T](Struct):
     fields: list[OBField]
 
 
+class DetailResponseWithMetadataVersion[T](Struct):
+    """A DetailResponse requested with `?fields=omit`
+
+    The fieldsets and fields are left out, except the fields with options that
+    depend on `result`. The rest is fetched once from the metadata endpoint.
+    """
+
+    result: T
+    metadata: str
+    "the version of the metadata this response was made with"
+    fields: list[OBField]
+    versions: list[VersionSummary] | UnsetType = msgspec.UNSET
+
+
+class OBMetadata(Struct):
+    "The fieldsets and fields of a detail view, that don't depend on the object"
+
+    version: str
+    fieldsets: FrontendFieldsets
+    fields: list[OBField]
+
+
 class ExternalServiceError(Struct):
     code: str
     title: str
@@ -488,10 +543,22 @@ class UUIDMixin:
 
     uuid: UUID | UnsetType = UNSET
     admin_url: str | UnsetType = field(name="adminUrl", default=UNSET)
+    admin_slug: ClassVar[str | None] = None
+    "Model name of the resource in the Open Zaak admin, to set `admin_url`"
 
     def __post_init__(self):
         if url := getattr(self, "url", None):
-            self.uuid = UUID(furl(url).path.segments[-1])
+            for name, value in self.url_fields(url).items():
+                setattr(self, name, value)
+
+    @classmethod
+    def url_fields(cls, url: str) -> dict[str, object]:
+        "Return the values of the fields that are derived from `url`, by name"
+        uuid = UUID(furl(url).path.segments[-1])
+        fields: dict[str, object] = {"uuid": uuid}
+        if cls.admin_slug:
+            fields["admin_url"] = _admin_url(cls.admin_slug, uuid, url)
+        return fields
 
 
 def _admin_url(
@@ -517,19 +584,13 @@ def _admin_url(
 class BesluitTypeWithUUID(UUIDMixin, BesluitType):
     uuid: UUID | UnsetType = UNSET
     admin_url: str | UnsetType = field(name="adminUrl", default=UNSET)
-
-    def __post_init__(self):
-        super().__post_init__()
-        self.admin_url = _admin_url("besluittype", self.uuid, self.url)
+    admin_slug = "besluittype"
 
 
 class StatusTypeWithUUID(UUIDMixin, StatusType):
     uuid: UUID | UnsetType = UNSET
     admin_url: str | UnsetType = field(name="adminUrl", default=UNSET)
-
-    def __post_init__(self):
-        super().__post_init__()
-        self.admin_url = _admin_url("statustype", self.uuid, self.url)
+    admin_slug = "statustype"
 
 
 ResultaatTypeOmschrijvingURL = NewType("ResultaatTypeOmschrijvingURL", str)
@@ -558,7 +619,7 @@ def _resultaattypeomschrijving_as_option(
     return OBOption(label=omschrijving.omschrijving, value=omschrijving.url)
 
 
-@_cached
+@cached
 def fetch_resultaattypeomschrijving_options():
     with selectielijst_client() as client:
         response = client.get("resultaattypeomschrijvingen")
@@ -646,22 +707,34 @@ def _resultaat_as_option(resultaat: LAXResultaat, **kwargs) -> OBOption[Resultaa
 def fetch_selectielijst_resultaat_options(
     procestype_url: str | None = None,
 ) -> list[OBOption[LAXResultaat]]:
-    resultaten = fetch_resultaten()
-    return [
-        as_ob_option(p)
-        for p in sorted(
-            resultaten,
-            key=lambda r: (r.proces_type, r.volledig_nummer, r.nummer, r.naam),
-        )
-        if not procestype_url or p.proces_type == procestype_url
-    ]
+    return list(_selectielijst_resultaat_options().get(procestype_url or "", []))
+
 
+@cached
+def _selectielijst_resultaat_options() -> dict[str, list[OBOption[LAXResultaat]]]:
+    """Return the options of all selectielijst resultaten, sorted, by procestype url
 
-@_cached
+    The options of all procestypen together are under ``""``.
+    """
+    resultaten = sorted(
+        fetch_resultaten(),
+        key=lambda r: (r.proces_type, r.volledig_nummer, r.nummer, r.naam),
+    )
+    index: dict[str, list[OBOption[LAXResultaat]]] = {"": []}
+    for resultaat in resultaten:
+        option = as_ob_option(resultaat)
+        index[""].append(option)
+        if resultaat.proces_type:
+            index.setdefault(resultaat.proces_type, []).append(option)
+    return index
+
+
+@cached
 def fetch_resultaten() -> list[LAXResultaat]:
     class PagedResultaat(Struct):
         next: str | None
         results: list[LAXResultaat]
+        count: int | None = None
 
     with selectielijst_client() as client:
         response = client.get("resultaten")
@@ -698,12 +771,12 @@ class ResultaatTypeWithUUID(UUIDMixin, ResultaatType):
         | UnsetType
     ) = UNSET
     admin_url: str | UnsetType = field(name="adminUrl", default=UNSET)
+    admin_slug = "resultaattype"
 
     def __post_init__(self):
         super().__post_init__()
         if self.brondatum_archiefprocedure:
             self.afleidingswijze = self.brondatum_archiefprocedure.afleidingswijze
-        self.admin_url = _admin_url("resultaattype", self.uuid, self.url)
 
 
 class EigenschapWithUUID(UUIDMixin, Eigenschap):
@@ -712,29 +785,23 @@ class EigenschapWithUUID(UUIDMixin, Eigenschap):
     # set here because front end doesn't support nested structures.
     formaat: FormaatEnum | UnsetType = UNSET
     admin_url: str | UnsetType = field(name="adminUrl", default=UNSET)
+    admin_slug = "eigenschap"
 
     def __post_init__(self):
         super().__post_init__()
         self.formaat = self.specificatie.formaat
-        self.admin_url = _admin_url("eigenschap", self.uuid, self.url)
 
 
 class InformatieObjectTypeWithUUID(UUIDMixin, InformatieObjectType):
     uuid: UUID | UnsetType = UNSET
     admin_url: str | UnsetType = field(name="adminUrl", default=UNSET)
-
-    def __post_init__(self):
-        super().__post_init__()
-        self.admin_url = _admin_url("informatieobjecttype", self.uuid, self.url)
+    admin_slug = "informatieobjecttype"
 
 
 class RolTypeWithUUID(UUIDMixin, RolType):
     uuid: UUID | UnsetType = UNSET
     admin_url: str | UnsetType = field(name="adminUrl", default=UNSET)
-
-    def __post_init__(self):
-        super().__post_init__()
-        self.admin_url = _admin_url("roltype", self.uuid, self.url)
+    admin_slug = "roltype"
 
 
 class LAXProcesType(ProcesType):
@@ -770,19 +837,13 @@ class ZaakTypeWithUUID(UUIDMixin, ZaakType):
         | None
     ) = None
     admin_url: str | UnsetType = field(name="adminUrl", default=UNSET)
-
-    def __post_init__(self):
-        super().__post_init__()
-        self.admin_url = _admin_url("zaaktype", self.uuid, self.url)
+    admin_slug = "zaaktype"
 
 
 class ZaakTypeInformatieObjectTypeWithUUID(UUIDMixin, ZaakTypeInformatieObjectType):
     uuid: UUID | UnsetType = UNSET
     admin_url: str | UnsetType = field(name="adminUrl", default=UNSET)
-
-    def __post_init__(self):
-        super().__post_init__()
-        self.admin_url = _admin_url("zaaktypeinformatieobjecttype", self.uuid, self.url)
+    admin_slug = "zaaktypeinformatieobjecttype"
 
 
 class ZaakObjectTypeExtension(Struct, frozen=True, rename="camel"):
@@ -792,10 +853,7 @@ class ZaakObjectTypeExtension(Struct, frozen=True, rename="camel"):
 class ZaakObjectTypeWithUUID(UUIDMixin, ZaakObjectType):
     uuid: UUID | UnsetType = UNSET
     admin_url: str | UnsetType = field(name="adminUrl", default=UNSET)
-
-    def __post_init__(self):
-        super().__post_init__()
-        self.admin_url = _admin_url("zaakobjecttype", self.uuid, self.url)
+    admin_slug = "zaakobjecttype"
 
 
 class ExpandableZaakObjectTypeWithUUID(UUIDMixin, ZaakObjectType):
@@ -811,10 +869,7 @@ class ExpandableZaakObjectTypeWithUUID(UUIDMixin, ZaakObjectType):
     )
     _expand: ZaakObjectTypeExtension = ZaakObjectTypeExtension()
     admin_url: str | UnsetType = field(name="adminUrl", default=UNSET)
-
-    def __post_init__(self):
-        super().__post_init__()
-        self.admin_url = _admin_url("zaakobjecttype", self.uuid, self.url)
+    admin_slug = "zaakobjecttype"
 
 
 class ZaakTypeExtension(Struct, frozen=True, rename="camel"):
@@ -1,14 +1,26 @@
 from datetime import date
 from enum import Enum
-from typing import Annotated, Optional
+from typing import Annotated, Optional, get_type_hints
 from unittest import TestCase
+from unittest.mock import MagicMock, patch
 
 from hypothesis import assume, given, strategies as st  # noqa: F401
 from msgspec import UNSET, Meta, Struct, UnsetType
 from msgspec.json import decode, encode
 
 from . import ztc
-from ._open_beheer import camelize, ob_fields_of_type, options
+from ._open_beheer import (
+    LAXResultaat,
+    LAXWaardering,
+    ProcesTypeURL,
+    ResultaatURL,
+    _selectielijst_resultaat_options,
+    camelize,
+    fetch_resultaten,
+    fetch_selectielijst_resultaat_options,
+    ob_fields_of_type,
+    options,
+)
 
 ZTC_DATATYPES = [
     struct
@@ -104,6 +116,53 @@ class OBFieldsTest(TestCase):
 
         assert field_names == expected_struct_attributes | unrequired_unset_values
 
+    def test_schema_is_compiled_once(self):
+        class Colour(Enum):
+            red = "red"
+            blue = "blue"
+
+        class Label(Struct):
+            colour: Colour
+
+        class Extension(Struct, frozen=True):
+            labels: list[Label] | UnsetType = UNSET
+
+        class Painting(Struct):
+            colour: Colour
+            title: str
+            _expand: Extension = Extension()
+
+        class Query(Struct):
+            title: str = "Sunflowers"
+
+        with patch(
+            "openbeheer.types._open_beheer.get_type_hints", wraps=get_type_hints
+        ) as get_hints:
+            plain = list(ob_fields_of_type(Painting))
+            overlaid = ob_fields_of_type(
+                Painting,
+                Query(),  # pyright: ignore[reportArgumentType]
+                {"colour": []},
+                base_editable=lambda name: name == "title",
+            )
+            again = list(ob_fields_of_type(Painting))
+
+        self.assertEqual(get_hints.call_count, 3)  # Painting, Extension and Label
+        self.assertEqual(plain, again)
+
+        colour, title, expanded = overlaid
+        self.assertEqual(colour.options, [])
+        self.assertFalse(colour.editable)
+        self.assertTrue(title.editable)
+        self.assertEqual(title.filter_value, "Sunflowers")
+        self.assertEqual(expanded.name, "_expand.labels.colour")
+        self.assertEqual(len(expanded.options), 2)  # pyright: ignore[reportArgumentType]
+
+        # results are not shared between calls
+        plain[0].options.clear()  # pyright: ignore[reportAttributeAccessIssue]
+        fresh = list(ob_fields_of_type(Painting))
+        self.assertEqual(len(fresh[0].options), 2)  # pyright: ignore[reportArgumentType]
+
 
 class OBOptionsTest(TestCase):
     @given(enum=st.sampled_from(ZTC_ENUMS))
@@ -130,3 +189,56 @@ class OBOptionsTest(TestCase):
 
         assert ob_options is not UNSET
         assert len(ob_options) == len(ztc.VertrouwelijkheidaanduidingEnum)
+
+
+class SelectielijstResultaatOptionsTest(TestCase):
+    def setUp(self):
+        _selectielijst_resultaat_options.clear_cache()  # pyright: ignore[reportFunctionMemberAccess]
+        self.addCleanup(_selectielijst_resultaat_options.clear_cache)  # pyright: ignore[reportFunctionMemberAccess]
+
+    def test_indexed_by_procestype(self):
+        def resultaat(procestype: str, nummer: int) -> LAXResultaat:
+            return LAXResultaat(
+                url=ResultaatURL(f"{procestype}/{nummer}"),
+                nummer=nummer,
+                naam=f"{procestype} {nummer}",
+                waardering=LAXWaardering.vernietigen,
+                proces_type=ProcesTypeURL(procestype),
+            )
+
+        resultaten = [resultaat("b", 1), resultaat("a", 2), resultaat("a", 1)]
+        with patch(
+            "openbeheer.types._open_beheer.fetch_resultaten", return_value=resultaten
+        ) as fetch:
+            by_a = fetch_selectielijst_resultaat_options("a")
+            every = fetch_selectielijst_resultaat_options()
+            unknown = fetch_selectielijst_resultaat_options("c")
+
+        fetch.assert_called_once()
+        self.assertEqual([o.value for o in by_a], ["a/1", "a/2"])
+        self.assertEqual([o.value for o in every], ["a/1", "a/2", "b/1"])
+        self.assertEqual(unknown, [])
+
+    def test_resultaten_are_cached(self):
+        fetch_resultaten.clear_cache()  # pyright: ignore[reportFunctionMemberAccess]
+        self.addCleanup(fetch_resultaten.clear_cache)  # pyright: ignore[reportFunctionMemberAccess]
+        client = MagicMock()
+        client.__enter__.return_value = client
+        client.get.return_value.content = encode(
+            {
+                "next": None,
+                "results": [
+                    {"url": "a/1", "nummer": 1, "naam": "a 1", "waardering": ""}
+                ],
+            }
+        )
+
+        with patch(
+            "openbeheer.types._open_beheer.selectielijst_client", return_value=client
+        ):
+            first = fetch_resultaten()
+            second = fetch_resultaten()
+
+        client.get.assert_called_once()
+        self.assertEqual(first, second)
+        self.assertEqual([r.url for r in second], ["a/1"])
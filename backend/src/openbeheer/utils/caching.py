@@ -0,0 +1,222 @@
+"""Caching of expensive functions without arguments, like fetching option lists
+
+Values live in two tiers: a per process L1 with a short timeout, so most calls
+don't even (un)pickle, and the shared ``CACHED_FUNCTIONS_CACHE`` as L2.
+
+L2 entries are never left to expire on all workers at once. Their timeout is
+jittered, and after ``CACHED_FUNCTIONS_REFRESH_AHEAD`` of it has passed the
+value is refreshed in a background thread, while the current value is still
+served. Values past their timeout keep being served, as stale, for
+``CACHED_FUNCTIONS_MAX_STALE`` seconds while they are refreshed. A lock in the
+L2 cache makes sure only one worker refreshes a value at a time, and after a
+failed refresh the next one waits ``CACHED_FUNCTIONS_RETRY_AFTER`` seconds.
+
+When there is no value at all, one call computes it while concurrent calls, in
+this and in other workers, wait for it for up to
+``CACHED_FUNCTIONS_LOCK_TIMEOUT`` seconds.
+"""
+
+import random
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from functools import update_wrapper
+from typing import Callable, NamedTuple, cast, overload
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import connections
+
+import structlog
+
+from openbeheer.deadline import remaining
+from openbeheer.utils import metrics
+
+logger = structlog.get_logger(__name__)
+
+CACHED_EVENTS = ("hit", "stale", "miss", "refresh")
+"""Counted per function in :mod:`openbeheer.utils.metrics` as
+``cached:<qualname>:<event>``.
+
+hit: a fresh value was served, from L1 or L2
+stale: a value past its timeout was served
+miss: there was no value, it was computed during the call
+refresh: a value was computed in the background"""
+
+CACHED_FUNCTIONS: dict[str, "CachedFunction"] = {}
+"All functions decorated with `cached`, by qualified name"
+
+# refreshes don't run in the context of the request that triggered them, so
+# deadlines and log context don't carry over
+_refresher = ThreadPoolExecutor(max_workers=2, thread_name_prefix="cached-refresh")
+
+_POLL_INTERVAL = 0.05
+"Seconds between checks whether another worker computed a missing value"
+
+
+class _Entry(NamedTuple):
+    value: object
+    refresh_at: float
+    "After this the value is refreshed in the background"
+    expires_at: float
+    "After this the value is stale"
+
+
+class CachedFunction[R]:
+    def __init__(
+        self, f: Callable[[], R], timeout_setting: str = "CACHED_FUNCTIONS_TIMEOUT"
+    ):
+        update_wrapper(self, f)
+        self.f = f
+        self.timeout_setting = timeout_setting
+        self.name = f.__qualname__
+        self.key = f"cached:{self.name}"
+        self._l1: tuple[_Entry, float] | None = None
+        self._l1_lock = threading.Lock()
+        self._miss_lock = threading.Lock()
+        self.refreshing: Future[None] | None = None
+        "The background refresh started by the last call, if any"
+
+    @staticmethod
+    def _cache():
+        return caches[settings.CACHED_FUNCTIONS_CACHE]
+
+    def _count(self, event: str) -> None:
+        metrics.incr(f"{self.key}:{event}")
+
+    def _store(self, value: R) -> _Entry:
+        now = time.time()
+        timeout = getattr(settings, self.timeout_setting) * random.uniform(
+            1 - settings.CACHED_FUNCTIONS_JITTER, 1
+        )
+        entry = _Entry(
+            value,
+            refresh_at=now + timeout * settings.CACHED_FUNCTIONS_REFRESH_AHEAD,
+            expires_at=now + timeout,
+        )
+        self._cache().set(
+            self.key, entry, timeout=timeout + settings.CACHED_FUNCTIONS_MAX_STALE
+        )
+        self._set_l1(entry)
+        return entry
+
+    def _set_l1(self, entry: _Entry) -> None:
+        with self._l1_lock:
+            self._l1 = entry, time.monotonic() + settings.CACHED_FUNCTIONS_L1_TIMEOUT
+
+    def _get_l1(self) -> _Entry | None:
+        with self._l1_lock:
+            if self._l1 and time.monotonic() < self._l1[1]:
+                return self._l1[0]
+        return None
+
+    def _refresh(self, lock: str) -> None:
+        try:
+            self._store(self.f())
+            self._count("refresh")
+        except Exception:
+            logger.exception("cached function refresh failed", function=self.name)
+            # hold on to the lock for a while, so we don't retry on every call
+            self._cache().set(lock, True, timeout=settings.CACHED_FUNCTIONS_RETRY_AFTER)
+        else:
+            self._cache().delete(lock)
+        finally:
+            # the refresher threads get their own database connections
+            connections.close_all()
+
+    def _refresh_in_background(self) -> None:
+        lock = f"{self.key}:lock"
+        if self._cache().add(
+            lock, True, timeout=settings.CACHED_FUNCTIONS_LOCK_TIMEOUT
+        ):
+            self.refreshing = _refresher.submit(self._refresh, lock)
+
+    def _wait_for_other_worker(self, lock: str) -> _Entry | None:
+        "Wait for the worker holding `lock` to store the value"
+        cache = self._cache()
+        wait = settings.CACHED_FUNCTIONS_LOCK_TIMEOUT
+        if (left := remaining()) is not None:
+            wait = min(wait, left)
+        for _ in range(int(wait / _POLL_INTERVAL)):
+            time.sleep(_POLL_INTERVAL)
+            if entry := cache.get(self.key):
+                return entry
+            if cache.get(lock) is None:
+                # it failed, or gave up
+                return None
+        return None
+
+    def _compute(self) -> _Entry:
+        "Compute the missing value, or wait for another call that computes it"
+        cache = self._cache()
+        lock = f"{self.key}:computing"
+        with self._miss_lock:
+            # another thread may have stored it while we waited
+            if entry := self._get_l1() or cache.get(self.key):
+                self._set_l1(entry)
+                return entry
+
+            locked = cache.add(
+                lock, True, timeout=settings.CACHED_FUNCTIONS_LOCK_TIMEOUT
+            )
+            if not locked and (entry := self._wait_for_other_worker(lock)):
+                self._set_l1(entry)
+                return entry
+
+            self._count("miss")
+            try:
+                return self._store(self.f())
+            finally:
+                if locked:
+                    cache.delete(lock)
+
+    def __call__(self) -> R:
+        now = time.time()
+        entry = self._get_l1()
+        # when due, another worker may have refreshed it already
+        if (entry is None or entry.refresh_at <= now) and (
+            shared := self._cache().get(self.key)
+        ):
+            entry = shared
+            self._set_l1(entry)
+
+        if entry is None:
+            return cast("R", self._compute().value)
+
+        self._count("hit" if entry.expires_at > now else "stale")
+        if entry.refresh_at <= now:
+            self._refresh_in_background()
+        return cast("R", entry.value)
+
+    def cached_value(self) -> R | None:
+        "Return the cached value, fresh or stale, without computing it"
+        entry = self._get_l1() or self._cache().get(self.key)
+        return cast("R", entry.value) if entry else None
+
+    def clear_cache(self) -> None:
+        with self._l1_lock:
+            self._l1 = None
+        self._cache().delete(self.key)
+
+
+@overload
+def cached[F: Callable[[], object]](f: F, /) -> F: ...
+@overload
+def cached[F: Callable[[], object]](*, timeout_setting: str) -> Callable[[F], F]: ...
+def cached[F: Callable[[], object]](
+    f: F | None = None, /, *, timeout_setting: str = "CACHED_FUNCTIONS_TIMEOUT"
+) -> F | Callable[[F], F]:
+    """Caching decorator for functions without arguments, see the module docs
+
+    Like functools cache/lru_cache adds a `clear_cache` method on the function
+
+    :param timeout_setting: name of the setting with the timeout in seconds, to
+        use instead of ``CACHED_FUNCTIONS_TIMEOUT``
+    """
+
+    def decorator(f: F) -> F:
+        function = CachedFunction(f, timeout_setting)
+        CACHED_FUNCTIONS[function.name] = function
+        return cast("F", function)
+
+    return decorator(f) if f else decorator
@@ -1,19 +1,87 @@
 from functools import wraps
-from typing import Callable, ParamSpec
+from inspect import iscoroutinefunction
+from typing import Any, Awaitable, Callable, ParamSpec, TypeVar, overload
 
 from django.core.exceptions import ImproperlyConfigured
+from django.http.response import HttpResponseBase
 
 from requests.exceptions import ConnectionError, ReadTimeout
 from rest_framework.response import Response
 
+from openbeheer.circuit_breaker import CircuitOpenError
+from openbeheer.deadline import DeadlineExceeded
 from openbeheer.types import ExternalServiceError
 
 Params = ParamSpec("Params")
+ResponseT = TypeVar("ResponseT", bound=HttpResponseBase)
 
 
+def service_error(
+    error: ConnectionError | ReadTimeout | ImproperlyConfigured,
+) -> ExternalServiceError:
+    "The error to return for a failing external service"
+    match error:
+        case CircuitOpenError():
+            return ExternalServiceError(
+                title="Service unavailable",
+                detail="The external service is failing, try again later.",
+                code="circuit_open",
+                status=503,
+            )
+        case DeadlineExceeded():
+            return ExternalServiceError(
+                title="Deadline exceeded",
+                detail="The external services took too long to respond.",
+                code="deadline_exceeded",
+                status=504,
+            )
+        case ReadTimeout():
+            return ExternalServiceError(
+                title="Timeout error",
+                detail="The request to the external service timed out.",
+                code="timeout_error",
+                status=504,
+            )
+        case ConnectionError():
+            return ExternalServiceError(
+                title="Connection error",
+                detail="Could not connect to external service.",
+                code="connection_error",
+                status=502,
+            )
+        case ImproperlyConfigured():
+            return ExternalServiceError(
+                title="Configuration error",
+                detail=str(error),
+                code="configuration_error",
+                status=503,  # Service Unavailable
+            )
+
+
+def _service_error_response(
+    error: ConnectionError | ReadTimeout | ImproperlyConfigured,
+) -> Response:
+    data = service_error(error)
+    if isinstance(error, CircuitOpenError):
+        return Response(
+            data, status=data.status, headers={"Retry-After": str(error.retry_after)}
+        )
+    return Response(data, status=data.status)
+
+
+@overload
 def handle_service_errors(
-    func: Callable[Params, Response],
-) -> Callable[Params, Response]:
+    func: Callable[Params, Awaitable[ResponseT]],
+) -> Callable[Params, Awaitable[ResponseT | Response]]: ...
+
+
+@overload
+def handle_service_errors(
+    func: Callable[Params, ResponseT],
+) -> Callable[Params, ResponseT | Response]: ...
+
+
+def handle_service_errors(func: Callable[..., Any]) -> Callable[..., Any]:
     """Try/except calls to external services
 
     Decorator to avoid crashes in case the external services (like Open Zaak or the Selectielijst API)
@@ -24,37 +92,26 @@ def handle_service_errors(
         @handle_service_errors
         def get(request, *args, **kwargs) -> Response:
             ...
+
+    Works the same on ``async def`` views.
     """
 
+    if iscoroutinefunction(func):
+
+        @wraps(func)
+        async def async_wrapper(*args, **kwargs) -> Response:
+            try:
+                return await func(*args, **kwargs)
+            except (ConnectionError, ReadTimeout, ImproperlyConfigured) as e:
+                return _service_error_response(e)
+
+        return async_wrapper
+
     @wraps(func)
-    def wrapper(*args: Params.args, **kwargs: Params.kwargs) -> Response:
+    def wrapper(*args, **kwargs) -> Response:
         try:
-            response = func(*args, **kwargs)
-        except ConnectionError:
-            data = ExternalServiceError(
-                title="Connection error",
-                detail="Could not connect to external service.",
-                code="connection_error",
-                status=502,
-            )
-            return Response(data, status=502)
-        except ReadTimeout:
-            data = ExternalServiceError(
-                title="Timeout error",
-                detail="The request to the external service timed out.",
-                code="timeout_error",
-                status=504,
-            )
-            return Response(data, status=504)
-        except ImproperlyConfigured as e:
-            data = ExternalServiceError(
-                title="Configuration error",
-                detail=str(e),
-                code="configuration_error",
-                status=503,  # Service Unavailable
-            )
-            return Response(data, status=503)
-
-        return response
+            return func(*args, **kwargs)
+        except (ConnectionError, ReadTimeout, ImproperlyConfigured) as e:
+            return _service_error_response(e)
 
     return wrapper
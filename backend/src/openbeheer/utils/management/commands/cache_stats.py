@@ -0,0 +1,35 @@
+from django.core.management.base import BaseCommand
+
+from zgw_consumers.models import Service
+
+import openbeheer.types  # noqa: F401 registers the cached functions
+from openbeheer.clients import HTTP_CACHE_EVENTS
+from openbeheer.utils import metrics
+from openbeheer.utils.caching import CACHED_EVENTS, CACHED_FUNCTIONS
+
+
+class Command(BaseCommand):
+    help = "Show the hit/miss counters of the upstream caches"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--reset",
+            action="store_true",
+            help="Reset the counters after showing them.",
+        )
+
+    def handle(self, *args, **options):
+        names = [
+            f"http-cache:{slug}:{event}"
+            for slug in Service.objects.values_list("slug", flat=True)
+            for event in HTTP_CACHE_EVENTS
+        ] + [
+            f"cached:{name}:{event}"
+            for name in CACHED_FUNCTIONS
+            for event in CACHED_EVENTS
+        ]
+        for name, count in metrics.get_counts(names).items():
+            self.stdout.write(f"{name}: {count}")
+
+        if options["reset"]:
+            metrics.reset(names)
@@ -0,0 +1,90 @@
+import time
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import connections
+
+from msgspec import Struct
+from zgw_consumers.constants import APITypes
+from zgw_consumers.models import Service
+
+import openbeheer.helpers  # noqa: F401 registers the cached functions
+import openbeheer.types  # noqa: F401 registers the cached functions
+from openbeheer.api.views import fetch_all
+from openbeheer.catalogi.snapshot import refresh_snapshot
+from openbeheer.clients import build_client
+from openbeheer.informatieobjecttypen.options import informatieobjecttype_options
+from openbeheer.utils.caching import CACHED_FUNCTIONS
+
+
+class _Catalogus(Struct):
+    url: str
+
+
+class Command(BaseCommand):
+    help = (
+        "Fill the caches of upstream data, so the first editors after a deploy "
+        "or cache flush don't have to wait for them. Fails soft: an unreachable "
+        "service is reported, but doesn't make the command fail."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=4,
+            help="Number of datasets fetched at the same time.",
+        )
+
+    def handle(self, *args, **options):
+        self.failed: list[str] = []
+        with ThreadPoolExecutor(max_workers=options["workers"]) as executor:
+            catalogi = {
+                service: executor.submit(
+                    self._warm,
+                    f"catalogi:{service.slug}",
+                    lambda service=service: fetch_all(
+                        build_client(service), "catalogussen", {}, _Catalogus
+                    ),
+                )
+                for service in Service.objects.filter(api_type=APITypes.ztc)
+            }
+            for name, function in CACHED_FUNCTIONS.items():
+                executor.submit(self._warm, f"cached:{name}", function)
+
+            for service, future in catalogi.items():
+                for catalogus in future.result() or []:
+                    # clients aren't shared between threads
+                    executor.submit(
+                        self._warm,
+                        f"informatieobjecttype-options:{catalogus.url}",
+                        lambda service=service, url=catalogus.url: (
+                            informatieobjecttype_options(build_client(service), url)
+                        ),
+                    )
+                    if settings.CATALOGUS_SNAPSHOTS:
+                        executor.submit(
+                            self._warm,
+                            f"catalogus-snapshot:{catalogus.url}",
+                            lambda service=service, url=catalogus.url: refresh_snapshot(
+                                build_client(service), url
+                            ),
+                        )
+
+        self.stdout.write(f"Done, {len(self.failed)} failed")
+
+    def _warm[T](self, name: str, function: Callable[[], T]) -> T | None:
+        start = time.monotonic()
+        try:
+            result = function()
+        except Exception as exc:
+            self.failed.append(name)
+            self.stderr.write(f"{name}: failed: {exc!r}")
+            return None
+        else:
+            self.stdout.write(f"{name}: {time.monotonic() - start:.2f}s")
+            return result
+        finally:
+            connections.close_all()
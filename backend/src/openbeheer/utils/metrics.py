@@ -0,0 +1,74 @@
+"""Counters kept in the default cache, so they are shared by all workers.
+
+Increments are added up in the process, and only written to the cache every
+``METRICS_FLUSH_INTERVAL`` seconds, so counting doesn't cost a round trip.
+"""
+
+import atexit
+import threading
+import time
+from collections import Counter
+from typing import Iterable
+
+from django.conf import settings
+from django.core.cache import cache
+
+_PREFIX = "metrics"
+
+_pending: Counter[str] = Counter()
+_lock = threading.Lock()
+_flushed_at = time.monotonic()
+
+
+def _key(name: str) -> str:
+    return f"{_PREFIX}:{name}"
+
+
+def _add(name: str, delta: int) -> None:
+    key = _key(name)
+    try:
+        cache.incr(key, delta)
+    except ValueError:  # unknown key
+        if not cache.add(key, delta, timeout=None):
+            # another worker was first
+            cache.incr(key, delta)
+
+
+def incr(name: str, delta: int = 1) -> None:
+    "Increment counter `name`"
+    with _lock:
+        _pending[name] += delta
+        if time.monotonic() - _flushed_at < settings.METRICS_FLUSH_INTERVAL:
+            return
+    flush()
+
+
+def flush() -> None:
+    "Write the increments of this process to the cache"
+    global _flushed_at
+    with _lock:
+        pending = dict(_pending)
+        _pending.clear()
+        _flushed_at = time.monotonic()
+    for name, delta in pending.items():
+        if delta:
+            _add(name, delta)
+
+
+atexit.register(flush)
+
+
+def get_counts(names: Iterable[str]) -> dict[str, int]:
+    "Return the current value of each counter in `names`"
+    flush()
+    names = list(names)
+    values = cache.get_many([_key(name) for name in names])
+    return {name: values.get(_key(name), 0) for name in names}
+
+
+def reset(names: Iterable[str]) -> None:
+    names = list(names)
+    with _lock:
+        for name in names:
+            _pending.pop(name, None)
+    cache.delete_many([_key(name) for name in names])
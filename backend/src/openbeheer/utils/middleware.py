@@ -0,0 +1,30 @@
+from inspect import iscoroutinefunction
+
+from asgiref.sync import markcoroutinefunction
+
+from openbeheer.deadline import deadline, request_budget
+
+
+class RequestDeadlineMiddleware:
+    """Set the time budget for upstream requests made while handling a request
+
+    See :mod:`openbeheer.deadline`.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        with deadline(request_budget(request)):
+            return self.get_response(request)
+
+    async def __acall__(self, request):
+        with deadline(request_budget(request)):
+            return await self.get_response(request)
@@ -0,0 +1,173 @@
+import threading
+from unittest.mock import Mock
+
+from django.core.cache import cache
+from django.test import SimpleTestCase, override_settings
+
+from freezegun import freeze_time
+
+from openbeheer.deadline import deadline
+
+from .. import metrics
+from ..caching import CACHED_EVENTS, CachedFunction
+
+
+@override_settings(
+    CACHED_FUNCTIONS_TIMEOUT=100,
+    CACHED_FUNCTIONS_JITTER=0,
+    CACHED_FUNCTIONS_REFRESH_AHEAD=0.8,
+    CACHED_FUNCTIONS_MAX_STALE=100,
+    CACHED_FUNCTIONS_L1_TIMEOUT=10,
+    CACHED_FUNCTIONS_LOCK_TIMEOUT=5,
+    CACHED_FUNCTIONS_RETRY_AFTER=30,
+)
+class CachedFunctionTests(SimpleTestCase):
+    def setUp(self):
+        metrics.flush()
+        cache.clear()
+        self.f = Mock(__qualname__="options", side_effect=[["a"], ["b"], ["c"]])
+        self.cached = CachedFunction(self.f)
+
+    def counts(self):
+        return {
+            event: count
+            for event in CACHED_EVENTS
+            if (count := metrics.get_counts([f"cached:options:{event}"]).popitem()[1])
+        }
+
+    def test_caches(self):
+        self.assertEqual(self.cached(), ["a"])
+        self.assertEqual(self.cached(), ["a"])
+
+        self.f.assert_called_once()
+        self.assertEqual(self.counts(), {"miss": 1, "hit": 1})
+
+    def test_l1_serves_without_shared_cache(self):
+        self.cached()
+        cache.clear()
+
+        self.assertEqual(self.cached(), ["a"])
+        self.f.assert_called_once()
+
+    def test_l2_is_shared(self):
+        self.cached()
+        other_process = CachedFunction(self.f)
+
+        self.assertEqual(other_process(), ["a"])
+        self.f.assert_called_once()
+
+    def test_refreshes_ahead_in_background(self):
+        with freeze_time("2025-01-01 12:00:00"):
+            self.cached()
+
+        with freeze_time("2025-01-01 12:01:21"):
+            self.assertEqual(self.cached(), ["a"])
+            assert self.cached.refreshing
+            self.cached.refreshing.result()
+
+            self.assertEqual(self.cached(), ["b"])
+
+        self.assertEqual(self.counts(), {"miss": 1, "hit": 2, "refresh": 1})
+
+    def test_serves_stale_while_refreshing(self):
+        with freeze_time("2025-01-01 12:00:00"):
+            self.cached()
+
+        with freeze_time("2025-01-01 12:02:00"):
+            self.assertEqual(self.cached(), ["a"])
+            assert self.cached.refreshing
+            self.cached.refreshing.result()
+
+        self.assertEqual(self.counts(), {"miss": 1, "stale": 1, "refresh": 1})
+
+    def test_one_refresh_at_a_time(self):
+        with freeze_time("2025-01-01 12:00:00"):
+            self.cached()
+
+        cache.add("cached:options:lock", True)
+        with freeze_time("2025-01-01 12:01:30"):
+            self.cached()
+
+        self.assertIsNone(self.cached.refreshing)
+        self.f.assert_called_once()
+
+    def test_failed_refresh_keeps_value(self):
+        self.f.side_effect = [["a"], ConnectionError, ["b"]]
+        with freeze_time("2025-01-01 12:00:00"):
+            self.cached()
+
+        with freeze_time("2025-01-01 12:01:30"):
+            self.assertEqual(self.cached(), ["a"])
+            assert self.cached.refreshing
+            self.cached.refreshing.result()
+
+            self.cached.refreshing = None
+            self.assertEqual(self.cached(), ["a"])
+            # no retry right after a failure
+            self.assertIsNone(self.cached.refreshing)
+
+        with freeze_time("2025-01-01 12:02:01"):
+            self.assertEqual(self.cached(), ["a"])
+            assert self.cached.refreshing
+            self.cached.refreshing.result()
+
+        self.assertEqual(self.f.call_count, 3)
+
+    def test_one_computation_on_a_miss(self):
+        started, release = threading.Event(), threading.Event()
+
+        def compute():
+            started.set()
+            release.wait(5)
+            return ["a"]
+
+        self.f.side_effect = compute
+        results = []
+        threads = [
+            threading.Thread(target=lambda: results.append(self.cached()))
+            for _ in range(3)
+        ]
+        threads[0].start()
+        started.wait(5)
+        for thread in threads[1:]:
+            thread.start()
+        release.set()
+        for thread in threads:
+            thread.join(5)
+
+        self.assertEqual(results, [["a"]] * 3)
+        self.f.assert_called_once()
+
+    def test_waits_for_other_worker_on_a_miss(self):
+        cache.add("cached:options:computing", True)
+        other_worker = CachedFunction(Mock(__qualname__="options"))
+        threading.Timer(0.1, other_worker._store, [["x"]]).start()
+
+        self.assertEqual(self.cached(), ["x"])
+        self.f.assert_not_called()
+
+    def test_computes_when_other_worker_gave_up(self):
+        cache.add("cached:options:computing", True)
+        threading.Timer(0.1, cache.delete, ["cached:options:computing"]).start()
+
+        self.assertEqual(self.cached(), ["a"])
+        self.f.assert_called_once()
+
+    def test_wait_is_bounded_by_the_deadline(self):
+        cache.add("cached:options:computing", True)
+
+        with deadline(0.1):
+            self.assertEqual(self.cached(), ["a"])
+
+    def test_clear_cache(self):
+        self.cached()
+        self.cached.clear_cache()
+
+        self.assertEqual(self.cached(), ["b"])
+
+    def test_cached_value_does_not_compute(self):
+        self.assertIsNone(self.cached.cached_value())
+        self.cached()
+
+        self.assertEqual(self.cached.cached_value(), ["a"])
+        self.f.assert_called_once()
@@ -0,0 +1,43 @@
+from unittest.mock import patch
+
+from django.core.cache import cache
+from django.test import SimpleTestCase, override_settings
+
+from .. import metrics
+
+
+class MetricsTests(SimpleTestCase):
+    def setUp(self):
+        metrics.flush()
+        cache.clear()
+
+    @override_settings(METRICS_FLUSH_INTERVAL=60)
+    def test_counts_in_process_between_flushes(self):
+        metrics.flush()
+
+        with patch.object(cache, "incr") as incr, patch.object(cache, "add") as add:
+            for _ in range(100):
+                metrics.incr("thing:hit")
+
+        incr.assert_not_called()
+        add.assert_not_called()
+        self.assertEqual(metrics.get_counts(["thing:hit"]), {"thing:hit": 100})
+
+    @override_settings(METRICS_FLUSH_INTERVAL=0)
+    def test_flushes_after_the_interval(self):
+        metrics.incr("thing:hit")
+        metrics.incr("thing:hit", 2)
+
+        self.assertEqual(cache.get("metrics:thing:hit"), 3)
+
+    @override_settings(METRICS_FLUSH_INTERVAL=60)
+    def test_reset_drops_pending_counts(self):
+        metrics.incr("thing:hit")
+        metrics.incr("thing:miss")
+
+        metrics.reset(["thing:hit"])
+
+        self.assertEqual(
+            metrics.get_counts(["thing:hit", "thing:miss"]),
+            {"thing:hit": 0, "thing:miss": 1},
+        )
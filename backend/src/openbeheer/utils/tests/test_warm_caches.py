@@ -0,0 +1,66 @@
+from io import StringIO
+from unittest.mock import Mock, patch
+
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import TestCase
+
+import requests_mock
+from zgw_consumers.constants import APITypes
+from zgw_consumers.test.factories import ServiceFactory
+
+BASE_URL = "https://example.com/catalogi/api/v1/"
+CATALOGUS = f"{BASE_URL}catalogussen/1"
+
+
+@requests_mock.Mocker()
+class WarmCachesTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        ServiceFactory.create(api_type=APITypes.ztc, slug="OZ", api_root=BASE_URL)
+
+    def call_command(self, cached_functions: dict) -> tuple[str, str]:
+        stdout, stderr = StringIO(), StringIO()
+        with patch(
+            "openbeheer.utils.management.commands.warm_caches.CACHED_FUNCTIONS",
+            cached_functions,
+        ):
+            call_command("warm_caches", stdout=stdout, stderr=stderr)
+        return stdout.getvalue(), stderr.getvalue()
+
+    def test_warms_datasets(self, m):
+        m.get(
+            f"{BASE_URL}catalogussen",
+            json={
+                "count": 1,
+                "next": None,
+                "previous": None,
+                "results": [{"url": CATALOGUS}],
+            },
+        )
+        iots = m.get(
+            f"{BASE_URL}informatieobjecttypen",
+            json={"count": 0, "next": None, "previous": None, "results": []},
+        )
+        options = Mock(return_value=[])
+
+        stdout, stderr = self.call_command({"options": options})
+
+        options.assert_called_once()
+        self.assertEqual(iots.call_count, 1)
+        self.assertIn("catalogi:OZ: ", stdout)
+        self.assertIn("cached:options: ", stdout)
+        self.assertIn(f"informatieobjecttype-options:{CATALOGUS}: ", stdout)
+        self.assertIn("Done, 0 failed", stdout)
+        self.assertEqual(stderr, "")
+
+    def test_fails_soft(self, m):
+        m.get(f"{BASE_URL}catalogussen", status_code=502)
+
+        stdout, stderr = self.call_command(
+            {"options": Mock(side_effect=ConnectionError)}
+        )
+
+        self.assertIn("catalogi:OZ: failed", stderr)
+        self.assertIn("cached:options: failed", stderr)
+        self.assertIn("Done, 2 failed", stdout)
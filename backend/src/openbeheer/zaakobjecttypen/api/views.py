@@ -13,6 +13,7 @@ from openbeheer.api.views import (
     fetch_one,
 )
 from openbeheer.clients import objecttypen_client
+from openbeheer.helpers import objecttype_registry
 from openbeheer.types import (
     ExpandableZaakObjectTypeWithUUID,
     ExternalServiceError,
@@ -75,6 +76,11 @@ def expand_zaakobjecttype(
     # We are in the detail endpoint, so there is only one ZaakObjectType
     zaakobjecttype = list(zaakobjecttypen)[0]
     objecttype_uuid = furl(zaakobjecttype.objecttype).path.segments[-1]
+    # a cold registry costs more than fetching this one objecttype, and the
+    # objecttype may be newer than the registry
+    registry = objecttype_registry.cached_value()  # pyright: ignore[reportFunctionMemberAccess]
+    if registry and (objecttype := registry.by_uuid.get(objecttype_uuid)):
+        return [objecttype]
 
     try:
         with objecttypen_client() as ot_client:
@@ -17,7 +17,7 @@ import structlog
 from ape_pie import APIClient
 from drf_spectacular.utils import extend_schema, extend_schema_view
 from furl import furl
-from msgspec import UNSET, Meta, UnsetType, field
+from msgspec import UNSET, Meta, Struct, UnsetType, field
 from msgspec.json import decode
 from msgspec.structs import asdict, replace
 from rest_framework import status
@@ -26,19 +26,29 @@ from rest_framework.response import Response
 from openbeheer.api.views import (
     DetailView,
     DetailWithVersions,
+    ExpansionNode,
+    Expansions,
     ListView,
+    MetadataView,
     MsgspecAPIView,
+    by_catalogus,
     create_many,
+    expand_one,
     fetch_all,
     fetch_one,
+    make_batched_expansion,
     make_expansion,
+    select_expansions,
 )
+from openbeheer.catalogi.snapshot import snapshot_expansions
 from openbeheer.clients import (
     iter_pages,
     selectielijst_client,
     ztc_client,
 )
 from openbeheer.helpers import retrieve_objecttypen
+from openbeheer.informatieobjecttypen.options import informatieobjecttype_options
+from openbeheer.invalidation import publish_change
 from openbeheer.types import (
     BesluitTypeWithUUID,
     DetailResponse,
@@ -64,6 +74,7 @@ from openbeheer.types._open_beheer import (
     VersionedResourceSummary,
     ZaakObjectTypeExtension,
     ZaakObjectTypeWithUUID,
+    ZaakTypeExtension,
     ZaakTypeInformatieObjectTypeWithUUID,
     fetch_selectielijst_resultaat_options,
     ob_fields_of_type,
@@ -71,7 +82,6 @@ from openbeheer.types._open_beheer import (
 from openbeheer.types.ztc import (
     BrondatumArchiefprocedure,
     EigenschapSpecificatie,
-    InformatieObjectType,
     PaginatedZaakTypeList,
     PatchedZaakTypeRequest,
     Status,
@@ -94,6 +104,8 @@ if TYPE_CHECKING:
     from ape_pie import APIClient
     from rest_framework.request import Request
 
+    from openbeheer.types.objecttypen import ObjectType
+
 logger = structlog.get_logger(__name__)
 
 
@@ -114,10 +126,19 @@ class ZaaktypenGetParametersQuery(OBPagedQueryParams, kw_only=True, rename="came
     omschrijving__icontains: Annotated[
         str | UnsetType, Meta(description="*Experimental* Open Zaak")
     ] = field(name="omschrijving__icontains", default=UNSET)
+    expand: Annotated[
+        str | UnsetType,
+        Meta(description="Comma separated related resources to add, e.g. besluittypen"),
+    ] = UNSET
+
+
+class ZaakTypeSummaryExtension(Struct, frozen=True, rename="camel"):
+    besluittypen: UnsetType | list[BesluitTypeWithUUID] = UNSET
 
 
 class ZaakTypeSummary(VersionedResourceSummary, kw_only=True, rename="camel"):
     url: str
+    catalogus: str
     identificatie: str
     omschrijving: str
     # str, because VertrouwelijkheidaanduidingEnum does not contain "" but OZ does
@@ -127,6 +148,7 @@ class ZaakTypeSummary(VersionedResourceSummary, kw_only=True, rename="camel"):
     actief: bool | UnsetType = UNSET
     einde_geldigheid: datetime.date | None = None
     concept: bool | UnsetType = UNSET
+    _expand: ZaakTypeSummaryExtension = ZaakTypeSummaryExtension()
 
 
 @extend_schema_view(
@@ -157,6 +179,17 @@ class ZaakTypeListView(
     query_type = ZaaktypenGetParametersQuery
     endpoint_path = "zaaktypen"
 
+    expansions = {
+        # one query per catalogus for the whole page, instead of one per zaaktype
+        "besluittypen": make_batched_expansion(
+            "besluittypen",
+            partial(by_catalogus, status="alles"),
+            parent=lambda bt: bt.zaaktypen,
+            key=lambda zt: zt.url,  # pyright: ignore[reportAttributeAccessIssue]
+            result_type=BesluitTypeWithUUID,
+        ),
+    }
+
     @override
     def parse_ob_fields(
         self,
@@ -174,7 +207,7 @@ class ZaakTypeListView(
             "eindeGeldigheid",
             "concept",
         ]
-        return super().parse_ob_fields(
+        fields = super().parse_ob_fields(
             params,
             dict(option_overrides)
             | {
@@ -182,9 +215,11 @@ class ZaakTypeListView(
                     VertrouwelijkheidaanduidingEnum
                 )
             },
-            sort_key=lambda f: order.index(f.name),
+            sort_key=lambda f: order.index(f.name) if f.name in order else len(order),
             base_editable=lambda _: False,  # no editable fields
         )
+        # the catalogus and expansions are not columns
+        return [f for f in fields if f.name in order]
 
     @override
     def create_related(self, api_client, obj, request_data):
@@ -334,23 +369,44 @@ def expand_selectielijstprocestype(
         ]
 
 
-def expand_zaakobjecttypen(
+def expand_objecttypen(
     client: APIClient, zaaktypen: Iterable[ZaakType]
+) -> Iterable[dict[str, ObjectType]]:
+    "Fetch the objecttypen once, for all zaaktypen that have zaakobjecttypen"
+    zaaktypen = list(zaaktypen)
+    objecttypen = (
+        retrieve_objecttypen()
+        if any(zaaktype.zaakobjecttypen for zaaktype in zaaktypen)
+        else {}
+    )
+    return [objecttypen for _ in zaaktypen]
+
+
+def expand_zaakobjecttypen(
+    client: APIClient,
+    zaaktypen: Iterable[ZaakType],
+    objecttypen: Iterable[dict[str, ObjectType]],
 ) -> Iterable[Iterable[ExpandableZaakObjectTypeWithUUID | None]]:
     def expand_zaakobjecttypen(
         zaaktype: ZaakType,
+        dict_objecttypen: dict[str, ObjectType],
     ) -> Iterable[ExpandableZaakObjectTypeWithUUID | None]:
         if not zaaktype.zaakobjecttypen:
             return []
 
-        dict_objecttypen = retrieve_objecttypen()
-
         zaakobjecttypen = fetch_all(
             client,
             "zaakobjecttypen",
             {"zaaktype": zaaktype.url},
             ExpandableZaakObjectTypeWithUUID,
         )
+        if any(
+            zaakobjecttype.objecttype not in dict_objecttypen
+            for zaakobjecttype in zaakobjecttypen
+        ):
+            # created after the registry was loaded?
+            dict_objecttypen = retrieve_objecttypen(reload=True)
+
         for zaakobjecttype in zaakobjecttypen:
             try:
                 zaakobjecttype._expand = ZaakObjectTypeExtension(
@@ -364,7 +420,10 @@ def expand_zaakobjecttypen(
                 )
         return zaakobjecttypen
 
-    return [expand_zaakobjecttypen(zaaktype) for zaaktype in zaaktypen]
+    return [
+        expand_zaakobjecttypen(zaaktype, dict_objecttypen)
+        for zaaktype, dict_objecttypen in zip(zaaktypen, objecttypen, strict=True)
+    ]
 
 
 def expand_zaaktype_informatieobjecttype(
@@ -462,17 +521,49 @@ class ZaakTypeDetailView(DetailWithVersions, DetailView[ExpandableZaakType]):
             "roltypen", _get_params_with_status, RolTypeWithUUID
         ),
         # "deelzaaktypen": expand_deelzaaktype,
-        "zaakobjecttypen": expand_zaakobjecttypen,
+        "zaakobjecttypen": ExpansionNode(
+            expand_zaakobjecttypen, depends_on=("objecttypen",)
+        ),
         "selectielijst_procestype": expand_selectielijstprocestype,
         "zaaktypeinformatieobjecttypen": expand_zaaktype_informatieobjecttype,
+        "objecttypen": ExpansionNode(expand_objecttypen, internal=True),
     }
 
     read_only_expansions: set[CamelCaseFieldName] = {
         camelize(f)
-        for f in expansions
+        for f, expansion in expansions.items()
         if f not in PatchedZaakTypeRequest.__struct_fields__
+        and not (isinstance(expansion, ExpansionNode) and expansion.internal)
     }
 
+    def _expand(
+        self,
+        client,
+        object: ExpandableZaakType,
+        expansions: Expansions[ExpandableZaakType] | None = None,
+    ):
+        expansions = self.expansions if expansions is None else expansions
+        if not expansions or not (
+            expanded := snapshot_expansions(client, object, ZaakTypeExtension)
+        ):
+            return super()._expand(client, object, expansions)
+
+        # the catalogus snapshot has most of them, fetch the rest
+        expanded = {k: v for k, v in expanded.items() if k in expansions}
+        object._expand = replace(object._expand, **expanded)
+        return expand_one(
+            client,
+            {k: v for k, v in expansions.items() if k not in expanded},
+            object,
+        )
+
+    def get_expansions(self, request: Request) -> Expansions[ExpandableZaakType]:
+        expansions = super().get_expansions(request)
+        # the statustypen are the options of the statustype of eigenschappen
+        if "eigenschappen" in expansions and "statustypen" not in expansions:
+            return select_expansions(self.expansions, [*expansions, "statustypen"])
+        return expansions
+
     def get_item_versions(
         self, slug: str, data: ZaakType
     ) -> tuple[list[ZaakType] | ZGWError, int]:
@@ -492,6 +583,9 @@ class ZaakTypeDetailView(DetailWithVersions, DetailView[ExpandableZaakType]):
 
         return results, response.status_code
 
+    def get_version_identificatie(self, data: ZaakType) -> str | None:
+        return data.identificatie
+
     def format_version(self, data: ZaakType) -> VersionSummary:
         assert (
             data.url
@@ -506,37 +600,54 @@ class ZaakTypeDetailView(DetailWithVersions, DetailView[ExpandableZaakType]):
             concept=data.concept,
         )
 
+    object_options = frozenset(
+        {
+            "_expand.zaaktypeinformatieobjecttypen.informatieobjecttype",
+            # the selectielijst resultaten of the procestype of the zaaktype
+            "_expand.resultaattypen.selectielijstklasse",
+            "_expand.eigenschappen.statustype",
+        }
+    )
+
+    def get_option_overrides(
+        self, data: ExpandableZaakType
+    ) -> Mapping[CamelCaseFieldName, list[OBOption]]:
+        # only build the options of the expansions that were asked for, the
+        # others get none instead of falling back to the options of their type
+        overrides: dict[CamelCaseFieldName, list[OBOption]] = {
+            name: [] for name in self.object_options
+        }
+        if data._expand.zaaktypeinformatieobjecttypen is not UNSET:
+            overrides["_expand.zaaktypeinformatieobjecttypen.informatieobjecttype"] = (
+                self.get_informatieobjecttype_options(data)
+            )
+        if data._expand.resultaattypen is not UNSET:
+            overrides["_expand.resultaattypen.selectielijstklasse"] = (
+                fetch_selectielijst_resultaat_options(
+                    procestype_url=data.selectielijst_procestype
+                )
+                if data.selectielijst_procestype
+                else []
+            )
+        if data._expand.eigenschappen is not UNSET:
+            overrides["_expand.eigenschappen.statustype"] = [
+                OBOption(label=statustype.omschrijving, value=statustype.url)
+                for statustype in (
+                    data._expand.statustypen
+                    if data._expand.statustypen is not UNSET
+                    else []
+                )
+            ]
+        return overrides
+
     def get_fields(
         self,
-        data: ExpandableZaakType,
         option_overrides: Mapping[CamelCaseFieldName, list[OBOption]] = {},
         *,
         base_editable: Callable[[CamelCaseFieldName], bool] = bool,
     ) -> Iterable[OBField]:
-        selectielijst_options = (
-            fetch_selectielijst_resultaat_options(
-                procestype_url=data.selectielijst_procestype
-            )
-            if data.selectielijst_procestype
-            else []
-        )
-
         yield from super().get_fields(
-            data,
-            option_overrides={
-                "_expand.zaaktypeinformatieobjecttypen.informatieobjecttype": self.get_informatieobjecttype_options(
-                    data
-                ),
-                "_expand.resultaattypen.selectielijstklasse": selectielijst_options,
-                "_expand.eigenschappen.statustype": [
-                    OBOption(label=statustype.omschrijving, value=statustype.url)
-                    for statustype in (
-                        data._expand.statustypen
-                        if data._expand.statustypen is not UNSET
-                        else []
-                    )
-                ],
-            },
+            option_overrides,
             base_editable=lambda name: name not in self.read_only_expansions,
         )
         yield from ob_fields_of_type(
@@ -552,26 +663,23 @@ class ZaakTypeDetailView(DetailWithVersions, DetailView[ExpandableZaakType]):
         return ZAAKTYPE_FIELDSETS
 
     def get_informatieobjecttype_options(self, zaaktype: ZaakType) -> list[OBOption]:
-        today = datetime.date.today().isoformat()
+        # You can only relate a Zaaktype and an Informatieobjecttype if they belong to the same catalogus.
         with ztc_client() as client:
-            informatieobjecttypen = fetch_all(
-                client,
-                "informatieobjecttypen",
-                # You can only relate a Zaaktype and an Informatieobjecttype if they belong to the same catalogus.
-                params={
-                    "catalogus": zaaktype.catalogus,
-                    "status": "definitief",
-                    "datumGeldigheid": today,
-                },
-                result_type=InformatieObjectType,
-            )
+            return informatieobjecttype_options(client, zaaktype.catalogus)
 
-        return [
-            OBOption(
-                label=informatieobjecttype.omschrijving, value=informatieobjecttype.url
-            )
-            for informatieobjecttype in informatieobjecttypen
-        ]
+
+@extend_schema_view(
+    get=extend_schema(
+        tags=["Zaaktypen"],
+        summary="Get the fields and fieldsets of zaaktypen",
+        description=(
+            "The fieldsets and fields that the zaaktype detail leaves out when "
+            "requested with `?fields=omit`."
+        ),
+    ),
+)
+class ZaakTypeMetadataView(MetadataView):
+    detail_view = ZaakTypeDetailView
 
 
 class ZaakTypePublishView(MsgspecAPIView):
@@ -600,6 +708,13 @@ class ZaakTypePublishView(MsgspecAPIView):
                     status=response.status_code,
                 )
 
+            # the response is the published zaaktype
+            publish_change(
+                type(self),
+                decode(response.content),
+                urls=[client.to_absolute_url(f"zaaktypen/{uuid}")],
+            )
+
         return Response(status=status.HTTP_204_NO_CONTENT)
 
 
@@ -1,8 +1,11 @@
 import re
+import time
 from unittest import skip
+from unittest.mock import patch
 
-from django.test import tag
+from django.test import override_settings, tag
 
+import msgspec
 from furl import furl
 from rest_framework import status
 from rest_framework.reverse import reverse
@@ -10,7 +13,14 @@ from zgw_consumers.constants import APITypes
 from zgw_consumers.test.factories import ServiceFactory
 
 from openbeheer.accounts.tests.factories import UserFactory
+from openbeheer.catalogi.snapshot import (
+    CatalogusSnapshot,
+    _decoded,
+    refresh_snapshot,
+)
+from openbeheer.clients import ztc_client
 from openbeheer.config.tests.factories import APIConfigFactory
+from openbeheer.types import ZaakTypeWithUUID
 from openbeheer.utils.open_zaak_helper.data_creation import (
     OpenZaakDataCreationHelper,
 )
@@ -32,6 +42,16 @@ class ZaakTypeDetailViewTest(VCRAPITestCase):
         "path",
         "query_without_datum_geldigheid",
     )
+    replayed_cassettes = {
+        "test_expand_only_requested": "test_expand_zaaktype_informatieobjecttype",
+        "test_expand_eigenschappen_adds_statustypen": (
+            "test_expand_zaaktype_informatieobjecttype"
+        ),
+        "test_retrieve_without_metadata": "test_expand_zaaktype_informatieobjecttype",
+        "test_expand_from_catalogus_snapshot": (
+            "test_expand_zaaktype_informatieobjecttype"
+        ),
+    }
 
     @classmethod
     def setUpTestData(cls) -> None:
@@ -866,6 +886,147 @@ class ZaakTypeDetailViewTest(VCRAPITestCase):
             len(data["result"]["_expand"]["zaaktypeinformatieobjecttypen"]), 1
         )
 
+    def retrieve_recorded(self, zaaktype: ZaakTypeWithUUID | None = None, **params):
+        "Retrieve the zaaktype created in the replayed cassette"
+        zaaktype = zaaktype or self.helper.create_zaaktype()
+
+        self.client.force_login(self.user)
+        endpoint = reverse(
+            "api:zaaktypen:zaaktype-detail",
+            kwargs={"slug": "OZ", "uuid": zaaktype.uuid},
+        )
+        response = self.client.get(endpoint, params)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return response.json()
+
+    def played_paths(self) -> set[str]:
+        assert self.cassette
+        return {
+            furl(self.cassette.requests[index].uri).pathstr
+            for index in self.cassette.play_counts
+        }
+
+    def test_expand_only_requested(self):
+        data = self.retrieve_recorded(expand="statustypen")
+
+        self.assertEqual(set(data["result"]["_expand"]), {"statustypen"})
+        played = self.played_paths()
+        self.assertNotIn("/catalogi/api/v1/resultaattypen", played)
+        # the options of the unrequested expansions aren't built
+        self.assertNotIn("/api/v1/resultaten", played)
+        fields_by_name = {f["name"]: f for f in data["fields"]}
+        self.assertEqual(
+            fields_by_name["_expand.resultaattypen.selectielijstklasse"]["options"],
+            [],
+        )
+        self.assertEqual(
+            fields_by_name[
+                "_expand.zaaktypeinformatieobjecttypen.informatieobjecttype"
+            ]["options"],
+            [],
+        )
+
+    def test_expand_eigenschappen_adds_statustypen(self):
+        data = self.retrieve_recorded(expand="eigenschappen")
+
+        # the statustypen are the options of the statustype of the eigenschappen
+        self.assertEqual(
+            set(data["result"]["_expand"]), {"eigenschappen", "statustypen"}
+        )
+        self.assertIn("/catalogi/api/v1/statustypen", self.played_paths())
+        fields_by_name = {f["name"]: f for f in data["fields"]}
+        self.assertEqual(
+            fields_by_name["_expand.eigenschappen.statustype"]["options"],
+            [
+                {"label": statustype["omschrijving"], "value": statustype["url"]}
+                for statustype in data["result"]["_expand"]["statustypen"]
+            ],
+        )
+
+    def test_retrieve_without_metadata(self):
+        data = self.retrieve_recorded(fields="omit")
+
+        self.assertNotIn("fieldsets", data)
+        # only the fields with options of this zaaktype are left
+        self.assertEqual(
+            {f["name"] for f in data["fields"]},
+            {
+                "_expand.zaaktypeinformatieobjecttypen.informatieobjecttype",
+                "_expand.resultaattypen.selectielijstklasse",
+                "_expand.eigenschappen.statustype",
+            },
+        )
+
+        response = self.client.get(
+            reverse("api:zaaktypen:zaaktype-metadata", kwargs={"slug": "OZ"}),
+            {"version": data["metadata"]},
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIn("max-age", response["Cache-Control"])
+        metadata = response.json()
+        self.assertEqual(metadata["version"], data["metadata"])
+        self.assertIn("fieldsets", metadata)
+        fields_by_name = {f["name"]: f for f in metadata["fields"]}
+        self.assertIn("selectielijstProcestype", fields_by_name)
+        # the options of one zaaktype aren't those of every zaaktype
+        for name in {f["name"] for f in data["fields"]}:
+            self.assertEqual(fields_by_name[name]["options"], [])
+
+    def played_related(self) -> list[str]:
+        "The played requests for the resources related to a zaaktype"
+        assert self.cassette
+        return [
+            self.cassette.requests[index].uri
+            for index in self.cassette.play_counts
+            if {"zaaktype", "zaaktypen"}
+            & set(furl(self.cassette.requests[index].uri).args)
+        ]
+
+    @override_settings(CATALOGUS_SNAPSHOTS=True)
+    def test_expand_from_catalogus_snapshot(self):
+        _decoded.clear()
+        self.addCleanup(_decoded.clear)
+        zaaktype = self.helper.create_zaaktype()
+        assert zaaktype.url and self.cassette
+
+        # take the snapshot from the related resources in the cassette
+        resources: dict[str, bytes] = {}
+        ziots: dict[str, str] = {}
+        for request, response in zip(
+            self.cassette.requests, self.cassette.responses, strict=True
+        ):
+            if not {"zaaktype", "zaaktypen"} & set(furl(request.uri).args):
+                continue
+            for result in msgspec.json.decode(response["body"]["string"])["results"]:
+                if "informatieobjecttype" in result:
+                    ziots[result["url"]] = result["informatieobjecttype"]
+                elif "informatieobjectcategorie" in result:
+                    result["omschrijving"] = "From the snapshot"
+                resources[result["url"]] = msgspec.json.encode(result)
+        snapshot = CatalogusSnapshot(
+            catalogus=zaaktype.catalogus,
+            taken_at=time.time(),
+            resources=resources,
+            zaaktype_informatieobjecttypen={zaaktype.url: ziots},
+        )
+        with (
+            patch("openbeheer.catalogi.snapshot.build_snapshot", return_value=snapshot),
+            ztc_client("OZ") as client,
+        ):
+            refresh_snapshot(client, zaaktype.catalogus)
+
+        data = self.retrieve_recorded(zaaktype)
+
+        self.assertEqual(self.played_related(), [])
+        informatieobjecttypen = data["result"]["_expand"]["informatieobjecttypen"]
+        self.assertEqual(len(informatieobjecttypen), 1)
+        self.assertEqual(informatieobjecttypen[0]["omschrijving"], "From the snapshot")
+        self.assertEqual(
+            len(data["result"]["_expand"]["zaaktypeinformatieobjecttypen"]), 1
+        )
+
     def test_informatieobjecttype_multiple_versions(self):
         zaaktype = self.helper.create_zaaktype()
         informatieobjecttype1 = self.helper.create_informatieobjecttype(
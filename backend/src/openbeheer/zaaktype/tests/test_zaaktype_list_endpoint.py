@@ -1,11 +1,16 @@
+from uuid import NAMESPACE_URL, uuid5
+
+import requests_mock
 from msgspec import convert, to_builtins
 from requests import get
 from rest_framework import status
 from rest_framework.reverse import reverse
+from rest_framework.test import APITestCase
 from zgw_consumers.constants import APITypes
 from zgw_consumers.test.factories import ServiceFactory
 
 from openbeheer.accounts.tests.factories import UserFactory
+from openbeheer.clients import ztc_client
 from openbeheer.types._open_beheer import EigenschapWithUUID, ResultaatTypeWithUUID
 from openbeheer.types.ztc import Status
 from openbeheer.utils.open_zaak_helper.data_creation import (
@@ -833,3 +838,113 @@ class ZaakTypeCreateViewTest(VCRAPITestCase):
         self.assertEqual(
             errors[0]["invalidParams"][0]["name"], "roltypen.0.omschrijving"
         )
+
+
+BASE_URL = "https://example.com/catalogi/api/v1/"
+
+
+def zaaktype(id: int, catalogus: str) -> dict:
+    return {
+        "url": f"{BASE_URL}zaaktypen/{id}",
+        "catalogus": f"{BASE_URL}catalogussen/{catalogus}",
+        "identificatie": f"ZAAKTYPE-{id}",
+        "omschrijving": f"zaaktype {id}",
+        "vertrouwelijkheidaanduiding": "openbaar",
+        "versiedatum": "2025-01-01",
+        "eindeGeldigheid": None,
+        "concept": False,
+    }
+
+
+def besluittype(omschrijving: str, catalogus: str, zaaktypen: list[int]) -> dict:
+    return {
+        "url": f"{BASE_URL}besluittypen/{uuid5(NAMESPACE_URL, omschrijving)}",
+        "catalogus": f"{BASE_URL}catalogussen/{catalogus}",
+        "omschrijving": omschrijving,
+        "zaaktypen": [f"{BASE_URL}zaaktypen/{id}" for id in zaaktypen],
+        "publicatieIndicatie": False,
+        "informatieobjecttypen": [],
+        "beginGeldigheid": "2025-01-01",
+    }
+
+
+@requests_mock.Mocker()
+class ZaakTypeListExpandTest(APITestCase):
+    @classmethod
+    def setUpTestData(cls) -> None:
+        super().setUpTestData()
+        ServiceFactory.create(api_type=APITypes.ztc, api_root=BASE_URL, slug="OZ")
+        cls.user = UserFactory.create()
+        cls.url = reverse("api:zaaktypen:zaaktype-list", kwargs={"slug": "OZ"})
+
+    def setUp(self):
+        super().setUp()
+        ztc_client.cache_clear()
+        self.addCleanup(ztc_client.cache_clear)
+        self.client.force_authenticate(self.user)
+
+    def test_expand_besluittypen_per_catalogus(self, m):
+        m.get(
+            f"{BASE_URL}zaaktypen",
+            json={
+                "count": 3,
+                "next": None,
+                "previous": None,
+                "results": [zaaktype(1, "a"), zaaktype(2, "a"), zaaktype(3, "b")],
+            },
+        )
+        m.get(
+            f"{BASE_URL}besluittypen?catalogus={BASE_URL}catalogussen/a",
+            json={
+                "count": 2,
+                "next": None,
+                "previous": None,
+                "results": [
+                    besluittype("both", "a", [1, 2]),
+                    besluittype("second", "a", [2]),
+                ],
+            },
+        )
+        m.get(
+            f"{BASE_URL}besluittypen?catalogus={BASE_URL}catalogussen/b",
+            json={"count": 0, "next": None, "previous": None, "results": []},
+        )
+
+        response = self.client.get(self.url, query_params={"expand": "besluittypen"})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        data = response.json()
+        self.assertEqual(
+            [
+                [bt["omschrijving"] for bt in zt["_expand"]["besluittypen"]]
+                for zt in data["results"]
+            ],
+            [["both"], ["both", "second"], []],
+        )
+        # one query per catalogus, not per zaaktype
+        besluittypen_queries = [
+            r.qs for r in m.request_history if r.path.endswith("/besluittypen")
+        ]
+        self.assertEqual(len(besluittypen_queries), 2)
+        self.assertTrue(all(qs["status"] == ["alles"] for qs in besluittypen_queries))
+        # expand is ours, not a filter on Open Zaak
+        self.assertNotIn("expand", m.request_history[0].qs)
+        # and the expansions don't become columns
+        self.assertNotIn("_expand", {f["name"].split(".")[0] for f in data["fields"]})
+
+    def test_not_expanded_by_default(self, m):
+        m.get(
+            f"{BASE_URL}zaaktypen",
+            json={
+                "count": 1,
+                "next": None,
+                "previous": None,
+                "results": [zaaktype(1, "a")],
+            },
+        )
+
+        response = self.client.get(self.url)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.json()["results"][0]["_expand"], {})
+        self.assertEqual(m.call_count, 1)
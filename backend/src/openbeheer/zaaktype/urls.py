@@ -1,6 +1,11 @@
 from django.urls import path
 
-from .api.views import ZaakTypeDetailView, ZaakTypeListView, ZaakTypePublishView
+from .api.views import (
+    ZaakTypeDetailView,
+    ZaakTypeListView,
+    ZaakTypeMetadataView,
+    ZaakTypePublishView,
+)
 
 app_name = "api:zaaktypen"
 
@@ -10,6 +15,11 @@ urlpatterns = [
         ZaakTypeListView.as_view(),
         name="zaaktype-list",
     ),
+    path(
+        "metadata/",
+        ZaakTypeMetadataView.as_view(),
+        name="zaaktype-metadata",
+    ),
     path(
         "<uuid:uuid>/",
         ZaakTypeDetailView.as_view(),